@@ -131,6 +131,27 @@ resource "azurerm_container_app" "gateway" {
         name  = "AZURE_REGION"
         value = var.primary_region
       }
+
+      # Every regional endpoint per service, for latency-aware routing and failover
+      env {
+        name  = "API_SERVICE_URLS"
+        value = join(",", [for region in var.regions : "${region}=https://${azurerm_container_app.api[region].latest_revision_fqdn}"])
+      }
+
+      env {
+        name  = "WORKER_SERVICE_URLS"
+        value = join(",", [for region in var.regions : "${region}=https://${azurerm_container_app.worker[region].latest_revision_fqdn}"])
+      }
+
+      env {
+        name  = "PROCESSOR_SERVICE_URLS"
+        value = join(",", [for region in var.regions : "${region}=https://${azurerm_container_app.processor[region].latest_revision_fqdn}"])
+      }
+
+      env {
+        name  = "SCHEDULER_SERVICE_URLS"
+        value = join(",", [for region in var.regions : "${region}=https://${azurerm_container_app.scheduler[region].latest_revision_fqdn}"])
+      }
     }
 
     min_replicas = 1
@@ -311,6 +332,12 @@ resource "azurerm_container_app" "scheduler" {
         name  = "AZURE_REGION"
         value = each.key
       }
+
+      # Fired tasks are submitted to the same region's worker service
+      env {
+        name  = "WORKER_SERVICE_URL"
+        value = "https://${azurerm_container_app.worker[each.key].latest_revision_fqdn}"
+      }
     }
 
     min_replicas = 1
@@ -2,13 +2,25 @@
 API Service - Private Internal Service
 Handles REST API operations, data queries, and business logic
 """
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
 import os
 import logging
-from datetime import datetime
-from typing import Optional, List
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, List, Tuple, Any, AsyncIterator, Dict, Set
+from collections import OrderedDict
 from azure.identity import DefaultAzureCredential
+import asyncio
+import base64
+import bisect
+import hashlib
+import heapq
+import json
+import re
+import sqlite3
+import time
 import uuid
 
 logging.basicConfig(level=logging.INFO)
@@ -21,6 +33,24 @@ REGION = os.getenv("AZURE_REGION", "unknown")
 SQL_CONNECTION_STRING = os.getenv("SQL_CONNECTION_STRING", "")
 STORAGE_CONNECTION_STRING = os.getenv("STORAGE_CONNECTION_STRING", "")
 
+# Item storage settings
+ITEM_STORE_BACKEND = os.getenv("ITEM_STORE_BACKEND", "sqlite").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "items.db")
+WRITE_BATCH_SIZE = int(os.getenv("WRITE_BATCH_SIZE", "256"))
+ITEM_CACHE_SIZE = int(os.getenv("ITEM_CACHE_SIZE", "10000"))
+ITEM_CACHE_TTL = float(os.getenv("ITEM_CACHE_TTL", "5"))
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+SEARCH_DEFAULT_LIMIT = int(os.getenv("SEARCH_DEFAULT_LIMIT", "100"))
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+READ_CACHE_SIZE = int(os.getenv("READ_CACHE_SIZE", "1024"))
+READ_CACHE_TTL = float(os.getenv("READ_CACHE_TTL", "5"))
+# How often the search index picks up writes other processes made to a shared SQLite file, and
+# how many changes the file keeps for them; a process that falls further behind rebuilds its index
+SEARCH_REFRESH_INTERVAL = float(os.getenv("SEARCH_REFRESH_INTERVAL", "1"))
+ITEM_CHANGE_LOG_SIZE = int(os.getenv("ITEM_CHANGE_LOG_SIZE", "100000"))
+
 # Models
 class Item(BaseModel):
     id: Optional[str] = None
@@ -32,8 +62,878 @@ class QueryRequest(BaseModel):
     query_type: str
     parameters: Optional[dict] = None
 
-# In-memory storage (replace with actual database in production)
-items_db = {}
+class MemoryItemStore:
+    """Items kept in a process-local dict; lost on restart"""
+
+    name = "memory"
+
+    def __init__(self):
+        self.items = {}
+        # (created_at, id) keys kept sorted for keyset pagination
+        self.order: List[Tuple[str, str]] = []
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def get(self, item_id: str) -> Optional[dict]:
+        return self.items.get(item_id)
+
+    async def get_many(self, item_ids: List[str]) -> Dict[str, dict]:
+        return {item_id: self.items[item_id] for item_id in item_ids if item_id in self.items}
+
+    async def list_page(self, after: Optional[Tuple[str, str]], limit: int) -> List[dict]:
+        start = bisect.bisect_right(self.order, after) if after else 0
+        return [self.items[item_id] for _, item_id in self.order[start:start + limit]]
+
+    async def count(self) -> int:
+        return len(self.items)
+
+    async def insert(self, item: dict):
+        self.items[item["id"]] = item
+        bisect.insort(self.order, (item["created_at"], item["id"]))
+
+    async def update(self, item: dict) -> bool:
+        if item["id"] not in self.items:
+            return False
+        self.items[item["id"]] = item
+        return True
+
+    async def delete(self, item_id: str) -> bool:
+        item = self.items.pop(item_id, None)
+        if item is None:
+            return False
+        key = (item["created_at"], item_id)
+        index = bisect.bisect_left(self.order, key)
+        if index < len(self.order) and self.order[index] == key:
+            del self.order[index]
+        return True
+
+    async def changes_since(self, cursor: Optional[int], limit: int) -> Tuple[int, Optional[List[str]]]:
+        # Only this process can write to it
+        return 0, []
+
+    async def apply_bulk(self, ops: List[Tuple[str, Any]]) -> List[Any]:
+        """Apply (op, arg) writes in order; results are 1/0 per op, or the exception raised"""
+        results = []
+        for op, arg in ops:
+            try:
+                if op == "insert":
+                    if arg["id"] in self.items:
+                        raise ValueError(f"Item {arg['id']} already exists")
+                    await self.insert(arg)
+                    results.append(1)
+                elif op == "update":
+                    results.append(int(await self.update(arg)))
+                elif op == "delete":
+                    results.append(int(await self.delete(arg)))
+                else:
+                    raise ValueError(f"Unknown write op: {op}")
+            except Exception as e:
+                results.append(e)
+        return results
+
+class SQLiteItemStore:
+    """SQLite store in WAL mode; concurrent writes are group-committed by a single writer"""
+
+    name = "sqlite"
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS items (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            description TEXT,
+            created_at TEXT NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_items_name ON items (name)",
+        "CREATE INDEX IF NOT EXISTS idx_items_created_at ON items (created_at, id)",
+        # Row count kept in the database so every process sharing the file sees the same total
+        """CREATE TABLE IF NOT EXISTS item_counts (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total INTEGER NOT NULL
+        )""",
+        "INSERT OR IGNORE INTO item_counts (id, total) SELECT 1, COUNT(*) FROM items",
+        # Ids written per transaction, tailed by the other processes sharing the file
+        """CREATE TABLE IF NOT EXISTS item_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            item_id TEXT NOT NULL,
+            writer TEXT NOT NULL
+        )"""
+    ]
+
+    def __init__(self, path: str):
+        self.path = path
+        self.reader: Optional[sqlite3.Connection] = None
+        self.writer: Optional[sqlite3.Connection] = None
+        self.pending: Optional[asyncio.Queue] = None
+        self.writer_task: Optional[asyncio.Task] = None
+        self.batches_committed = 0
+        self.writes_committed = 0
+        # Tags this process's rows in item_changes so it skips its own writes
+        self.writer_id = uuid.uuid4().hex
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    async def start(self):
+        self.writer = self._connect()
+        for statement in self.SCHEMA:
+            self.writer.execute(statement)
+        self.reader = self._connect()
+        self.pending = asyncio.Queue()
+        self.writer_task = asyncio.create_task(self._writer_loop())
+        logger.info(f"SQLite item store opened at {self.path}")
+
+    async def close(self):
+        if self.writer_task is not None:
+            await self.pending.join()
+            self.writer_task.cancel()
+            try:
+                await self.writer_task
+            except asyncio.CancelledError:
+                pass
+        for conn in (self.reader, self.writer):
+            if conn is not None:
+                conn.close()
+
+    @staticmethod
+    def _row_to_item(row: Optional[sqlite3.Row]) -> Optional[dict]:
+        return dict(row) if row is not None else None
+
+    async def get(self, item_id: str) -> Optional[dict]:
+        row = self.reader.execute(
+            "SELECT id, name, description, created_at FROM items WHERE id = ?", (item_id,)
+        ).fetchone()
+        return self._row_to_item(row)
+
+    async def get_many(self, item_ids: List[str]) -> Dict[str, dict]:
+        found = {}
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(item_ids), 500):
+            chunk = item_ids[start:start + 500]
+            rows = self.reader.execute(
+                f"SELECT id, name, description, created_at FROM items WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchall()
+            found.update((row["id"], dict(row)) for row in rows)
+        return found
+
+    async def list_page(self, after: Optional[Tuple[str, str]], limit: int) -> List[dict]:
+        if after:
+            rows = self.reader.execute(
+                "SELECT id, name, description, created_at FROM items "
+                "WHERE (created_at, id) > (?, ?) ORDER BY created_at, id LIMIT ?",
+                (after[0], after[1], limit)
+            ).fetchall()
+        else:
+            rows = self.reader.execute(
+                "SELECT id, name, description, created_at FROM items ORDER BY created_at, id LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    async def count(self) -> int:
+        # Maintained in the write transaction so counting never scans the table
+        return self.reader.execute("SELECT total FROM item_counts WHERE id = 1").fetchone()[0]
+
+    async def changes_since(self, cursor: Optional[int], limit: int) -> Tuple[int, Optional[List[str]]]:
+        """Ids other processes wrote after cursor, up to limit changes, and the cursor to pass next.
+        With no cursor, only the current position; ids are None when the log was pruned past cursor."""
+        if cursor is None:
+            return self.reader.execute("SELECT COALESCE(MAX(seq), 0) FROM item_changes").fetchone()[0], []
+        oldest = self.reader.execute("SELECT MIN(seq) FROM item_changes").fetchone()[0]
+        if oldest is not None and oldest > cursor + 1:
+            return (await self.changes_since(None, limit))[0], None
+        rows = self.reader.execute(
+            "SELECT seq, item_id, writer FROM item_changes WHERE seq > ? ORDER BY seq LIMIT ?", (cursor, limit)
+        ).fetchall()
+        if not rows:
+            return cursor, []
+        item_ids = dict.fromkeys(row["item_id"] for row in rows if row["writer"] != self.writer_id)
+        return rows[-1]["seq"], list(item_ids)
+
+    async def insert(self, item: dict):
+        await self._write("insert", item)
+
+    async def update(self, item: dict) -> bool:
+        return await self._write("update", item) > 0
+
+    async def delete(self, item_id: str) -> bool:
+        return await self._write("delete", item_id) > 0
+
+    async def apply_bulk(self, ops: List[Tuple[str, Any]]) -> List[Any]:
+        """Apply (op, arg) writes in a single transaction; results are 1/0 per op, or the exception raised"""
+        return await self._write("bulk", ops)
+
+    async def _write(self, op: str, arg: Any) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        await self.pending.put((op, arg, future))
+        return await future
+
+    async def _writer_loop(self):
+        """Drain every queued write and commit them together in one transaction"""
+        while True:
+            batch = [await self.pending.get()]
+            while len(batch) < WRITE_BATCH_SIZE and not self.pending.empty():
+                batch.append(self.pending.get_nowait())
+
+            try:
+                results = await asyncio.to_thread(self._apply_batch, [(op, arg) for op, arg, _ in batch])
+            except Exception as e:
+                logger.error(f"Write batch of {len(batch)} failed: {str(e)}")
+                results = [e] * len(batch)
+
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+                self.pending.task_done()
+
+    def _apply_batch(self, ops: List[Tuple[str, Any]]) -> List[Any]:
+        """Runs on a worker thread; each op gets a savepoint so one failure does not sink the batch"""
+        results = []
+        self._delta = 0
+        self._writes = 0
+        conn = self.writer
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for op, arg in ops:
+                if op == "bulk":
+                    results.append([self._apply_savepoint(conn, sub_op, sub_arg) for sub_op, sub_arg in arg])
+                else:
+                    results.append(self._apply_savepoint(conn, op, arg))
+            if self._delta:
+                conn.execute("UPDATE item_counts SET total = total + ? WHERE id = 1", (self._delta,))
+            if self._writes:
+                conn.execute(
+                    "DELETE FROM item_changes WHERE seq <= (SELECT MAX(seq) FROM item_changes) - ?",
+                    (ITEM_CHANGE_LOG_SIZE,)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        self.batches_committed += 1
+        self.writes_committed += self._writes
+        return results
+
+    def _apply_savepoint(self, conn: sqlite3.Connection, op: str, arg: Any) -> Any:
+        conn.execute("SAVEPOINT op")
+        try:
+            result = self._apply(conn, op, arg)
+        except Exception as e:
+            conn.execute("ROLLBACK TO op")
+            conn.execute("RELEASE op")
+            return e
+
+        if result:
+            item_id = arg if op == "delete" else arg["id"]
+            conn.execute("INSERT INTO item_changes (item_id, writer) VALUES (?, ?)", (item_id, self.writer_id))
+        conn.execute("RELEASE op")
+        self._writes += 1
+        if op == "insert":
+            self._delta += result
+        elif op == "delete":
+            self._delta -= result
+        return result
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, op: str, arg: Any) -> Any:
+        if op == "insert":
+            conn.execute(
+                "INSERT INTO items (id, name, description, created_at) VALUES (:id, :name, :description, :created_at)",
+                arg
+            )
+            return 1
+        if op == "update":
+            return conn.execute(
+                "UPDATE items SET name = :name, description = :description WHERE id = :id", arg
+            ).rowcount
+        if op == "delete":
+            return conn.execute("DELETE FROM items WHERE id = ?", (arg,)).rowcount
+        raise ValueError(f"Unknown write op: {op}")
+
+class CachedItemStore:
+    """Read-through LRU cache in front of a persistent store"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.name = backend.name
+        self.cache: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def start(self):
+        await self.backend.start()
+
+    async def close(self):
+        await self.backend.close()
+
+    def _remember(self, item: dict):
+        self.cache[item["id"]] = (item, time.monotonic() + ITEM_CACHE_TTL)
+        self.cache.move_to_end(item["id"])
+        if len(self.cache) > ITEM_CACHE_SIZE:
+            self.cache.popitem(last=False)
+
+    async def get(self, item_id: str) -> Optional[dict]:
+        cached = self.cache.get(item_id)
+        if cached is not None and cached[1] > time.monotonic():
+            self.hits += 1
+            self.cache.move_to_end(item_id)
+            return cached[0]
+
+        self.misses += 1
+        item = await self.backend.get(item_id)
+        if item is not None:
+            self._remember(item)
+        else:
+            self.cache.pop(item_id, None)
+        return item
+
+    async def get_many(self, item_ids: List[str]) -> Dict[str, dict]:
+        now = time.monotonic()
+        found = {}
+        missing = []
+        for item_id in item_ids:
+            cached = self.cache.get(item_id)
+            if cached is not None and cached[1] > now:
+                found[item_id] = cached[0]
+            else:
+                missing.append(item_id)
+        self.hits += len(found)
+        self.misses += len(missing)
+        if missing:
+            fetched = await self.backend.get_many(missing)
+            for item in fetched.values():
+                self._remember(item)
+            found.update(fetched)
+        return found
+
+    async def list_page(self, after: Optional[Tuple[str, str]], limit: int) -> List[dict]:
+        return await self.backend.list_page(after, limit)
+
+    async def count(self) -> int:
+        return await self.backend.count()
+
+    async def changes_since(self, cursor: Optional[int], limit: int) -> Tuple[int, Optional[List[str]]]:
+        cursor, item_ids = await self.backend.changes_since(cursor, limit)
+        # Another process changed these; don't serve them from cache until the TTL runs out
+        if item_ids is None:
+            self.cache.clear()
+        for item_id in item_ids or []:
+            self.cache.pop(item_id, None)
+        return cursor, item_ids
+
+    async def insert(self, item: dict):
+        await self.backend.insert(item)
+        self._remember(item)
+
+    async def update(self, item: dict) -> bool:
+        updated = await self.backend.update(item)
+        if updated:
+            self._remember(item)
+        return updated
+
+    async def delete(self, item_id: str) -> bool:
+        self.cache.pop(item_id, None)
+        return await self.backend.delete(item_id)
+
+    async def apply_bulk(self, ops: List[Tuple[str, Any]]) -> List[Any]:
+        results = await self.backend.apply_bulk(ops)
+        for (op, arg), result in zip(ops, results):
+            if op == "delete":
+                self.cache.pop(arg, None)
+            elif result == 1:
+                self._remember(arg)
+        return results
+
+def create_item_store():
+    """Build the configured item store"""
+    if ITEM_STORE_BACKEND == "memory":
+        return MemoryItemStore()
+    if ITEM_STORE_BACKEND == "sqlite":
+        return CachedItemStore(SQLiteItemStore(SQLITE_PATH))
+    raise ValueError(f"Unknown ITEM_STORE_BACKEND: {ITEM_STORE_BACKEND}")
+
+items_db = create_item_store()
+
+ITEM_FIELDS = set(Item.model_fields)
+
+def encode_cursor(item: dict) -> str:
+    """Opaque keyset cursor pointing just past an item"""
+    raw = json.dumps([item["created_at"], item["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str]]:
+    if not cursor:
+        return None
+    try:
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return created_at, item_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Validate a comma-separated fields= projection"""
+    if not fields:
+        return None
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = set(selected) - ITEM_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {sorted(unknown)}")
+    return selected
+
+SEARCH_MODES = ("substring", "prefix")
+
+def parse_search_parameters(parameters: dict) -> Tuple[str, str, bool, int]:
+    """Validate search query parameters: (term, mode, include_description, limit)"""
+    term = parameters.get("term", "")
+    if not isinstance(term, str):
+        raise HTTPException(status_code=400, detail="term must be a string")
+    mode = parameters.get("mode", "substring")
+    if mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown search mode: {mode!r}; expected one of {list(SEARCH_MODES)}")
+    try:
+        limit = int(parameters.get("limit", SEARCH_DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="limit must be an integer")
+    return term, mode, bool(parameters.get("include_description", False)), max(1, min(limit, MAX_PAGE_SIZE))
+
+def project(item: dict, fields: Optional[List[str]]) -> dict:
+    if fields is None:
+        return item
+    return {field: item.get(field) for field in fields}
+
+ITEM_LIST_ADAPTER = TypeAdapter(List[Item])
+
+class MalformedRecord:
+    """Placeholder for a bulk input line that is not valid JSON"""
+
+    def __init__(self, error: str):
+        self.error = error
+
+async def read_bulk_records(request: Request) -> AsyncIterator[List[Any]]:
+    """Yield chunks of raw records from a JSON array or NDJSON body.
+
+    NDJSON bodies are consumed as they stream in, so only one chunk is held at a time.
+    """
+    if "ndjson" in request.headers.get("content-type", ""):
+        chunk: List[Any] = []
+        buffer = b""
+        async for data in request.stream():
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    chunk.append(parse_ndjson_line(line))
+                    if len(chunk) >= BULK_CHUNK_SIZE:
+                        yield chunk
+                        chunk = []
+        if buffer.strip():
+            chunk.append(parse_ndjson_line(buffer))
+        if chunk:
+            yield chunk
+        return
+
+    try:
+        records = json.loads(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {str(e)}")
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Bulk body must be a JSON array or NDJSON")
+    for start in range(0, len(records), BULK_CHUNK_SIZE):
+        yield records[start:start + BULK_CHUNK_SIZE]
+
+def parse_ndjson_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return MalformedRecord(f"Invalid JSON: {str(e)}")
+
+def validate_chunk(chunk: List[Any]) -> Tuple[List[Optional[Item]], Dict[int, str]]:
+    """Validate a chunk in one pass; returns items by position and errors by position"""
+    errors = {i: record.error for i, record in enumerate(chunk) if isinstance(record, MalformedRecord)}
+    candidates = [(i, record) for i, record in enumerate(chunk) if i not in errors]
+    try:
+        validated = ITEM_LIST_ADAPTER.validate_python([record for _, record in candidates])
+    except ValidationError as e:
+        for error in e.errors():
+            position = candidates[error["loc"][0]][0]
+            field = ".".join(str(part) for part in error["loc"][1:])
+            errors.setdefault(position, f"{field}: {error['msg']}" if field else error["msg"])
+        candidates = [(i, record) for i, record in candidates if i not in errors]
+        validated = ITEM_LIST_ADAPTER.validate_python([record for _, record in candidates])
+
+    items: List[Optional[Item]] = [None] * len(chunk)
+    for (i, _), item in zip(candidates, validated):
+        items[i] = item
+    return items, errors
+
+async def run_bulk(request: Request, apply_chunk) -> dict:
+    """Feed chunks to apply_chunk and collect compact per-record results"""
+    ids: List[Optional[str]] = []
+    errors = []
+    async for chunk in read_bulk_records(request):
+        chunk_ids, chunk_errors = await apply_chunk(chunk)
+        errors.extend(
+            {"index": len(ids) + position, "detail": detail}
+            for position, detail in sorted(chunk_errors.items())
+        )
+        ids.extend(chunk_ids)
+
+    return {
+        "succeeded": len(ids) - len(errors),
+        "failed": len(errors),
+        "ids": ids,
+        "errors": errors,
+        "region": REGION
+    }
+
+def collect_write_results(ops_positions: List[int], results: List[Any], errors: Dict[int, str]):
+    """Record failed writes from apply_bulk results into errors"""
+    for position, result in zip(ops_positions, results):
+        if isinstance(result, Exception):
+            errors[position] = str(result)
+        elif result == 0:
+            errors[position] = "Item not found"
+
+async def iter_items(batch_size: int) -> AsyncIterator[dict]:
+    """Walk the whole store in keyset order, one page in memory at a time"""
+    after = None
+    while True:
+        page = await items_db.list_page(after, batch_size)
+        for item in page:
+            yield item
+        if len(page) < batch_size:
+            return
+        after = (page[-1]["created_at"], page[-1]["id"])
+
+TOKEN_PATTERN = re.compile(r"\w+")
+NGRAM_SIZE = 3
+TOKEN_MERGE_THRESHOLD = 1024
+
+class FieldIndex:
+    """Token and trigram postings for one text field"""
+
+    def __init__(self):
+        self.texts: Dict[str, str] = {}
+        self.tokens: Dict[str, Set[str]] = {}
+        # Sorted token list for prefix lookups; new tokens wait in a small
+        # buffer and are merged in bulk so inserts never shift the whole list
+        self.sorted_tokens: List[str] = []
+        self.new_tokens: Set[str] = set()
+        self.grams: Dict[str, Set[str]] = {}
+        # Texts too short to produce an n-gram are checked directly
+        self.short_docs: Set[str] = set()
+
+    @staticmethod
+    def _grams(text: str) -> Set[str]:
+        return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+    def add(self, doc_id: str, text: Optional[str]):
+        text = (text or "").lower()
+        self.texts[doc_id] = text
+        for token in set(TOKEN_PATTERN.findall(text)):
+            postings = self.tokens.get(token)
+            if postings is None:
+                postings = self.tokens[token] = set()
+                self.new_tokens.add(token)
+            postings.add(doc_id)
+        for gram in self._grams(text):
+            self.grams.setdefault(gram, set()).add(doc_id)
+        if len(text) < NGRAM_SIZE:
+            self.short_docs.add(doc_id)
+
+    def remove(self, doc_id: str):
+        text = self.texts.pop(doc_id, None)
+        if text is None:
+            return
+        for token in set(TOKEN_PATTERN.findall(text)):
+            postings = self.tokens.get(token)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    # Left in sorted_tokens and dropped at the next merge
+                    del self.tokens[token]
+                    self.new_tokens.discard(token)
+        for gram in self._grams(text):
+            postings = self.grams.get(gram)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self.grams[gram]
+        self.short_docs.discard(doc_id)
+
+    def compact(self):
+        """Fold buffered tokens into the sorted list and drop removed ones"""
+        live = [token for token in self.sorted_tokens if token in self.tokens]
+        # A token removed and re-added may still sit in the sorted list
+        present = set(live)
+        fresh = sorted(token for token in self.new_tokens if token not in present)
+        self.sorted_tokens = list(heapq.merge(live, fresh))
+        self.new_tokens.clear()
+
+    def prefix_matches(self, prefix: str) -> Set[str]:
+        """Documents with a token starting with prefix"""
+        if len(self.new_tokens) > TOKEN_MERGE_THRESHOLD:
+            self.compact()
+
+        matches: Set[str] = set()
+        index = bisect.bisect_left(self.sorted_tokens, prefix)
+        while index < len(self.sorted_tokens) and self.sorted_tokens[index].startswith(prefix):
+            postings = self.tokens.get(self.sorted_tokens[index])
+            if postings:
+                matches |= postings
+            index += 1
+        for token in self.new_tokens:
+            if token.startswith(prefix):
+                matches |= self.tokens[token]
+        return matches
+
+    def substring_matches(self, term: str) -> Set[str]:
+        """Documents whose text contains term anywhere"""
+        if not term:
+            return set(self.texts)
+
+        if len(term) < NGRAM_SIZE:
+            matches = {doc_id for doc_id in self.short_docs if term in self.texts[doc_id]}
+            for gram, postings in self.grams.items():
+                if term in gram:
+                    matches |= postings
+            return matches
+
+        # Intersect the rarest grams first, then confirm the candidates
+        grams = sorted(self._grams(term), key=lambda gram: len(self.grams.get(gram, ())))
+        candidates: Optional[Set[str]] = None
+        for gram in grams:
+            postings = self.grams.get(gram)
+            if not postings:
+                return set()
+            candidates = set(postings) if candidates is None else candidates & postings
+            if not candidates:
+                return set()
+        if len(grams) == 1:
+            return candidates
+        return {doc_id for doc_id in candidates if term in self.texts[doc_id]}
+
+class TextIndex:
+    """Incrementally maintained search index over item names and descriptions"""
+
+    def __init__(self):
+        self.name = FieldIndex()
+        self.description = FieldIndex()
+
+    def add(self, item: dict):
+        self.name.add(item["id"], item.get("name"))
+        self.description.add(item["id"], item.get("description"))
+
+    def remove(self, item_id: str):
+        self.name.remove(item_id)
+        self.description.remove(item_id)
+
+    def update(self, item: dict):
+        self.remove(item["id"])
+        self.add(item)
+
+    def compact(self):
+        self.name.compact()
+        self.description.compact()
+
+    def _rank(self, doc_id: str, term: str) -> Tuple[int, str, str]:
+        name = self.name.texts.get(doc_id, "")
+        position = name.find(term)
+        if name == term:
+            score = 0
+        elif position == 0:
+            score = 1
+        elif position > 0 and not name[position - 1].isalnum():
+            score = 2
+        elif position > 0:
+            score = 3
+        else:
+            score = 4
+        return score, name, doc_id
+
+    def search(self, term: str, mode: str = "substring", include_description: bool = False,
+               limit: int = SEARCH_DEFAULT_LIMIT) -> Tuple[int, List[str]]:
+        """Return (total matches, best-ranked ids up to limit)"""
+        term = term.lower()
+        fields = [self.name, self.description] if include_description else [self.name]
+
+        matches: Set[str] = set()
+        for field in fields:
+            if mode == "prefix":
+                tokens = TOKEN_PATTERN.findall(term)
+                field_matches = set(field.texts) if not tokens else None
+                for token in tokens:
+                    token_matches = field.prefix_matches(token)
+                    field_matches = token_matches if field_matches is None else field_matches & token_matches
+                matches |= field_matches
+            else:
+                matches |= field.substring_matches(term)
+
+        ranked = heapq.nsmallest(limit, matches, key=lambda doc_id: self._rank(doc_id, term))
+        return len(matches), ranked
+
+search_index = TextIndex()
+# Position in the store's change log the search index has caught up to
+search_cursor: Optional[int] = None
+search_refresh_task: Optional[asyncio.Task] = None
+
+async def build_search_index() -> TextIndex:
+    index = TextIndex()
+    async for item in iter_items(EXPORT_BATCH_SIZE):
+        index.add(item)
+    index.compact()
+    return index
+
+async def refresh_search_index():
+    """Apply writes other processes made to the shared store to the search index and read cache"""
+    global search_index, search_cursor
+    while True:
+        cursor, item_ids = await items_db.changes_since(search_cursor, EXPORT_BATCH_SIZE)
+        if item_ids is None:
+            logger.warning(f"Item change log no longer reaches the search index in {REGION}; rebuilding it")
+            search_cursor = cursor
+            search_index = await build_search_index()
+            read_cache.invalidate([])
+            return
+        if cursor == search_cursor:
+            return
+        if item_ids:
+            found = await items_db.get_many(item_ids)
+            for item_id in item_ids:
+                if item_id in found:
+                    search_index.update(found[item_id])
+                else:
+                    search_index.remove(item_id)
+            read_cache.invalidate(item_ids)
+        search_cursor = cursor
+
+async def search_refresh_loop():
+    while True:
+        await asyncio.sleep(SEARCH_REFRESH_INTERVAL)
+        try:
+            await refresh_search_index()
+        except Exception as e:
+            logger.error(f"Search index refresh failed in {REGION}: {str(e)}")
+
+class CachedPayload:
+    """A serialized read response with its validators"""
+
+    def __init__(self, body: bytes, version: Optional[int], last_modified: datetime):
+        self.body = body
+        self.etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        self.version = version
+        self.last_modified = last_modified
+        self.expires_at = time.monotonic() + READ_CACHE_TTL
+
+class ReadCache:
+    """Serialized read responses, invalidated by the item write paths.
+
+    Collection and stats entries are tied to the global write version; single
+    item entries survive unrelated writes and are dropped when their item changes.
+    The TTL bounds staleness from writes made by other replicas.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        self.entries: "OrderedDict[tuple, CachedPayload]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: tuple) -> Optional[CachedPayload]:
+        entry = self.entries.get(key)
+        if entry is None or entry.expires_at < time.monotonic() or (
+            entry.version is not None and entry.version != self.version
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def store(self, key: tuple, payload: Any, built_at_version: int, versioned: bool = True) -> CachedPayload:
+        body = json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+        entry = CachedPayload(body, built_at_version if versioned else None, self.last_modified)
+        if built_at_version != self.version:
+            # A write landed while this payload was being built; serve it but don't keep it
+            return entry
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > READ_CACHE_SIZE:
+            self.entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, item_ids: List[str]):
+        """Called on every write: bumps the collection version and drops changed items"""
+        self.version += 1
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        for item_id in item_ids:
+            self.entries.pop(("item", item_id), None)
+
+read_cache = ReadCache()
+
+def is_not_modified(request: Request, entry: CachedPayload) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or entry.etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return entry.last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+async def cached_read(request: Request, key: tuple, build, versioned: bool = True) -> Response:
+    """Serve a read from the cache, building and serializing it only on a miss"""
+    entry = read_cache.lookup(key)
+    if entry is None:
+        version = read_cache.version
+        entry = read_cache.store(key, await build(), version, versioned)
+
+    headers = {
+        "ETag": entry.etag,
+        "Last-Modified": format_datetime(entry.last_modified, usegmt=True)
+    }
+    if is_not_modified(request, entry):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+@app.on_event("startup")
+async def startup_event():
+    """Open the item store and build the search index"""
+    global search_index, search_cursor, search_refresh_task
+    await items_db.start()
+    # Taken before the build so writes landing during it are replayed
+    search_cursor, _ = await items_db.changes_since(None, 0)
+    search_index = await build_search_index()
+    if SEARCH_REFRESH_INTERVAL > 0:
+        search_refresh_task = asyncio.create_task(search_refresh_loop())
+    logger.info(f"API service started in {REGION} with {items_db.name} item store")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush pending writes and close the item store"""
+    if search_refresh_task is not None:
+        search_refresh_task.cancel()
+    await items_db.close()
+    logger.info(f"API service stopped in {REGION}")
 
 @app.get("/")
 @app.get("/health")
@@ -48,23 +948,153 @@ async def health_check():
     }
 
 @app.get("/items")
-async def get_items():
-    """Get all items"""
-    logger.info(f"Fetching all items from {REGION}")
-    return {
-        "items": list(items_db.values()),
-        "count": len(items_db),
-        "region": REGION
-    }
+async def get_items(request: Request, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+                    fields: Optional[str] = None):
+    """Get a page of items ordered by creation time"""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    selected = parse_fields(fields)
+    after = decode_cursor(cursor)
+
+    async def build():
+        logger.info(f"Fetching items page from {REGION}")
+        page = await items_db.list_page(after, limit)
+        return {
+            "items": [project(item, selected) for item in page],
+            "count": await items_db.count(),
+            "next_cursor": encode_cursor(page[-1]) if len(page) == limit else None,
+            "region": REGION
+        }
+
+    return await cached_read(request, ("items", limit, cursor, fields), build)
+
+@app.get("/items/export")
+async def export_items(fields: Optional[str] = None):
+    """Stream every item as NDJSON"""
+    selected = parse_fields(fields)
+    logger.info(f"Exporting items from {REGION}")
+
+    async def generate():
+        async for item in iter_items(EXPORT_BATCH_SIZE):
+            yield json.dumps(project(item, selected)) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@app.post("/items/bulk")
+async def bulk_create_items(request: Request):
+    """Create many items from a JSON array or NDJSON stream"""
+
+    async def apply_chunk(chunk: List[Any]):
+        items, errors = validate_chunk(chunk)
+        created_at = datetime.utcnow().isoformat()
+        positions = []
+        ops = []
+        for position, item in enumerate(items):
+            if item is None:
+                continue
+            item.id = str(uuid.uuid4())
+            item.created_at = created_at
+            positions.append(position)
+            ops.append(("insert", item.dict()))
+
+        results = await items_db.apply_bulk(ops) if ops else []
+        collect_write_results(positions, results, errors)
+        ids: List[Optional[str]] = [None] * len(chunk)
+        for position, (_, stored) in zip(positions, ops):
+            if position not in errors:
+                search_index.add(stored)
+                ids[position] = stored["id"]
+        read_cache.invalidate([item_id for item_id in ids if item_id])
+        return ids, errors
+
+    result = await run_bulk(request, apply_chunk)
+    logger.info(f"Bulk created {result['succeeded']} items in {REGION} ({result['failed']} failed)")
+    return result
+
+@app.put("/items/bulk")
+async def bulk_update_items(request: Request):
+    """Update many items; each record must carry its id"""
+
+    async def apply_chunk(chunk: List[Any]):
+        items, errors = validate_chunk(chunk)
+        for position, item in enumerate(items):
+            if item is not None and not item.id:
+                errors[position] = "id: Field required"
+        existing = await items_db.get_many([
+            item.id for position, item in enumerate(items) if item is not None and position not in errors
+        ])
+
+        positions = []
+        ops = []
+        for position, item in enumerate(items):
+            if item is None or position in errors:
+                continue
+            current = existing.get(item.id)
+            if current is None:
+                errors[position] = "Item not found"
+                continue
+            item.created_at = current.get("created_at")
+            positions.append(position)
+            ops.append(("update", item.dict()))
+
+        results = await items_db.apply_bulk(ops) if ops else []
+        collect_write_results(positions, results, errors)
+        ids: List[Optional[str]] = [None] * len(chunk)
+        for position, (_, stored) in zip(positions, ops):
+            if position not in errors:
+                search_index.update(stored)
+                ids[position] = stored["id"]
+        read_cache.invalidate([item_id for item_id in ids if item_id])
+        return ids, errors
+
+    result = await run_bulk(request, apply_chunk)
+    logger.info(f"Bulk updated {result['succeeded']} items in {REGION} ({result['failed']} failed)")
+    return result
+
+@app.delete("/items/bulk")
+async def bulk_delete_items(request: Request):
+    """Delete many items given ids or {"id": ...} records"""
+
+    async def apply_chunk(chunk: List[Any]):
+        errors: Dict[int, str] = {}
+        positions = []
+        ops = []
+        for position, record in enumerate(chunk):
+            item_id = record.get("id") if isinstance(record, dict) else record
+            if isinstance(record, MalformedRecord):
+                errors[position] = record.error
+            elif not isinstance(item_id, str):
+                errors[position] = "id: Input should be a valid string"
+            else:
+                positions.append(position)
+                ops.append(("delete", item_id))
+
+        results = await items_db.apply_bulk(ops) if ops else []
+        collect_write_results(positions, results, errors)
+        ids: List[Optional[str]] = [None] * len(chunk)
+        for position, (_, item_id) in zip(positions, ops):
+            if position not in errors:
+                search_index.remove(item_id)
+                ids[position] = item_id
+        read_cache.invalidate([item_id for item_id in ids if item_id])
+        return ids, errors
+
+    result = await run_bulk(request, apply_chunk)
+    logger.info(f"Bulk deleted {result['succeeded']} items from {REGION} ({result['failed']} failed)")
+    return result
 
 @app.get("/items/{item_id}")
-async def get_item(item_id: str):
+async def get_item(item_id: str, request: Request):
     """Get specific item by ID"""
-    if item_id not in items_db:
-        raise HTTPException(status_code=404, detail="Item not found")
 
-    logger.info(f"Fetching item {item_id} from {REGION}")
-    return items_db[item_id]
+    async def build():
+        item = await items_db.get(item_id)
+        if item is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+
+        logger.info(f"Fetching item {item_id} from {REGION}")
+        return item
+
+    return await cached_read(request, ("item", item_id), build, versioned=False)
 
 @app.post("/items")
 async def create_item(item: Item):
@@ -73,39 +1103,49 @@ async def create_item(item: Item):
     item.id = item_id
     item.created_at = datetime.utcnow().isoformat()
 
-    items_db[item_id] = item.dict()
+    stored = item.dict()
+    await items_db.insert(stored)
+    search_index.add(stored)
+    read_cache.invalidate([item_id])
     logger.info(f"Created item {item_id} in {REGION}")
 
     return {
         "message": "Item created successfully",
-        "item": items_db[item_id],
+        "item": stored,
         "region": REGION
     }
 
 @app.put("/items/{item_id}")
 async def update_item(item_id: str, item: Item):
     """Update existing item"""
-    if item_id not in items_db:
+    existing = await items_db.get(item_id)
+    if existing is None:
         raise HTTPException(status_code=404, detail="Item not found")
 
     item.id = item_id
-    item.created_at = items_db[item_id].get("created_at")
-    items_db[item_id] = item.dict()
+    item.created_at = existing.get("created_at")
+    stored = item.dict()
+    if not await items_db.update(stored):
+        raise HTTPException(status_code=404, detail="Item not found")
+    search_index.update(stored)
+    read_cache.invalidate([item_id])
 
     logger.info(f"Updated item {item_id} in {REGION}")
     return {
         "message": "Item updated successfully",
-        "item": items_db[item_id],
+        "item": stored,
         "region": REGION
     }
 
 @app.delete("/items/{item_id}")
 async def delete_item(item_id: str):
     """Delete item"""
-    if item_id not in items_db:
+    deleted_item = await items_db.get(item_id)
+    if deleted_item is None or not await items_db.delete(item_id):
         raise HTTPException(status_code=404, detail="Item not found")
+    search_index.remove(item_id)
+    read_cache.invalidate([item_id])
 
-    deleted_item = items_db.pop(item_id)
     logger.info(f"Deleted item {item_id} from {REGION}")
 
     return {
@@ -129,30 +1169,34 @@ async def execute_query(query: QueryRequest):
     }
 
     if query.query_type == "count":
-        results["results"] = {"total_items": len(items_db)}
+        results["results"] = {"total_items": await items_db.count()}
     elif query.query_type == "search":
-        search_term = query.parameters.get("term", "") if query.parameters else ""
-        matching_items = [
-            item for item in items_db.values()
-            if search_term.lower() in item.get("name", "").lower()
-        ]
-        results["results"] = matching_items
+        term, mode, include_description, limit = parse_search_parameters(query.parameters or {})
+        total, item_ids = search_index.search(term, mode=mode, include_description=include_description, limit=limit)
+        found = await items_db.get_many(item_ids)
+        results["results"] = [found[item_id] for item_id in item_ids if item_id in found]
+        results["total_matches"] = total
 
     return results
 
 @app.get("/stats")
-async def get_stats():
+async def get_stats(request: Request):
     """Get service statistics"""
-    return {
-        "service": "api-service",
-        "region": REGION,
-        "stats": {
-            "total_items": len(items_db),
-            "database_connected": bool(SQL_CONNECTION_STRING),
-            "storage_connected": bool(STORAGE_CONNECTION_STRING)
-        },
-        "timestamp": datetime.utcnow().isoformat()
-    }
+
+    async def build():
+        return {
+            "service": "api-service",
+            "region": REGION,
+            "stats": {
+                "total_items": await items_db.count(),
+                "storage_backend": items_db.name,
+                "database_connected": bool(SQL_CONNECTION_STRING),
+                "storage_connected": bool(STORAGE_CONNECTION_STRING)
+            },
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    return await cached_read(request, ("stats",), build)
 
 @app.get("/test/database")
 async def test_database():
@@ -0,0 +1,87 @@
+"""
+Search Benchmark - Inverted Index vs Linear Scan
+Compares the /query search index against the original substring scan over
+item names at several dataset sizes.
+
+Usage (from microservices/api-service):
+    python bench_search.py
+    python bench_search.py --sizes 10000,100000 --queries 50
+"""
+import argparse
+import random
+import string
+import time
+
+from app import TextIndex
+
+WORDS = [
+    "alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel",
+    "india", "juliet", "kilo", "lima", "mike", "november", "oscar", "papa",
+    "quebec", "romeo", "sierra", "tango", "uniform", "victor", "whiskey",
+    "xray", "yankee", "zulu", "widget", "gadget", "sensor", "module"
+]
+
+def make_items(count: int, rng: random.Random) -> list:
+    items = []
+    for i in range(count):
+        suffix = "".join(rng.choices(string.ascii_lowercase + string.digits, k=6))
+        name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {suffix}"
+        items.append({"id": f"item-{i}", "name": name, "description": None})
+    return items
+
+def linear_scan(items: list, term: str) -> list:
+    """The original search: lowercase and substring-check every name"""
+    return [item for item in items if term.lower() in item.get("name", "").lower()]
+
+def make_queries(items: list, count: int, rng: random.Random) -> dict:
+    """Selective terms come from the random suffix, broad ones from the shared vocabulary"""
+    selective = []
+    broad = []
+    for _ in range(count):
+        suffix = rng.choice(items)["name"].rsplit(" ", 1)[1]
+        start = rng.randrange(0, len(suffix) - 3)
+        selective.append(suffix[start:start + rng.randint(3, 5)])
+        word = rng.choice(WORDS)
+        broad.append(word[:rng.randint(3, len(word))])
+    return {"selective": selective, "broad": broad}
+
+def time_per_query(search, queries: list) -> float:
+    started = time.perf_counter()
+    for term in queries:
+        search(term)
+    return (time.perf_counter() - started) * 1000 / len(queries)
+
+def bench(size: int, query_count: int, rng: random.Random):
+    items = make_items(size, rng)
+    queries = make_queries(items, query_count, rng)
+
+    started = time.perf_counter()
+    index = TextIndex()
+    for item in items:
+        index.add(item)
+    index.compact()
+    build_seconds = time.perf_counter() - started
+
+    print(f"{size:>9,} items | index build {build_seconds:.2f}s")
+    for kind, terms in queries.items():
+        scan_ms = time_per_query(lambda term: linear_scan(items, term), terms)
+        index_ms = time_per_query(lambda term: index.search(term, limit=100), terms)
+        prefix_ms = time_per_query(lambda term: index.search(term, mode="prefix", limit=100), terms)
+        print(
+            f"          {kind:<9} | scan {scan_ms:9.3f} ms/q | index {index_ms:8.3f} ms/q | "
+            f"prefix {prefix_ms:8.3f} ms/q | speedup {scan_ms / index_ms:7.1f}x"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark item search")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated dataset sizes")
+    parser.add_argument("--queries", type=int, default=20, help="Queries per size")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for size in [int(s) for s in args.sizes.split(",")]:
+        bench(size, args.queries, rng)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Bulk endpoints: per-record results when some records fail
+
+Run from microservices/api-service:
+    python -m pytest -q test_bulk.py
+"""
+import json
+import os
+import tempfile
+
+# A throwaway SQLite file per test run, set before app reads its settings
+os.environ["ITEM_STORE_BACKEND"] = "sqlite"
+os.environ["SQLITE_PATH"] = os.path.join(tempfile.mkdtemp(), "items.db")
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+
+@pytest.fixture
+def client(monkeypatch):
+    # Small chunks so error indexes have to be offset across chunks
+    monkeypatch.setattr(app, "BULK_CHUNK_SIZE", 2)
+    with TestClient(app.app) as client:
+        yield client
+        ids = [item["id"] for item in client.get("/items", params={"limit": app.MAX_PAGE_SIZE}).json()["items"]]
+        if ids:
+            client.request("DELETE", "/items/bulk", json=ids)
+
+def count(client: TestClient) -> int:
+    return client.post("/query", json={"query_type": "count"}).json()["results"]["total_items"]
+
+def search(client: TestClient, term: str) -> list:
+    response = client.post("/query", json={"query_type": "search", "parameters": {"term": term}})
+    return sorted(item["name"] for item in response.json()["results"])
+
+def test_create_keeps_valid_records_and_reports_invalid_ones(client):
+    response = client.post("/items/bulk", json=[
+        {"name": "bulk alpha"},
+        {"description": "no name"},
+        {"name": "bulk bravo"},
+        "not an object",
+        {"name": "bulk charlie"}
+    ])
+    assert response.status_code == 200
+    result = response.json()
+    assert result["succeeded"] == 3
+    assert result["failed"] == 2
+    assert [error["index"] for error in result["errors"]] == [1, 3]
+    assert result["errors"][0]["detail"] == "name: Field required"
+    assert [item_id is None for item_id in result["ids"]] == [False, True, False, True, False]
+    assert count(client) == 3
+    assert search(client, "bulk") == ["bulk alpha", "bulk bravo", "bulk charlie"]
+
+def test_ndjson_malformed_line_fails_alone(client):
+    body = "\n".join([json.dumps({"name": "ndjson one"}), "{not json", json.dumps({"name": "ndjson two"})])
+    response = client.post("/items/bulk", content=body, headers={"content-type": "application/x-ndjson"})
+    result = response.json()
+    assert result["succeeded"] == 2
+    assert [error["index"] for error in result["errors"]] == [1]
+    assert result["errors"][0]["detail"].startswith("Invalid JSON")
+    assert count(client) == 2
+
+def test_update_and_delete_report_missing_items(client):
+    first, second = client.post("/items/bulk", json=[{"name": "keep me"}, {"name": "drop me"}]).json()["ids"]
+
+    result = client.put("/items/bulk", json=[
+        {"id": first, "name": "kept"},
+        {"id": "missing", "name": "nobody"},
+        {"name": "no id"}
+    ]).json()
+    assert result["succeeded"] == 1
+    assert {error["index"]: error["detail"] for error in result["errors"]} == {
+        1: "Item not found", 2: "id: Field required"
+    }
+    assert client.get(f"/items/{first}").json()["name"] == "kept"
+    assert search(client, "kept") == ["kept"]
+
+    result = client.request("DELETE", "/items/bulk", json=[second, "missing", 42]).json()
+    assert result["succeeded"] == 1
+    assert {error["index"]: error["detail"] for error in result["errors"]} == {
+        1: "Item not found", 2: "id: Input should be a valid string"
+    }
+    assert client.get(f"/items/{second}").status_code == 404
+    assert count(client) == 1
+
+def test_store_error_rolls_back_only_its_record(client):
+    existing = client.post("/items", json={"name": "original"}).json()["item"]
+    duplicate = dict(existing, name="duplicate")
+    fresh = {"id": "fresh-id", "name": "fresh", "description": None, "created_at": existing["created_at"]}
+
+    results = client.portal.call(app.items_db.apply_bulk, [("insert", duplicate), ("insert", fresh)])
+    assert isinstance(results[0], Exception)
+    assert results[1] == 1
+    assert client.get(f"/items/{existing['id']}").json()["name"] == "original"
+    assert client.get("/items/fresh-id").json()["name"] == "fresh"
+    assert count(client) == 2
@@ -3,11 +3,18 @@ Gateway Service - Public Entry Point
 Handles all incoming external requests and routes to internal services
 """
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 import httpx
 import os
 import logging
+import asyncio
+import math
+import random
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from azure.identity import DefaultAzureCredential
 from azure.storage.blob import BlobServiceClient
 import pyodbc
@@ -27,6 +34,835 @@ SCHEDULER_SERVICE_URL = os.getenv("SCHEDULER_SERVICE_URL", "")
 SQL_CONNECTION_STRING = os.getenv("SQL_CONNECTION_STRING", "")
 STORAGE_CONNECTION_STRING = os.getenv("STORAGE_CONNECTION_STRING", "")
 
+# Upstream connection pool settings
+UPSTREAM_HTTP2 = os.getenv("UPSTREAM_HTTP2", "false").lower() == "true"
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100"))
+UPSTREAM_MAX_KEEPALIVE = int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "20"))
+UPSTREAM_KEEPALIVE_EXPIRY = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "30"))
+UPSTREAM_POOL_TIMEOUT = float(os.getenv("UPSTREAM_POOL_TIMEOUT", "5"))
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))
+HEALTH_CHECK_DEADLINE = float(os.getenv("HEALTH_CHECK_DEADLINE", "5"))
+HEALTH_REFRESH_INTERVAL = float(os.getenv("HEALTH_REFRESH_INTERVAL", "10"))
+HEALTH_SNAPSHOT_TTL = float(os.getenv("HEALTH_SNAPSHOT_TTL", "30"))
+
+# Proxy mode: "buffered" re-encodes JSON replies, "stream" passes bodies through untouched
+PROXY_MODE = os.getenv("PROXY_MODE", "buffered").lower()
+PROXY_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"]
+# API paths that are always streamed: bulk payloads and NDJSON exports
+STREAM_PATHS = tuple(
+    p.strip().strip("/") for p in os.getenv("STREAM_PATHS", "items/bulk,items/export").split(",") if p.strip()
+)
+# Processor paths that are always streamed: NDJSON / JSON array bodies consumed incrementally
+PROCESSOR_STREAM_PATHS = tuple(
+    p.strip().strip("/") for p in os.getenv("PROCESSOR_STREAM_PATHS", "stream,transform/stream").split(",") if p.strip()
+)
+# Worker paths that are always streamed: the job event stream is held open indefinitely
+WORKER_STREAM_PATHS = tuple(
+    p.strip().strip("/") for p in os.getenv("WORKER_STREAM_PATHS", "jobs/events").split(",") if p.strip()
+)
+
+# Circuit breaker, retry budget and hedging settings
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", "30"))
+BREAKER_HALF_OPEN_PROBES = int(os.getenv("BREAKER_HALF_OPEN_PROBES", "1"))
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+RETRY_BACKOFF = float(os.getenv("RETRY_BACKOFF", "0.05"))
+RETRY_BUDGET_RATIO = float(os.getenv("RETRY_BUDGET_RATIO", "0.1"))
+RETRY_BUDGET_TOKENS = float(os.getenv("RETRY_BUDGET_TOKENS", "10"))
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "false").lower() == "true"
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", "0.05"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+LATENCY_WINDOW = int(os.getenv("LATENCY_WINDOW", "200"))
+
+# Only these methods are safe to retry or hedge
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+# Gateway-side cache of ETag-carrying API GETs
+GATEWAY_CACHE_ENABLED = os.getenv("GATEWAY_CACHE_ENABLED", "false").lower() == "true"
+GATEWAY_CACHE_SIZE = int(os.getenv("GATEWAY_CACHE_SIZE", "512"))
+GATEWAY_CACHE_TTL = float(os.getenv("GATEWAY_CACHE_TTL", "2"))
+GATEWAY_CACHE_MAX_BODY = int(os.getenv("GATEWAY_CACHE_MAX_BODY", "1048576"))
+
+# Per-route upstream timeouts (seconds)
+ROUTE_TIMEOUTS = {
+    "api": float(os.getenv("API_TIMEOUT", "30")),
+    "worker": float(os.getenv("WORKER_TIMEOUT", "30")),
+    "processor": float(os.getenv("PROCESSOR_TIMEOUT", "60")),
+    "scheduler": float(os.getenv("SCHEDULER_TIMEOUT", "10"))
+}
+
+SERVICE_URLS = {
+    "api": API_SERVICE_URL,
+    "worker": WORKER_SERVICE_URL,
+    "processor": PROCESSOR_SERVICE_URL,
+    "scheduler": SCHEDULER_SERVICE_URL
+}
+
+# Latency-aware routing across regions
+EWMA_ALPHA = float(os.getenv("EWMA_ALPHA", "0.3"))
+ROUTING_REGION_PENALTY = float(os.getenv("ROUTING_REGION_PENALTY", "0.05"))
+ROUTING_ERROR_PENALTY = float(os.getenv("ROUTING_ERROR_PENALTY", "1.0"))
+ROUTING_SATURATION_PENALTY = float(os.getenv("ROUTING_SATURATION_PENALTY", "0.5"))
+FAILOVER_MAX_ENDPOINTS = int(os.getenv("FAILOVER_MAX_ENDPOINTS", "2"))
+
+def parse_service_endpoints(service_name: str, default_url: str) -> List[Tuple[str, str]]:
+    """Read (region, url) pairs for a service.
+
+    {SERVICE}_SERVICE_URLS takes a comma-separated list of region=url entries,
+    e.g. "eastus=http://api-east,westus=http://api-west". Entries without a
+    region, and the single {SERVICE}_SERVICE_URL fallback, count as local.
+    """
+    raw = os.getenv(f"{service_name.upper()}_SERVICE_URLS", "")
+    endpoints = []
+    for entry in raw.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        # Split on the first "=" only, so URLs may carry query strings; a "://" before it means
+        # the entry is a bare URL with no region
+        region, separator, url = entry.partition("=")
+        if not separator or "://" in region:
+            region, url = REGION, entry
+        endpoints.append((region.strip() or REGION, url.strip()))
+    if not endpoints and default_url:
+        endpoints.append((REGION, default_url))
+    return endpoints
+
+SERVICE_ENDPOINTS = {
+    service_name: parse_service_endpoints(service_name, url)
+    for service_name, url in SERVICE_URLS.items()
+}
+
+# Headers that must not be forwarded between client and upstream
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "host"
+}
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+class CircuitOpenError(Exception):
+    """Raised when an upstream's circuit breaker rejects a request"""
+
+    def __init__(self, service_name: str, retry_after: float):
+        super().__init__(f"{service_name} service circuit is open")
+        self.service_name = service_name
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with half-open probing"""
+
+    def __init__(self):
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.half_open_in_flight = 0
+        self.times_opened = 0
+
+    def allow_request(self) -> bool:
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < BREAKER_RESET_TIMEOUT:
+                return False
+            self.state = "half_open"
+            self.half_open_in_flight = 0
+
+        if self.state == "half_open":
+            if self.half_open_in_flight >= BREAKER_HALF_OPEN_PROBES:
+                return False
+            self.half_open_in_flight += 1
+
+        return True
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        if self.state == "half_open":
+            self.state = "closed"
+            logger.info("Circuit closed after successful half-open probe")
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= BREAKER_FAILURE_THRESHOLD:
+            if self.state != "open":
+                self.times_opened += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """Give back a half-open slot whose request never reported an outcome"""
+        if self.state == "half_open" and self.half_open_in_flight > 0:
+            self.half_open_in_flight -= 1
+
+    def retry_after(self) -> float:
+        if self.state != "open":
+            return 0.0
+        return max(0.0, BREAKER_RESET_TIMEOUT - (time.monotonic() - self.opened_at))
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "retry_after": round(self.retry_after(), 2)
+        }
+
+class RetryBudget:
+    """Token bucket that caps retries and hedges to a fraction of regular traffic"""
+
+    def __init__(self):
+        self.tokens = RETRY_BUDGET_TOKENS
+
+    def deposit(self):
+        self.tokens = min(self.tokens + RETRY_BUDGET_RATIO, RETRY_BUDGET_TOKENS)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+class UpstreamPool:
+    """Long-lived keep-alive connection pool for a single backend service"""
+
+    def __init__(self, name: str, base_url: str, timeout: float, region: str = REGION):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.region = region
+        self.ewma_latency: Optional[float] = None
+        self.ewma_error_rate = 0.0
+        self.client: Optional[httpx.AsyncClient] = None
+        self.breaker = CircuitBreaker()
+        self.retry_budget = RetryBudget()
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_requests = 0
+        self.total_errors = 0
+        self.pool_timeouts = 0
+        self.total_retries = 0
+        self.total_hedges = 0
+        self.hedge_wins = 0
+        self.breaker_rejections = 0
+
+    async def start(self):
+        """Open the pooled client"""
+        http2 = UPSTREAM_HTTP2 and HTTP2_AVAILABLE
+        if UPSTREAM_HTTP2 and not HTTP2_AVAILABLE:
+            logger.warning(f"HTTP/2 requested for {self.name} but h2 is not installed, using HTTP/1.1")
+
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=UPSTREAM_MAX_CONNECTIONS,
+                max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE,
+                keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(self.timeout, pool=UPSTREAM_POOL_TIMEOUT)
+        )
+        logger.info(f"Opened connection pool for {self.name} service (http2={http2})")
+
+    async def close(self):
+        """Close all pooled connections"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+            logger.info(f"Closed connection pool for {self.name} service")
+
+    def _acquire(self):
+        if self.client is None:
+            raise RuntimeError(f"Connection pool for {self.name} service is not started")
+        self.in_flight += 1
+        self.total_requests += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _record_error(self, error: Exception):
+        self.total_errors += 1
+        if isinstance(error, httpx.PoolTimeout):
+            self.pool_timeouts += 1
+
+    def record_outcome(self, latency: Optional[float], failed: bool):
+        """Fold one observation into the EWMA latency and error rate"""
+        if latency is not None:
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            else:
+                self.ewma_latency = EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.ewma_latency
+        self.ewma_error_rate = EWMA_ALPHA * (1.0 if failed else 0.0) + (1 - EWMA_ALPHA) * self.ewma_error_rate
+
+    @property
+    def is_local(self) -> bool:
+        return self.region == REGION
+
+    def routing_score(self) -> float:
+        """Expected cost in seconds: latency plus error, distance and load penalties"""
+        score = (self.ewma_latency or 0.0) + ROUTING_ERROR_PENALTY * self.ewma_error_rate
+        if not self.is_local:
+            score += ROUTING_REGION_PENALTY
+        score += ROUTING_SATURATION_PENALTY * self.in_flight / UPSTREAM_MAX_CONNECTIONS
+        return score
+
+    def is_available(self) -> bool:
+        """False while the breaker is open and still cooling down"""
+        return not (self.breaker.state == "open" and self.breaker.retry_after() > 0)
+
+    async def _send(self, method: str, path: str, stream: bool, sample_latency: bool = True,
+                    **kwargs) -> httpx.Response:
+        """Single attempt against the upstream, tracking saturation and latency.
+
+        Long-polls pass sample_latency=False so time spent waiting by design stays out of routing and hedging.
+        """
+        self._acquire()
+        started = time.perf_counter()
+        try:
+            if stream:
+                request = self.client.build_request(method, path, **kwargs)
+                response = await self.client.send(request, stream=True)
+            else:
+                response = await self.client.request(method, path, **kwargs)
+        except BaseException as e:
+            if isinstance(e, Exception):
+                self._record_error(e)
+                self.record_outcome(None, True)
+            self.in_flight -= 1
+            raise
+
+        latency = time.perf_counter() - started if sample_latency else None
+        if latency is not None:
+            self.latencies.append(latency)
+        self.record_outcome(latency, response.status_code >= 500)
+        if not stream:
+            self.in_flight -= 1
+        return response
+
+    def hedge_delay(self) -> Optional[float]:
+        """p95 of recent latencies, or None until enough samples exist"""
+        if len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return max(HEDGE_MIN_DELAY, ordered[int(len(ordered) * 0.95) - 1])
+
+    async def _hedged_send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a second copy if the first has not answered by the p95 latency"""
+        primary = asyncio.create_task(self._send(method, path, False, **kwargs))
+        delay = self.hedge_delay()
+        if delay is None:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self.retry_budget.withdraw():
+            return await primary
+
+        self.total_hedges += 1
+        hedge = asyncio.create_task(self._send(method, path, False, **kwargs))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _execute(self, method: str, path: str, stream: bool, **kwargs) -> httpx.Response:
+        """Send through the circuit breaker, retrying idempotent requests within budget"""
+        if not self.breaker.allow_request():
+            self.breaker_rejections += 1
+            raise CircuitOpenError(self.name, self.breaker.retry_after())
+
+        # Streamed request bodies cannot be replayed, so only bodiless idempotent calls retry
+        replayable = method in IDEMPOTENT_METHODS and kwargs.get("content") is None
+        hedge = replayable and HEDGE_ENABLED and not stream and kwargs.get("sample_latency", True)
+        self.retry_budget.deposit()
+
+        attempt = 1
+        while True:
+            try:
+                if hedge:
+                    response = await self._hedged_send(method, path, **kwargs)
+                else:
+                    response = await self._send(method, path, stream, **kwargs)
+            except asyncio.CancelledError:
+                self.breaker.release_probe()
+                raise
+            except Exception:
+                # The breaker counts one failure per client request, once its retries are spent
+                if not self._can_retry(replayable, attempt):
+                    self.breaker.record_failure()
+                    raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    self.breaker.record_success()
+                    return response
+                if not self._can_retry(replayable, attempt):
+                    self.breaker.record_failure()
+                    return response
+                if stream:
+                    await self.close_stream(response)
+
+            self.total_retries += 1
+            await asyncio.sleep(RETRY_BACKOFF * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+            attempt += 1
+
+    def _can_retry(self, replayable: bool, attempt: int) -> bool:
+        return (
+            replayable
+            and attempt < RETRY_MAX_ATTEMPTS
+            and self.breaker.state == "closed"
+            and self.retry_budget.withdraw()
+        )
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request through the pool and return the fully read response"""
+        return await self._execute(method, path, False, **kwargs)
+
+    async def probe(self, path: str, timeout: float) -> httpx.Response:
+        """Health probe that bypasses the breaker and retries"""
+        return await self._send("GET", path, False, timeout=timeout)
+
+    async def open_stream(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request and return the response with its body still unread.
+
+        The connection stays checked out until close_stream() is called.
+        """
+        return await self._execute(method, path, True, **kwargs)
+
+    async def close_stream(self, response: httpx.Response):
+        """Release a streamed response back to the pool"""
+        try:
+            await response.aclose()
+        finally:
+            self.in_flight -= 1
+
+    def metrics(self) -> dict:
+        """Pool usage and saturation metrics"""
+        return {
+            "url": self.base_url,
+            "region": self.region,
+            "timeout": self.timeout,
+            "ewma_latency_ms": round(self.ewma_latency * 1000, 2) if self.ewma_latency is not None else None,
+            "ewma_error_rate": round(self.ewma_error_rate, 4),
+            "routing_score": round(self.routing_score(), 4),
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "max_connections": UPSTREAM_MAX_CONNECTIONS,
+            "saturation": round(self.in_flight / UPSTREAM_MAX_CONNECTIONS, 4),
+            "total_requests": self.total_requests,
+            "total_errors": self.total_errors,
+            "pool_timeouts": self.pool_timeouts,
+            "total_retries": self.total_retries,
+            "retry_budget_tokens": round(self.retry_budget.tokens, 2),
+            "total_hedges": self.total_hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_delay": self.hedge_delay(),
+            "breaker_rejections": self.breaker_rejections
+        }
+
+# Failures where the request never reached the upstream and can safely go elsewhere
+NOT_SENT_ERRORS = (CircuitOpenError, httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+class UpstreamService:
+    """All regional endpoints of one service, routed by health and latency"""
+
+    def __init__(self, name: str, endpoints: List[UpstreamPool]):
+        self.name = name
+        self.endpoints = endpoints
+        self.failovers = 0
+
+    def ranked(self) -> List[UpstreamPool]:
+        """Endpoints ordered best first; cooling-down endpoints go last"""
+        return sorted(self.endpoints, key=lambda e: (not e.is_available(), e.routing_score()))
+
+    @property
+    def preferred(self) -> UpstreamPool:
+        return self.ranked()[0]
+
+    async def _dispatch(self, method: str, path: str, stream: bool, **kwargs) -> Tuple[UpstreamPool, httpx.Response]:
+        """Try endpoints best first, failing over to the next region when it is safe"""
+        content = kwargs.get("content")
+        body_replayable = content is None or isinstance(content, (bytes, str))
+        idempotent = method in IDEMPOTENT_METHODS and body_replayable
+        candidates = self.ranked()[:max(1, FAILOVER_MAX_ENDPOINTS)]
+
+        for index, endpoint in enumerate(candidates):
+            has_next = index + 1 < len(candidates)
+            try:
+                response = await endpoint._execute(method, path, stream, **kwargs)
+            except CircuitOpenError:
+                if not has_next:
+                    raise
+            except NOT_SENT_ERRORS:
+                if not (has_next and body_replayable):
+                    raise
+            except Exception:
+                if not (has_next and idempotent):
+                    raise
+            else:
+                if not (has_next and idempotent and response.status_code in RETRYABLE_STATUS_CODES):
+                    return endpoint, response
+                if stream:
+                    await endpoint.close_stream(response)
+
+            self.failovers += 1
+            logger.warning(f"Failing over {self.name} request from {endpoint.region} to {candidates[index + 1].region}")
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request to the best endpoint and return the fully read response"""
+        _, response = await self._dispatch(method, path, False, **kwargs)
+        return response
+
+    async def open_stream(self, method: str, path: str, **kwargs) -> Tuple[UpstreamPool, httpx.Response]:
+        """Open a streamed response; release it with the returned endpoint's close_stream()"""
+        return await self._dispatch(method, path, True, **kwargs)
+
+    async def start(self):
+        for endpoint in self.endpoints:
+            await endpoint.start()
+
+    async def close(self):
+        for endpoint in self.endpoints:
+            await endpoint.close()
+
+    def metrics(self) -> dict:
+        return {
+            "preferred_region": self.preferred.region,
+            "failovers": self.failovers,
+            "endpoints": [endpoint.metrics() for endpoint in self.endpoints]
+        }
+
+# Upstream services keyed by service name, populated on startup
+upstreams: Dict[str, UpstreamService] = {}
+
+def get_upstream(service_name: str) -> UpstreamService:
+    """Return the endpoints for a configured service or raise 503"""
+    upstream = upstreams.get(service_name)
+    if upstream is None:
+        raise HTTPException(status_code=503, detail=f"{service_name.capitalize()} service not configured")
+    return upstream
+
+def circuit_open_error(error: CircuitOpenError) -> HTTPException:
+    """Translate a rejected request into a 503 with Retry-After"""
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(math.ceil(error.retry_after))}
+    )
+
+def forward_headers(request: Request) -> dict:
+    """Copy client headers, dropping hop-by-hop ones"""
+    return {
+        key: value for key, value in request.headers.items()
+        if key.lower() not in HOP_BY_HOP_HEADERS
+    }
+
+def response_headers(response: httpx.Response) -> dict:
+    """Copy upstream response headers, dropping hop-by-hop and server-set ones"""
+    return {
+        key: value for key, value in response.headers.items()
+        if key.lower() not in HOP_BY_HOP_HEADERS and key.lower() not in ("date", "server")
+    }
+
+async def stream_proxy(upstream: UpstreamService, path: str, request: Request, **options) -> Response:
+    """Pass a request through to the upstream without buffering either body"""
+    has_body = "content-length" in request.headers or "transfer-encoding" in request.headers
+    endpoint, response = await upstream.open_stream(
+        request.method,
+        path,
+        params=request.url.query,
+        headers=forward_headers(request),
+        content=request.stream() if has_body else None,
+        **options
+    )
+    return StreamingResponse(
+        response.aiter_raw(),
+        status_code=response.status_code,
+        headers=response_headers(response),
+        background=BackgroundTask(endpoint.close_stream, response)
+    )
+
+# Upstream headers describing the body encoding; buffered mode re-encodes the body, so these are
+# dropped and every other end-to-end header (validators, Retry-After, ...) passes through
+REENCODED_HEADERS = ("content-type", "content-length", "content-encoding")
+
+async def buffered_proxy(upstream: UpstreamService, path: str, request: Request, **options) -> Response:
+    """Forward a request and re-encode the upstream JSON reply"""
+    body = await request.body()
+    response = await upstream.request(
+        request.method,
+        path,
+        params=request.url.query,
+        headers=forward_headers(request),
+        content=body or None,
+        **options
+    )
+    headers = {
+        key: value for key, value in response_headers(response).items()
+        if key.lower() not in REENCODED_HEADERS
+    }
+    if response.status_code == 304:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(
+        content=response.json() if response.text else {},
+        status_code=response.status_code,
+        headers=headers
+    )
+
+class CachedResponse:
+    """An upstream GET body with its validators"""
+
+    def __init__(self, response: httpx.Response):
+        self.body = response.content
+        self.etag = response.headers["etag"]
+        self.headers = {
+            key: response.headers[key]
+            for key in ("content-type", "etag", "last-modified")
+            if key in response.headers
+        }
+        self.refresh()
+
+    def refresh(self):
+        self.expires_at = time.monotonic() + GATEWAY_CACHE_TTL
+
+class GatewayCache:
+    """Small LRU of upstream GET responses keyed by path and query"""
+
+    def __init__(self):
+        self.entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > GATEWAY_CACHE_SIZE:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry; a write can change any cached read (lists, single items, /stats)"""
+        self.evicted += len(self.entries)
+        self.entries.clear()
+
+    def metrics(self) -> dict:
+        return {
+            "enabled": GATEWAY_CACHE_ENABLED,
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "evicted": self.evicted
+        }
+
+gateway_cache = GatewayCache()
+
+# Requests carrying credentials bypass the shared cache, so one caller's body never reaches another
+PRIVATE_REQUEST_HEADERS = ("authorization", "cookie")
+
+def is_cacheable(request: Request, path: str) -> bool:
+    return (
+        GATEWAY_CACHE_ENABLED and request.method == "GET" and not path.startswith(STREAM_PATHS)
+        and not any(header in request.headers for header in PRIVATE_REQUEST_HEADERS)
+    )
+
+async def cached_get(upstream: UpstreamService, path: str, request: Request) -> Response:
+    """Serve a GET from the gateway cache, revalidating with If-None-Match once stale"""
+    # Accept is part of the key since the upstream may pick the representation by it
+    key = f"{path}?{request.url.query}|{request.headers.get('accept', '')}"
+    entry = gateway_cache.get(key)
+
+    if entry is not None and entry.expires_at > time.monotonic():
+        gateway_cache.hits += 1
+    else:
+        headers = {
+            key: value for key, value in forward_headers(request).items()
+            if key not in ("if-none-match", "if-modified-since")
+        }
+        if entry is not None:
+            headers["if-none-match"] = entry.etag
+        response = await upstream.request("GET", path, params=request.url.query, headers=headers)
+
+        if response.status_code == 304 and entry is not None:
+            gateway_cache.revalidated += 1
+            entry.refresh()
+        elif response.status_code == 200 and "etag" in response.headers and len(response.content) <= GATEWAY_CACHE_MAX_BODY:
+            gateway_cache.misses += 1
+            entry = CachedResponse(response)
+            gateway_cache.put(key, entry)
+        else:
+            gateway_cache.misses += 1
+            gateway_cache.entries.pop(key, None)
+            return Response(
+                content=response.content,
+                status_code=response.status_code,
+                headers={k: v for k, v in response_headers(response).items()
+                         if k.lower() not in ("content-encoding", "content-length")}
+            )
+
+    client_tags = request.headers.get("if-none-match")
+    if client_tags and entry.etag in [tag.strip().removeprefix("W/") for tag in client_tags.split(",")]:
+        return Response(status_code=304, headers=entry.headers)
+    return Response(content=entry.body, status_code=200, headers=entry.headers)
+
+async def proxy(upstream: UpstreamService, path: str, request: Request, stream: bool = False, **options) -> Response:
+    """Forward a request using the configured proxy mode; options pass through to the upstream call"""
+    if stream or PROXY_MODE == "stream":
+        return await stream_proxy(upstream, path, request, **options)
+    return await buffered_proxy(upstream, path, request, **options)
+
+# Latest health probe result per service, kept fresh by the background refresher
+health_snapshots: Dict[str, dict] = {}
+health_refresh_task: Optional[asyncio.Task] = None
+health_probe_round: Optional[asyncio.Task] = None
+
+async def probe_endpoint(endpoint: UpstreamPool) -> dict:
+    """Run a single health probe against one regional endpoint"""
+    started = time.perf_counter()
+    try:
+        response = await endpoint.probe("/health", HEALTH_CHECK_TIMEOUT)
+        snapshot = {
+            "status": "healthy" if response.status_code == 200 else "unhealthy",
+            "url": endpoint.base_url
+        }
+    except Exception as e:
+        snapshot = {
+            "status": "unreachable",
+            "url": endpoint.base_url,
+            "error": str(e)
+        }
+    snapshot["region"] = endpoint.region
+    snapshot["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return snapshot
+
+def summarize_service_health(upstream: UpstreamService, endpoint_snapshots: List[dict]) -> dict:
+    """Report the preferred endpoint's health, with every region listed underneath"""
+    preferred = next(s for s in endpoint_snapshots if s["region"] == upstream.preferred.region)
+    healthy = [s for s in endpoint_snapshots if s["status"] == "healthy"]
+    summary = dict(preferred if preferred["status"] == "healthy" or not healthy else healthy[0])
+    if len(endpoint_snapshots) > 1:
+        summary["endpoints"] = endpoint_snapshots
+    return summary
+
+async def refresh_health_snapshots():
+    """Run a probe round, sharing it with any caller that arrives while it is in progress"""
+    global health_probe_round
+    if health_probe_round is None or health_probe_round.done():
+        health_probe_round = asyncio.create_task(run_probe_round())
+    await asyncio.shield(health_probe_round)
+
+async def run_probe_round():
+    """Probe every upstream concurrently under one overall deadline"""
+    tasks = {
+        (name, endpoint): asyncio.create_task(probe_endpoint(endpoint))
+        for name, upstream in upstreams.items()
+        for endpoint in upstream.endpoints
+    }
+    if not tasks:
+        return
+
+    done, pending = await asyncio.wait(tasks.values(), timeout=HEALTH_CHECK_DEADLINE)
+    for task in pending:
+        task.cancel()
+
+    results: Dict[str, List[dict]] = {name: [] for name in upstreams}
+    for (name, endpoint), task in tasks.items():
+        if task in done:
+            snapshot = task.result()
+        else:
+            endpoint.record_outcome(None, True)
+            snapshot = {
+                "status": "unreachable",
+                "url": endpoint.base_url,
+                "error": f"Health check exceeded {HEALTH_CHECK_DEADLINE}s deadline",
+                "region": endpoint.region,
+                "latency_ms": round(HEALTH_CHECK_DEADLINE * 1000, 2)
+            }
+        results[name].append(snapshot)
+
+    checked_at = datetime.utcnow().isoformat()
+    refreshed_at = time.monotonic()
+    for name, endpoint_snapshots in results.items():
+        summary = summarize_service_health(upstreams[name], endpoint_snapshots)
+        summary["checked_at"] = checked_at
+        summary["refreshed_at"] = refreshed_at
+        health_snapshots[name] = summary
+
+async def health_refresher():
+    """Keep health snapshots fresh in the background"""
+    while True:
+        try:
+            await refresh_health_snapshots()
+        except Exception as e:
+            logger.error(f"Health refresh failed: {str(e)}")
+        await asyncio.sleep(HEALTH_REFRESH_INTERVAL)
+
+def snapshot_is_fresh(snapshot: Optional[dict]) -> bool:
+    return snapshot is not None and time.monotonic() - snapshot["refreshed_at"] <= HEALTH_SNAPSHOT_TTL
+
+def report_health(upstream: UpstreamService, snapshot: dict) -> dict:
+    """A cached health snapshot with each endpoint's circuit read now; breakers change between probes"""
+    endpoints = {endpoint.base_url: endpoint for endpoint in upstream.endpoints}
+
+    def with_circuit(entry: dict) -> dict:
+        report = {key: value for key, value in entry.items() if key not in ("refreshed_at", "endpoints")}
+        report["circuit"] = endpoints[entry["url"]].breaker.snapshot()
+        return report
+
+    report = with_circuit(snapshot)
+    if "endpoints" in snapshot:
+        report["endpoints"] = [with_circuit(entry) for entry in snapshot["endpoints"]]
+    return report
+
+@app.on_event("startup")
+async def startup_event():
+    """Open upstream connection pools and start the health refresher"""
+    global health_refresh_task
+
+    for service_name, endpoints in SERVICE_ENDPOINTS.items():
+        if endpoints:
+            upstream = UpstreamService(service_name, [
+                UpstreamPool(service_name, url, ROUTE_TIMEOUTS[service_name], region)
+                for region, url in endpoints
+            ])
+            await upstream.start()
+            upstreams[service_name] = upstream
+
+    health_refresh_task = asyncio.create_task(health_refresher())
+    logger.info(f"Gateway started in {REGION} with pools: {list(upstreams)}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the health refresher and close upstream connection pools"""
+    if health_refresh_task is not None:
+        health_refresh_task.cancel()
+        try:
+            await health_refresh_task
+        except asyncio.CancelledError:
+            pass
+
+    for upstream in upstreams.values():
+        await upstream.close()
+    upstreams.clear()
+    logger.info(f"Gateway stopped in {REGION}")
+
 # Health check endpoint
 @app.get("/")
 @app.get("/health")
@@ -41,30 +877,25 @@ async def health_check():
     }
 
 # Route to API service
-@app.get("/api/{path:path}")
-@app.post("/api/{path:path}")
+@app.api_route("/api/{path:path}", methods=PROXY_METHODS)
 async def route_to_api(path: str, request: Request):
     """Route requests to API service"""
-    if not API_SERVICE_URL:
-        raise HTTPException(status_code=503, detail="API service not configured")
+    upstream = get_upstream("api")
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            url = f"{API_SERVICE_URL}/{path}"
-            method = request.method
-            headers = dict(request.headers)
-
-            if method == "GET":
-                response = await client.get(url, headers=headers)
-            else:
-                body = await request.body()
-                response = await client.post(url, headers=headers, content=body)
-
-            logger.info(f"Routed {method} request to API service: {path}")
-            return JSONResponse(
-                content=response.json() if response.text else {},
-                status_code=response.status_code
-            )
+        if is_cacheable(request, path):
+            response = await cached_get(upstream, f"/{path}", request)
+        else:
+            try:
+                response = await proxy(upstream, f"/{path}", request, stream=path.startswith(STREAM_PATHS))
+            finally:
+                if GATEWAY_CACHE_ENABLED and request.method not in ("GET", "HEAD", "OPTIONS"):
+                    # Later reads through this gateway see the write rather than waiting out the TTL
+                    gateway_cache.clear()
+        logger.info(f"Routed {request.method} request to API service: {path}")
+        return response
+    except CircuitOpenError as e:
+        raise circuit_open_error(e)
     except Exception as e:
         logger.error(f"Error routing to API service: {str(e)}")
         raise HTTPException(status_code=502, detail=f"API service error: {str(e)}")
@@ -73,42 +904,65 @@ async def route_to_api(path: str, request: Request):
 @app.post("/worker/{action}")
 async def route_to_worker(action: str, request: Request):
     """Route job requests to Worker service"""
-    if not WORKER_SERVICE_URL:
-        raise HTTPException(status_code=503, detail="Worker service not configured")
+    upstream = get_upstream("worker")
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            url = f"{WORKER_SERVICE_URL}/job/{action}"
-            body = await request.body()
-            response = await client.post(url, content=body)
-
-            logger.info(f"Routed job to Worker service: {action}")
-            return JSONResponse(
-                content=response.json() if response.text else {},
-                status_code=response.status_code
+        response = await proxy(upstream, f"/job/{action}", request)
+        logger.info(f"Routed job to Worker service: {action}")
+        return response
+    except CircuitOpenError as e:
+        raise circuit_open_error(e)
+    except Exception as e:
+        logger.error(f"Error routing to Worker service: {str(e)}")
+        raise HTTPException(status_code=502, detail=f"Worker service error: {str(e)}")
+
+@app.get("/worker/{path:path}")
+async def read_from_worker(path: str, request: Request):
+    """Route job status reads, long-polls and the job event stream to Worker service"""
+    upstream = get_upstream("worker")
+
+    try:
+        if path.startswith(WORKER_STREAM_PATHS):
+            # Relay events as they arrive; no read timeout since the worker decides when the stream ends
+            response = await proxy(
+                upstream, f"/{path}", request, stream=True,
+                timeout=httpx.Timeout(ROUTE_TIMEOUTS["worker"], read=None)
             )
+        else:
+            try:
+                wait = max(0.0, float(request.query_params.get("wait", 0)))
+            except ValueError:
+                wait = 0.0
+            if wait:
+                # A long-poll may legitimately hold the request for up to wait seconds
+                response = await proxy(
+                    upstream, f"/{path}", request,
+                    timeout=ROUTE_TIMEOUTS["worker"] + wait, sample_latency=False
+                )
+            else:
+                response = await proxy(upstream, f"/{path}", request)
+        logger.info(f"Routed GET request to Worker service: {path}")
+        return response
+    except CircuitOpenError as e:
+        raise circuit_open_error(e)
     except Exception as e:
         logger.error(f"Error routing to Worker service: {str(e)}")
         raise HTTPException(status_code=502, detail=f"Worker service error: {str(e)}")
 
 # Route to Processor service
-@app.post("/process/{task_type}")
+@app.post("/process/{task_type:path}")
 async def route_to_processor(task_type: str, request: Request):
     """Route processing tasks to Processor service"""
-    if not PROCESSOR_SERVICE_URL:
-        raise HTTPException(status_code=503, detail="Processor service not configured")
+    upstream = get_upstream("processor")
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            url = f"{PROCESSOR_SERVICE_URL}/process/{task_type}"
-            body = await request.body()
-            response = await client.post(url, content=body)
-
-            logger.info(f"Routed processing task: {task_type}")
-            return JSONResponse(
-                content=response.json() if response.text else {},
-                status_code=response.status_code
-            )
+        response = await proxy(
+            upstream, f"/process/{task_type}", request, stream=task_type.startswith(PROCESSOR_STREAM_PATHS)
+        )
+        logger.info(f"Routed processing task: {task_type}")
+        return response
+    except CircuitOpenError as e:
+        raise circuit_open_error(e)
     except Exception as e:
         logger.error(f"Error routing to Processor service: {str(e)}")
         raise HTTPException(status_code=502, detail=f"Processor service error: {str(e)}")
@@ -117,50 +971,35 @@ async def route_to_processor(task_type: str, request: Request):
 @app.get("/scheduler/status")
 async def get_scheduler_status():
     """Get scheduler status"""
-    if not SCHEDULER_SERVICE_URL:
-        raise HTTPException(status_code=503, detail="Scheduler service not configured")
+    upstream = get_upstream("scheduler")
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{SCHEDULER_SERVICE_URL}/status")
-            return JSONResponse(
-                content=response.json() if response.text else {},
-                status_code=response.status_code
-            )
+        response = await upstream.request("GET", "/status")
+        return JSONResponse(
+            content=response.json() if response.text else {},
+            status_code=response.status_code
+        )
+    except CircuitOpenError as e:
+        raise circuit_open_error(e)
     except Exception as e:
         logger.error(f"Error getting scheduler status: {str(e)}")
         raise HTTPException(status_code=502, detail=f"Scheduler service error: {str(e)}")
 
 # System status endpoint
 @app.get("/system/status")
-async def system_status():
-    """Get overall system status"""
-    services = {}
+async def system_status(refresh: bool = False):
+    """Get overall system status from cached health snapshots"""
+    # Only probe inline when forced or when the background refresher has fallen behind
+    if refresh or not all(snapshot_is_fresh(health_snapshots.get(name)) for name in upstreams):
+        await refresh_health_snapshots()
 
-    # Check each service
-    service_urls = {
-        "api": API_SERVICE_URL,
-        "worker": WORKER_SERVICE_URL,
-        "processor": PROCESSOR_SERVICE_URL,
-        "scheduler": SCHEDULER_SERVICE_URL
-    }
-
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        for service_name, url in service_urls.items():
-            if url:
-                try:
-                    response = await client.get(f"{url}/health")
-                    services[service_name] = {
-                        "status": "healthy" if response.status_code == 200 else "unhealthy",
-                        "url": url
-                    }
-                except Exception as e:
-                    services[service_name] = {
-                        "status": "unreachable",
-                        "error": str(e)
-                    }
-            else:
-                services[service_name] = {"status": "not_configured"}
+    services = {}
+    for service_name in SERVICE_URLS:
+        snapshot = health_snapshots.get(service_name)
+        if service_name in upstreams and snapshot is not None:
+            services[service_name] = report_health(upstreams[service_name], snapshot)
+        else:
+            services[service_name] = {"status": "not_configured"}
 
     return {
         "gateway": {
@@ -171,6 +1010,19 @@ async def system_status():
         "timestamp": datetime.utcnow().isoformat()
     }
 
+# Connection pool metrics
+@app.get("/system/pools")
+async def pool_metrics():
+    """Get upstream connection pool saturation metrics"""
+    return {
+        "pools": {name: upstream.metrics() for name, upstream in upstreams.items()},
+        "http2_enabled": UPSTREAM_HTTP2 and HTTP2_AVAILABLE,
+        "proxy_mode": PROXY_MODE,
+        "gateway_cache": gateway_cache.metrics(),
+        "region": REGION,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 # Database connectivity test
 @app.get("/test/database")
 async def test_database():
@@ -0,0 +1,91 @@
+"""
+Local Multi-Region Stand-in
+Runs one copy of each backend service per simulated region as separate
+processes, plus a gateway configured with every region's endpoints, so
+cross-region failover and latency-aware routing can be exercised locally.
+
+Usage:
+    python local_regions.py --regions eastus,westus --down westus
+    curl http://localhost:8080/system/status
+    curl http://localhost:8080/system/pools
+
+Stop a region's processes (or start it with --down) to watch the gateway
+fail over; responses carry the "region" that served them.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+SERVICES = {
+    "api": "api-service",
+    "worker": "worker-service",
+    "processor": "processor-service",
+    "scheduler": "scheduler-service"
+}
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def start_service(directory: str, port: int, env: dict) -> subprocess.Popen:
+    """Start one uvicorn process for a service directory"""
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=os.path.join(BASE_DIR, directory),
+        env={**os.environ, **env}
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local multi-region stand-in")
+    parser.add_argument("--regions", default="eastus,westus", help="Comma-separated region names, first is the gateway's local region")
+    parser.add_argument("--services", default="api,worker,processor", help="Comma-separated backend services to run per region")
+    parser.add_argument("--down", default="", help="Comma-separated regions to list in the gateway but not start")
+    parser.add_argument("--base-port", type=int, default=9000, help="First backend port")
+    parser.add_argument("--gateway-port", type=int, default=8080, help="Gateway port")
+    args = parser.parse_args()
+
+    regions = [r.strip() for r in args.regions.split(",") if r.strip()]
+    services = [s.strip() for s in args.services.split(",") if s.strip()]
+    down = {r.strip() for r in args.down.split(",") if r.strip()}
+
+    processes = []
+    gateway_env = {"AZURE_REGION": regions[0]}
+    port = args.base_port
+    worker_urls = {}
+
+    for service in services:
+        endpoints = []
+        for region in regions:
+            endpoints.append(f"{region}=http://127.0.0.1:{port}")
+            env = {"AZURE_REGION": region}
+            if service == "worker":
+                worker_urls[region] = f"http://127.0.0.1:{port}"
+            elif service == "scheduler" and region in worker_urls:
+                # Each region's scheduler dispatches to its own worker, as in main.tf
+                env["WORKER_SERVICE_URL"] = worker_urls[region]
+            if region not in down:
+                processes.append(start_service(SERVICES[service], port, env))
+                print(f"{service:<10} {region:<12} http://127.0.0.1:{port}")
+            else:
+                print(f"{service:<10} {region:<12} http://127.0.0.1:{port} (down)")
+            port += 1
+        gateway_env[f"{service.upper()}_SERVICE_URLS"] = ",".join(endpoints)
+
+    # Give the backends a moment so the first health round sees them
+    time.sleep(1)
+    processes.append(start_service("gateway", args.gateway_port, gateway_env))
+    print(f"gateway    {regions[0]:<12} http://127.0.0.1:{args.gateway_port}")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+if __name__ == "__main__":
+    main()
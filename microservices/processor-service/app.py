@@ -2,14 +2,28 @@
 Processor Service - Private Data Processing Service
 Handles compute-intensive data processing tasks
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import os
+import codecs
+import itertools
 import logging
+import operator
+import re
+import tempfile
+import time
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from collections import Counter, OrderedDict
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, AsyncIterator, Iterator, Optional, Dict, List, Tuple
 import json
 import hashlib
+import numpy as np
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,8 +35,34 @@ REGION = os.getenv("AZURE_REGION", "unknown")
 SQL_CONNECTION_STRING = os.getenv("SQL_CONNECTION_STRING", "")
 STORAGE_CONNECTION_STRING = os.getenv("STORAGE_CONNECTION_STRING", "")
 
+# Streaming endpoints: largest single row held while waiting for the rest of it, and how much
+# filter output stays in memory before spilling to a temp file
+STREAM_MAX_ROW_BYTES = int(os.getenv("STREAM_MAX_ROW_BYTES", str(1024 * 1024)))
+STREAM_SPOOL_BYTES = int(os.getenv("STREAM_SPOOL_BYTES", str(8 * 1024 * 1024)))
+STREAM_RESPONSE_CHUNK = 64 * 1024
+
+# Batch pipelines: rows pushed through all stages per chunk, and how many planned pipelines are kept
+PIPELINE_CHUNK_ROWS = int(os.getenv("PIPELINE_CHUNK_ROWS", "4096"))
+PIPELINE_PLAN_CACHE_SIZE = int(os.getenv("PIPELINE_PLAN_CACHE_SIZE", "256"))
+
+# Partitioned parallel reduction of large NDJSON bodies: 0 workers means the container's CPU quota,
+# and a quota under 2 CPUs disables it. Bodies go through /dev/shm, so PARALLEL_MAX_BYTES must fit there.
+PARALLEL_WORKERS = int(os.getenv("PARALLEL_WORKERS", "0"))
+PARALLEL_MIN_BYTES = int(os.getenv("PARALLEL_MIN_BYTES", str(8 * 1024 * 1024)))
+PARALLEL_MAX_BYTES = int(os.getenv("PARALLEL_MAX_BYTES", str(48 * 1024 * 1024)))
+PARALLEL_PARTITIONS_PER_WORKER = int(os.getenv("PARALLEL_PARTITIONS_PER_WORKER", "2"))
+
+# Batch transforms: hash batches with at least TRANSFORM_PARALLEL_MIN_BYTES of input, averaging at least
+# TRANSFORM_PARALLEL_MIN_ITEM_BYTES per input, are split across TRANSFORM_THREADS threads. hashlib only
+# releases the GIL while hashing inputs over 2 KiB, so smaller inputs gain nothing from the threads.
+TRANSFORM_THREADS = int(os.getenv("TRANSFORM_THREADS", "4"))
+TRANSFORM_PARALLEL_MIN_BYTES = int(os.getenv("TRANSFORM_PARALLEL_MIN_BYTES", str(1024 * 1024)))
+TRANSFORM_PARALLEL_MIN_ITEM_BYTES = int(os.getenv("TRANSFORM_PARALLEL_MIN_ITEM_BYTES", "2048"))
+
 class ProcessRequest(BaseModel):
-    data: List[dict]
+    data: List[dict] = []
+    # Columnar alternative to data: {"field": [v0, v1, ...]}, one equal-length list per field
+    columns: Optional[Dict[str, list]] = None
     operation: str
     options: Optional[dict] = None
 
@@ -30,6 +70,756 @@ class TransformRequest(BaseModel):
     input_data: str
     transform_type: str
 
+class BatchTransformRequest(BaseModel):
+    inputs: List[str]
+    transform_type: str
+
+# Largest magnitudes where int64 sums and float64 conversions stay exact
+INT64_MAX = 2 ** 63 - 1
+EXACT_FLOAT_INT = 2 ** 53
+
+# Filter conditions as (Python operator, NumPy ufunc)
+COMPARISONS = {
+    "greater_than": (operator.gt, np.greater),
+    "less_than": (operator.lt, np.less),
+    "equals": (operator.eq, np.equal),
+    "not_equals": (operator.ne, np.not_equal)
+}
+
+class Column:
+    """One field's values, plus a NumPy array of them when every value is a number.
+
+    The array is only built when NumPy reproduces Python's arithmetic and comparisons on these
+    values exactly; anything else (strings, nulls, huge ints) takes the plain Python path.
+    """
+
+    def __init__(self, values: list):
+        self.values = values
+        self.array: Optional[np.ndarray] = None
+        self.max_abs = 0
+        kinds = set(map(type, values))
+        if not values or not kinds <= {int, float, bool}:
+            return
+        if float not in kinds:
+            try:
+                self.array = np.array(values, dtype=np.int64)
+            except OverflowError:
+                return
+            self.max_abs = max(int(self.array.max()), -int(self.array.min()))
+        elif sum(abs(v) for v in values if type(v) is not float) < EXACT_FLOAT_INT:
+            # Ints mixed with floats are converted up front, which matches Python while their sum is exact
+            self.array = np.array(values, dtype=np.float64)
+
+    @property
+    def is_float(self) -> bool:
+        return self.array is not None and self.array.dtype.kind == "f"
+
+    def sum(self):
+        if self.array is None:
+            return sum(self.values)
+        if self.is_float:
+            # Running (not pairwise) sum, adding in the same order as Python's sum()
+            return 0.0 + float(np.cumsum(self.array)[-1])
+        if self.max_abs * len(self.values) > INT64_MAX:
+            return sum(self.values)
+        return int(self.array.sum())
+
+    def max(self):
+        if self.array is None or (self.is_float and np.isnan(self.array).any()):
+            return max(self.values)
+        # argmax returns the first maximal position, the same element Python's max() keeps
+        return self.values[int(np.argmax(self.array))]
+
+    def min(self):
+        if self.array is None or (self.is_float and np.isnan(self.array).any()):
+            return min(self.values)
+        return self.values[int(np.argmin(self.array))]
+
+    def _comparable(self, value) -> bool:
+        """Whether comparing the array against value in NumPy is exact"""
+        if self.array is None or type(value) not in (int, float, bool):
+            return False
+        if self.is_float:
+            return type(value) is float or abs(value) < EXACT_FLOAT_INT
+        if type(value) is float:
+            return self.max_abs < EXACT_FLOAT_INT
+        return -INT64_MAX - 1 <= value <= INT64_MAX
+
+    def matching(self, condition: str, value) -> List[int]:
+        """Positions whose value satisfies condition against value; unknown conditions match nothing"""
+        if condition not in COMPARISONS:
+            return []
+        python_op, numpy_op = COMPARISONS[condition]
+        if self._comparable(value):
+            return np.flatnonzero(numpy_op(self.array, value)).tolist()
+        return [i for i, item_value in enumerate(self.values) if python_op(item_value, value)]
+
+class RowProfile:
+    """Type profile of rows folded in one at a time"""
+
+    def __init__(self):
+        self.total_items = 0
+        self.layouts = set()
+        self.has_values = 0
+        self.data_types: Dict[str, Dict[str, int]] = {}
+
+    def add_rows(self, rows: List[dict]):
+        self.total_items += len(rows)
+        for item in rows:
+            self.layouts.add(str(item.keys()))
+            if item.get("value") is not None:
+                self.has_values += 1
+
+            # Analyze data types
+            for key, value in item.items():
+                type_name = type(value).__name__
+                if key not in self.data_types:
+                    self.data_types[key] = {}
+                self.data_types[key][type_name] = self.data_types[key].get(type_name, 0) + 1
+
+    def merge(self, other: "RowProfile"):
+        """Fold in the profile of rows that came after this one's"""
+        self.total_items += other.total_items
+        self.layouts |= other.layouts
+        self.has_values += other.has_values
+        for key, counts in other.data_types.items():
+            merged = self.data_types.setdefault(key, {})
+            for type_name, count in counts.items():
+                merged[type_name] = merged.get(type_name, 0) + count
+
+    def result(self) -> dict:
+        return {
+            "total_items": self.total_items,
+            "unique_keys": len(self.layouts),
+            "has_values": self.has_values,
+            "data_types": self.data_types
+        }
+
+class RunningAggregate:
+    """sum/average/count/max/min folded over chunks of values, matching the one-shot results"""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.count = 0
+        self.total = 0
+        self.best = None
+
+    def add(self, values: list):
+        if not values:
+            return
+        # sum() and max()/min() seeded with the running result continue exactly where the last chunk stopped
+        if self.operation in ("sum", "average"):
+            self.total = sum(values, self.total)
+        elif self.operation in ("max", "min"):
+            pick = max if self.operation == "max" else min
+            self.best = pick(values) if self.count == 0 else pick(itertools.chain((self.best,), values))
+        self.count += len(values)
+
+    def add_rows(self, rows: List[dict]):
+        self.add(rows if self.operation == "count" else [item.get("value", 0) for item in rows])
+
+    def merge(self, other: "RunningAggregate"):
+        """Fold in the partial result of rows that came after this one's"""
+        if other.count == 0:
+            return
+        if self.operation in ("sum", "average"):
+            self.total = self.total + other.total
+        elif self.operation in ("max", "min"):
+            pick = max if self.operation == "max" else min
+            # On ties max()/min() keep their first argument, so the earliest extreme wins as in one pass
+            self.best = other.best if self.count == 0 else pick(self.best, other.best)
+        self.count += other.count
+
+    def result(self):
+        if self.operation == "sum":
+            return self.total
+        if self.operation == "average":
+            return self.total / self.count if self.count else 0
+        if self.operation == "count":
+            return self.count
+        if self.operation in ("max", "min"):
+            return self.best if self.count else 0
+        return None
+
+class ColumnarBatch:
+    """A request's rows, held either as the row dicts or as one list per field"""
+
+    def __init__(self, rows: Optional[List[dict]] = None, columns: Optional[Dict[str, list]] = None):
+        self.rows = rows
+        self.columns = columns
+        if columns is not None:
+            lengths = {len(values) for values in columns.values()}
+            if len(lengths) > 1:
+                raise ValueError("All columns must have the same length")
+            self.length = lengths.pop() if lengths else 0
+        else:
+            self.length = len(rows)
+
+    @classmethod
+    def from_request(cls, request: ProcessRequest) -> "ColumnarBatch":
+        if request.columns is None:
+            return cls(rows=request.data)
+        try:
+            return cls(columns=request.columns)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    def column(self, key: str, default=None) -> Column:
+        """A field's values, with default wherever a row lacks the field"""
+        if self.rows is not None:
+            return Column([item.get(key, default) for item in self.rows])
+        if key in self.columns:
+            return Column(self.columns[key])
+        return Column([default] * self.length)
+
+    def chunks(self, size: int) -> Iterator[List[dict]]:
+        """The rows in order, size at a time; columnar batches build only one chunk of row dicts at once"""
+        for start in range(0, self.length, size):
+            if self.rows is not None:
+                yield self.rows[start:start + size]
+            else:
+                keys = list(self.columns)
+                slices = [self.columns[key][start:start + size] for key in keys]
+                yield [dict(zip(keys, values)) for values in zip(*slices)]
+
+    def take(self, positions: List[int]):
+        """The selected rows, in the same layout as the input"""
+        if self.rows is not None:
+            return [self.rows[i] for i in positions]
+        return {key: [values[i] for i in positions] for key, values in self.columns.items()}
+
+    def profile(self) -> dict:
+        """Row count, distinct key layouts, non-null values and per-field type counts"""
+        if self.rows is not None:
+            profile = RowProfile()
+            profile.add_rows(self.rows)
+            return profile.result()
+
+        # Every row of a columnar batch has every field, so there is exactly one key layout
+        values = self.columns.get("value", [])
+        return {
+            "total_items": self.length,
+            "unique_keys": 1 if self.length else 0,
+            "has_values": len(values) - values.count(None),
+            "data_types": {
+                key: {kind.__name__: count for kind, count in Counter(map(type, column)).items()}
+                for key, column in self.columns.items()
+            } if self.length else {}
+        }
+
+HASH_ALGORITHMS = (
+    "md5", "sha1", "sha224", "sha256", "sha384", "sha512", "sha3_256", "sha3_512", "blake2b", "blake2s"
+)
+
+def hash_transform(algorithm: str):
+    constructor = getattr(hashlib, algorithm)
+    return lambda data: constructor(data.encode()).hexdigest()
+
+TRANSFORMS = {
+    "uppercase": str.upper,
+    "lowercase": str.lower,
+    "hash": hash_transform("sha256"),
+    "reverse": lambda data: data[::-1],
+    "length": len,
+    **{algorithm: hash_transform(algorithm) for algorithm in HASH_ALGORITHMS}
+}
+
+# Transforms that run without the GIL for large inputs; the rest hold it and always run inline
+GIL_RELEASING_TRANSFORMS = {"hash", *HASH_ALGORITHMS}
+
+def apply_transform(transform_type: str, data: str):
+    """Apply a named transform; unknown transform types return the input unchanged"""
+    transform = TRANSFORMS.get(transform_type)
+    return transform(data) if transform is not None else data
+
+class FilterStage:
+    """Keeps rows whose key satisfies the condition, with /process/filter semantics"""
+
+    kind = "filter"
+
+    def __init__(self, spec: dict):
+        self.key = spec.get("key", "value")
+        self.condition = spec.get("condition", "greater_than")
+        self.value = spec.get("value", 0)
+
+    def new_state(self):
+        return None
+
+    def run(self, rows: List[dict], state) -> List[dict]:
+        positions = Column([item.get(self.key) for item in rows]).matching(self.condition, self.value)
+        return rows if len(positions) == len(rows) else [rows[i] for i in positions]
+
+    def report(self, state) -> dict:
+        return {}
+
+class TransformStage:
+    """Applies a /process/transform transform to one field, writing the result to target (default: the field)"""
+
+    kind = "transform"
+
+    def __init__(self, spec: dict):
+        self.key = spec.get("key", "value")
+        self.target = spec.get("target", self.key)
+        self.transform_type = spec.get("transform_type", "")
+
+    def new_state(self):
+        return None
+
+    def run(self, rows: List[dict], state) -> List[dict]:
+        key, target, transform_type = self.key, self.target, self.transform_type
+        # Rows are copied rather than changed in place, so earlier stages' views stay intact
+        return [
+            {**item, target: apply_transform(transform_type, str(item[key]))} if item.get(key) is not None else item
+            for item in rows
+        ]
+
+    def report(self, state) -> dict:
+        return {}
+
+class AggregateStage:
+    """Folds a field into sum/average/count/max/min, with /process/aggregate semantics; rows pass through"""
+
+    kind = "aggregate"
+
+    def __init__(self, spec: dict):
+        self.key = spec.get("key", "value")
+        self.operation = spec.get("operation", "")
+
+    def new_state(self) -> RunningAggregate:
+        return RunningAggregate(self.operation)
+
+    def run(self, rows: List[dict], state: RunningAggregate) -> List[dict]:
+        state.add([item.get(self.key, 0) for item in rows])
+        return rows
+
+    def report(self, state: RunningAggregate) -> dict:
+        return {"result": state.result(), "processed_items": state.count}
+
+class AnalyzeStage:
+    """Profiles the rows reaching it, with /process/analyze semantics; rows pass through"""
+
+    kind = "analyze"
+
+    def __init__(self, spec: dict):
+        pass
+
+    def new_state(self) -> RowProfile:
+        return RowProfile()
+
+    def run(self, rows: List[dict], state: RowProfile) -> List[dict]:
+        state.add_rows(rows)
+        return rows
+
+    def report(self, state: RowProfile) -> dict:
+        return {"analysis": state.result()}
+
+STAGES = {stage.kind: stage for stage in (FilterStage, TransformStage, AggregateStage, AnalyzeStage)}
+AGGREGATE_OPERATIONS = ("sum", "average", "count", "max", "min")
+
+class PipelinePlan:
+    """Stages built from a batch request's operations; holds no per-run state, so it can be reused.
+
+    An operation is a stage name ("filter", "analyze", ...), an aggregate name ("sum", ...), or a
+    dict such as {"op": "filter", "key": "value", "condition": "greater_than", "value": 10}.
+    """
+
+    def __init__(self, operations: list):
+        if not isinstance(operations, list):
+            raise ValueError("operations must be a list")
+        self.stages = [self._build(operation) for operation in operations]
+
+    @staticmethod
+    def _build(operation):
+        spec = operation
+        if isinstance(spec, str):
+            spec = {"op": "aggregate", "operation": spec} if spec in AGGREGATE_OPERATIONS else {"op": spec}
+        if not isinstance(spec, dict) or spec.get("op") not in STAGES:
+            raise ValueError(f"Unknown operation: {operation!r}")
+        return STAGES[spec["op"]](spec)
+
+    def run(self, batch: ColumnarBatch) -> Tuple[List[dict], int]:
+        """Push every chunk through all stages in one pass; returns per-stage reports and the rows left at the end"""
+        states = [stage.new_state() for stage in self.stages]
+        input_items = [0] * len(self.stages)
+        output_items = [0] * len(self.stages)
+        elapsed = [0.0] * len(self.stages)
+        remaining = 0
+
+        for rows in batch.chunks(PIPELINE_CHUNK_ROWS):
+            for i, stage in enumerate(self.stages):
+                if not rows:
+                    break
+                started = time.perf_counter()
+                input_items[i] += len(rows)
+                rows = stage.run(rows, states[i])
+                output_items[i] += len(rows)
+                elapsed[i] += time.perf_counter() - started
+            remaining += len(rows)
+
+        reports = [
+            {
+                "stage": stage.kind,
+                "input_items": input_items[i],
+                "output_items": output_items[i],
+                "elapsed_ms": round(elapsed[i] * 1000, 3),
+                **stage.report(states[i])
+            }
+            for i, stage in enumerate(self.stages)
+        ]
+        return reports, remaining
+
+class PlanCache:
+    """LRU of pipeline plans keyed by their operations"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.plans: "OrderedDict[str, PipelinePlan]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, operations: list) -> Tuple[PipelinePlan, bool]:
+        """The plan for operations and whether it came from the cache"""
+        key = json.dumps(operations, sort_keys=True)
+        plan = self.plans.get(key)
+        if plan is not None:
+            self.plans.move_to_end(key)
+            self.hits += 1
+            return plan, True
+        plan = PipelinePlan(operations)
+        self.misses += 1
+        self.plans[key] = plan
+        if len(self.plans) > self.size:
+            self.plans.popitem(last=False)
+        return plan, False
+
+    def metrics(self) -> dict:
+        return {"size": len(self.plans), "max_size": self.size, "hits": self.hits, "misses": self.misses}
+
+plan_cache = PlanCache(PIPELINE_PLAN_CACHE_SIZE)
+
+JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+class JSONArrayDecoder:
+    """Decodes the elements of a JSON array from a body fed in arbitrary chunks"""
+
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.text = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.opened = False
+        self.closed = False
+        self.need_comma = False
+        self.after_comma = False
+
+    def feed(self, data: bytes, final: bool = False) -> List[Any]:
+        self.buffer += self.text.decode(data, final=final)
+        elements = []
+        position = 0
+        while True:
+            position = JSON_WHITESPACE.match(self.buffer, position).end()
+            if position == len(self.buffer):
+                break
+            char = self.buffer[position]
+            if self.closed:
+                raise ValueError("Unexpected data after the JSON array")
+            if not self.opened:
+                if char != "[":
+                    raise ValueError("Body must be a JSON array or NDJSON")
+                self.opened = True
+                position += 1
+            elif char == "]" and not self.after_comma:
+                self.closed = True
+                position += 1
+            elif self.need_comma:
+                if char != ",":
+                    raise ValueError(f"Expected ',' between array elements, got {char!r}")
+                self.need_comma = False
+                self.after_comma = True
+                position += 1
+            else:
+                try:
+                    element, position = self.decoder.raw_decode(self.buffer, position)
+                except json.JSONDecodeError:
+                    # Most likely an element split across chunks; wait for the rest of it
+                    break
+                elements.append(element)
+                self.need_comma = True
+                self.after_comma = False
+        self.buffer = self.buffer[position:]
+        if final and (self.buffer or not self.closed):
+            raise ValueError("Truncated or invalid JSON array")
+        if len(self.buffer) > STREAM_MAX_ROW_BYTES:
+            raise ValueError(f"Row larger than {STREAM_MAX_ROW_BYTES} bytes")
+        return elements
+
+async def read_rows(request: Request) -> AsyncIterator[List[dict]]:
+    """Yield chunks of rows from an NDJSON or JSON array body as it streams in.
+
+    Only the rows of the current network chunk are held, so memory stays flat however large the body is.
+    """
+    ndjson = "ndjson" in request.headers.get("content-type", "")
+    array = JSONArrayDecoder()
+    buffer = b""
+    try:
+        async for data in request.stream():
+            if ndjson:
+                buffer += data
+                *lines, buffer = buffer.split(b"\n")
+                rows = [json.loads(line) for line in lines if line.strip()]
+                if len(buffer) > STREAM_MAX_ROW_BYTES:
+                    raise ValueError(f"Row larger than {STREAM_MAX_ROW_BYTES} bytes")
+            else:
+                rows = array.feed(data)
+            if rows:
+                yield check_rows(rows)
+        if ndjson:
+            rows = [json.loads(buffer)] if buffer.strip() else []
+        else:
+            rows = array.feed(b"", final=True)
+        if rows:
+            yield check_rows(rows)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid streamed body: {str(e)}")
+
+def check_rows(rows: List[Any]) -> List[dict]:
+    if not all(isinstance(row, dict) for row in rows):
+        raise ValueError("Every row must be a JSON object")
+    return rows
+
+def container_cpu_quota() -> int:
+    """Whole CPUs this container may use: the cgroup CPU quota if one is set, else the visible CPUs"""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, int(quota) // int(period))
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return max(1, quota // period)
+    except (OSError, ValueError):
+        pass
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+
+def reduce_ndjson(data: bytes, state):
+    """Fold NDJSON rows into a RunningAggregate or RowProfile"""
+    lines = [line for line in data.split(b"\n") if line.strip()]
+    for start in range(0, len(lines), PIPELINE_CHUNK_ROWS):
+        state.add_rows(check_rows([json.loads(line) for line in lines[start:start + PIPELINE_CHUNK_ROWS]]))
+    return state
+
+def reduce_partition(name: str, start: int, end: int, state):
+    """Pool task: reduce one newline-aligned slice of a body held in shared memory"""
+    # Spawned workers share the parent's resource tracker, so attaching here never leaks or double-unlinks
+    shm = SharedMemory(name=name)
+    try:
+        return reduce_ndjson(bytes(shm.buf[start:end]), state)
+    finally:
+        shm.close()
+
+def partition_bounds(buffer, size: int, partitions: int) -> List[Tuple[int, int]]:
+    """Split buffer[:size] into about equal byte ranges that each end on a line break"""
+    view = np.frombuffer(buffer, dtype=np.uint8, count=size)
+    bounds = []
+    start = 0
+    try:
+        for i in range(1, partitions):
+            position = max(start, size * i // partitions)
+            while position < size:
+                newlines = np.flatnonzero(view[position:position + STREAM_RESPONSE_CHUNK] == 0x0A)
+                if newlines.size:
+                    position += int(newlines[0]) + 1
+                    break
+                position += STREAM_RESPONSE_CHUNK
+            end = min(position, size)
+            if end > start:
+                bounds.append((start, end))
+                start = end
+        if start < size:
+            bounds.append((start, size))
+        return bounds
+    finally:
+        # Drop the view before the caller closes the segment
+        del view
+
+class PartitionPool:
+    """Process pool that reduces large NDJSON bodies in newline-aligned partitions.
+
+    The body is written once into shared memory; workers read their slices from it directly,
+    so only the small partial results cross process boundaries. Partials merge in order.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.requests = 0
+        self.partitions = 0
+        self.restarts = 0
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def start(self):
+        if self.workers < 2:
+            logger.info(f"Parallel partitioning disabled in {REGION}: {self.workers} CPU available")
+            return
+        self.pool = self._new_pool()
+        # Spawn the workers and import this module in them now rather than on the first large request
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.pool, container_cpu_quota) for _ in range(self.workers)])
+        logger.info(f"Parallel partitioning ready in {REGION}: {self.workers} processes")
+
+    async def close(self):
+        if self.pool is not None:
+            await asyncio.to_thread(self.pool.shutdown, wait=True, cancel_futures=True)
+
+    def accepts(self, request: Request, parallel: Optional[bool]) -> bool:
+        """Whether to partition this body: NDJSON of known length within the shared memory limit.
+
+        parallel=None decides by PARALLEL_MIN_BYTES; parallel=true forces it for any size.
+        """
+        if self.pool is None or parallel is False or "ndjson" not in request.headers.get("content-type", ""):
+            return False
+        try:
+            size = int(request.headers.get("content-length", ""))
+        except ValueError:
+            return False
+        return size <= PARALLEL_MAX_BYTES and (parallel or size >= PARALLEL_MIN_BYTES)
+
+    async def reduce(self, request: Request, state):
+        """Read the body into shared memory and reduce it across the pool into state"""
+        size = int(request.headers["content-length"])
+        shm = SharedMemory(create=True, size=max(1, size))
+        try:
+            offset = 0
+            async for data in request.stream():
+                if offset + len(data) > size:
+                    raise HTTPException(status_code=400, detail="Body longer than Content-Length")
+                shm.buf[offset:offset + len(data)] = data
+                offset += len(data)
+            return await self.reduce_shared(shm, offset, state)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    async def reduce_shared(self, shm: SharedMemory, size: int, state):
+        bounds = partition_bounds(shm.buf, size, self.workers * PARALLEL_PARTITIONS_PER_WORKER)
+        loop = asyncio.get_running_loop()
+        pool = self.pool
+        self.requests += 1
+        self.partitions += len(bounds)
+        try:
+            partials = await asyncio.gather(*[
+                loop.run_in_executor(pool, reduce_partition, shm.name, start, end, state)
+                for start, end in bounds
+            ])
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); replace the pool so later requests can run.
+            # Concurrent requests on the broken pool all land here; only the first replaces it.
+            if pool is self.pool:
+                self.restarts += 1
+                logger.error(f"Partition pool broke in {REGION}; restarting it")
+                pool.shutdown(wait=False, cancel_futures=True)
+                self.pool = self._new_pool()
+            raise
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid streamed body: {str(e)}")
+        for partial in partials:
+            state.merge(partial)
+        return state
+
+    def metrics(self) -> dict:
+        return {
+            "enabled": self.pool is not None,
+            "workers": self.workers,
+            "min_bytes": PARALLEL_MIN_BYTES,
+            "max_bytes": PARALLEL_MAX_BYTES,
+            "requests": self.requests,
+            "partitions": self.partitions,
+            "restarts": self.restarts
+        }
+
+partition_pool = PartitionPool(PARALLEL_WORKERS or container_cpu_quota())
+
+def transform_chunk(transform, inputs: List[str]) -> list:
+    return list(map(transform, inputs))
+
+class TransformPool:
+    """Thread pool that runs large batch transforms in order-preserving slices"""
+
+    def __init__(self, threads: int):
+        self.threads = threads
+        self.pool: Optional[ThreadPoolExecutor] = None
+        self.batches = 0
+        self.parallel_batches = 0
+        self.items = 0
+
+    async def start(self):
+        if self.threads > 1:
+            self.pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="transform")
+
+    async def close(self):
+        if self.pool is not None:
+            await asyncio.to_thread(self.pool.shutdown, wait=True, cancel_futures=True)
+
+    def parallel(self, transform_type: str, inputs: List[str]) -> bool:
+        """Whether splitting this batch across threads can beat running it inline"""
+        if self.pool is None or transform_type not in GIL_RELEASING_TRANSFORMS:
+            return False
+        total = sum(map(len, inputs))
+        return total >= TRANSFORM_PARALLEL_MIN_BYTES and total >= TRANSFORM_PARALLEL_MIN_ITEM_BYTES * len(inputs)
+
+    async def run(self, transform_type: str, inputs: List[str]) -> list:
+        """Results of transform_type for every input, in input order"""
+        transform = TRANSFORMS[transform_type]
+        self.batches += 1
+        self.items += len(inputs)
+        if not self.parallel(transform_type, inputs):
+            return transform_chunk(transform, inputs)
+
+        self.parallel_batches += 1
+        step = -(-len(inputs) // self.threads)
+        loop = asyncio.get_running_loop()
+        slices = await asyncio.gather(*[
+            loop.run_in_executor(self.pool, transform_chunk, transform, inputs[start:start + step])
+            for start in range(0, len(inputs), step)
+        ])
+        return list(itertools.chain.from_iterable(slices))
+
+    def metrics(self) -> dict:
+        return {
+            "threads": self.threads,
+            "batches": self.batches,
+            "parallel_batches": self.parallel_batches,
+            "items": self.items,
+            "parallel_min_bytes": TRANSFORM_PARALLEL_MIN_BYTES,
+            "parallel_min_item_bytes": TRANSFORM_PARALLEL_MIN_ITEM_BYTES
+        }
+
+transform_pool = TransformPool(TRANSFORM_THREADS)
+
+def parse_query_value(value: str) -> Any:
+    """A query parameter as JSON (10, 2.5, true, "x"), or the raw string if it is not JSON"""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+@app.on_event("startup")
+async def startup():
+    await partition_pool.start()
+    await transform_pool.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await transform_pool.close()
+    await partition_pool.close()
+
 @app.get("/")
 @app.get("/health")
 async def health_check():
@@ -46,29 +836,29 @@ async def health_check():
 async def process_aggregate(request: ProcessRequest):
     """Aggregate data processing"""
     logger.info(f"Processing aggregation in {REGION}")
+    batch = ColumnarBatch.from_request(request)
 
     try:
-        data = request.data
         operation = request.operation
+        count = batch.length
 
         if operation == "sum":
-            result = sum(item.get("value", 0) for item in data)
+            result = batch.column("value", 0).sum()
         elif operation == "average":
-            values = [item.get("value", 0) for item in data]
-            result = sum(values) / len(values) if values else 0
+            result = batch.column("value", 0).sum() / count if count else 0
         elif operation == "count":
-            result = len(data)
+            result = count
         elif operation == "max":
-            result = max(item.get("value", 0) for item in data) if data else 0
+            result = batch.column("value", 0).max() if count else 0
         elif operation == "min":
-            result = min(item.get("value", 0) for item in data) if data else 0
+            result = batch.column("value", 0).min() if count else 0
         else:
             result = None
 
         return {
             "operation": operation,
             "result": result,
-            "processed_items": len(data),
+            "processed_items": count,
             "region": REGION,
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -85,19 +875,7 @@ async def process_transform(request: TransformRequest):
     try:
         input_data = request.input_data
         transform_type = request.transform_type
-
-        if transform_type == "uppercase":
-            result = input_data.upper()
-        elif transform_type == "lowercase":
-            result = input_data.lower()
-        elif transform_type == "hash":
-            result = hashlib.sha256(input_data.encode()).hexdigest()
-        elif transform_type == "reverse":
-            result = input_data[::-1]
-        elif transform_type == "length":
-            result = len(input_data)
-        else:
-            result = input_data
+        result = apply_transform(transform_type, input_data)
 
         return {
             "transform_type": transform_type,
@@ -111,32 +889,102 @@ async def process_transform(request: TransformRequest):
         logger.error(f"Transform error: {str(e)}")
         return {"error": str(e)}, 500
 
-@app.post("/process/analyze")
-async def process_analyze(request: ProcessRequest):
-    """Analyze data"""
-    logger.info(f"Processing analysis in {REGION}")
+def check_transform_type(transform_type: str):
+    if transform_type not in TRANSFORMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown transform_type {transform_type!r}; expected one of {', '.join(TRANSFORMS)}"
+        )
+
+@app.post("/process/transform/batch")
+async def process_transform_batch(request: BatchTransformRequest):
+    """Transform many strings in one call; results come back in input order"""
+    logger.info(f"Processing batch transformation in {REGION}")
+    check_transform_type(request.transform_type)
 
     try:
-        data = request.data
+        results = await transform_pool.run(request.transform_type, request.inputs)
 
-        analysis = {
-            "total_items": len(data),
-            "unique_keys": len(set(str(item.keys()) for item in data)),
-            "has_values": sum(1 for item in data if item.get("value") is not None),
-            "data_types": {}
+        return {
+            "transform_type": request.transform_type,
+            "count": len(results),
+            "results": results,
+            "region": REGION,
+            "timestamp": datetime.utcnow().isoformat()
         }
 
-        # Analyze data types
-        for item in data:
-            for key, value in item.items():
-                type_name = type(value).__name__
-                if key not in analysis["data_types"]:
-                    analysis["data_types"][key] = {}
-                analysis["data_types"][key][type_name] = \
-                    analysis["data_types"][key].get(type_name, 0) + 1
+    except Exception as e:
+        logger.error(f"Batch transform error: {str(e)}")
+        return {"error": str(e)}, 500
+
+@app.post("/process/transform/stream")
+async def stream_transform(request: Request, transform_type: str):
+    """Transform a body of newline-separated strings, returning one result per line in the same order"""
+    logger.info(f"Processing streamed transformation in {REGION}")
+    check_transform_type(transform_type)
+    # Spooled until the body has been read, for the same reason as /process/stream/filter
+    spool = tempfile.SpooledTemporaryFile(max_size=STREAM_SPOOL_BYTES)
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pending: List[str] = []
+    pending_bytes = 0
+    count = 0
+
+    async def flush():
+        nonlocal pending, pending_bytes, count
+        if pending:
+            results = await transform_pool.run(transform_type, pending)
+            spool.write(("\n".join(map(str, results)) + "\n").encode())
+            count += len(results)
+        pending, pending_bytes = [], 0
+
+    try:
+        async for data in request.stream():
+            buffer += text.decode(data)
+            *lines, buffer = buffer.split("\n")
+            pending += [line.removesuffix("\r") for line in lines]
+            pending_bytes += len(data)
+            if pending_bytes >= TRANSFORM_PARALLEL_MIN_BYTES:
+                await flush()
+        buffer += text.decode(b"", final=True)
+        if buffer:
+            pending.append(buffer.removesuffix("\r"))
+        await flush()
+    except UnicodeDecodeError as e:
+        spool.close()
+        raise HTTPException(status_code=400, detail=f"Body must be UTF-8 text: {str(e)}")
+    except Exception as e:
+        spool.close()
+        logger.error(f"Streamed transform error: {str(e)}")
+        return {"error": str(e)}, 500
+
+    spool.seek(0)
 
+    def results():
+        try:
+            while True:
+                chunk = spool.read(STREAM_RESPONSE_CHUNK)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            spool.close()
+
+    return StreamingResponse(
+        results(),
+        media_type="text/plain; charset=utf-8",
+        headers={"X-Transform-Count": str(count), "X-Transform-Type": transform_type}
+    )
+
+@app.post("/process/analyze")
+async def process_analyze(request: ProcessRequest):
+    """Analyze data"""
+    logger.info(f"Processing analysis in {REGION}")
+    batch = ColumnarBatch.from_request(request)
+
+    try:
         return {
-            "analysis": analysis,
+            "analysis": batch.profile(),
             "region": REGION,
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -149,31 +997,21 @@ async def process_analyze(request: ProcessRequest):
 async def process_filter(request: ProcessRequest):
     """Filter data based on conditions"""
     logger.info(f"Processing filtering in {REGION}")
+    batch = ColumnarBatch.from_request(request)
 
     try:
-        data = request.data
         options = request.options or {}
         filter_key = options.get("key", "value")
         filter_condition = options.get("condition", "greater_than")
         filter_value = options.get("value", 0)
 
-        filtered_data = []
-        for item in data:
-            item_value = item.get(filter_key)
-
-            if filter_condition == "greater_than" and item_value > filter_value:
-                filtered_data.append(item)
-            elif filter_condition == "less_than" and item_value < filter_value:
-                filtered_data.append(item)
-            elif filter_condition == "equals" and item_value == filter_value:
-                filtered_data.append(item)
-            elif filter_condition == "not_equals" and item_value != filter_value:
-                filtered_data.append(item)
+        matches = batch.column(filter_key).matching(filter_condition, filter_value)
 
         return {
-            "original_count": len(data),
-            "filtered_count": len(filtered_data),
-            "filtered_data": filtered_data,
+            "original_count": batch.length,
+            "filtered_count": len(matches),
+            # Columnar requests get their matches back as columns
+            "filtered_columns" if batch.rows is None else "filtered_data": batch.take(matches),
             "filter_condition": filter_condition,
             "region": REGION,
             "timestamp": datetime.utcnow().isoformat()
@@ -185,27 +1023,28 @@ async def process_filter(request: ProcessRequest):
 
 @app.post("/process/batch")
 async def process_batch(request: ProcessRequest):
-    """Batch process multiple operations"""
+    """Run a pipeline of operations (filter, transform, aggregate, analyze) over the data in one pass"""
     logger.info(f"Processing batch in {REGION}")
-
+    batch = ColumnarBatch.from_request(request)
+    operations = request.options.get("operations", []) if request.options else []
     try:
-        data = request.data
-        operations = request.options.get("operations", []) if request.options else []
+        plan, cached = plan_cache.get(operations)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        results = []
-        for operation in operations:
-            # Process each operation
-            op_result = {
-                "operation": operation,
-                "processed": True,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            results.append(op_result)
+    try:
+        started = time.perf_counter()
+        reports, output_items = plan.run(batch)
 
         return {
-            "batch_results": results,
+            "batch_results": [
+                {"operation": operation, **report} for operation, report in zip(operations, reports)
+            ],
             "total_operations": len(operations),
-            "data_items": len(data),
+            "data_items": batch.length,
+            "output_items": output_items,
+            "plan_cached": cached,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
             "region": REGION,
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -214,6 +1053,109 @@ async def process_batch(request: ProcessRequest):
         logger.error(f"Batch processing error: {str(e)}")
         return {"error": str(e)}, 500
 
+@app.post("/process/stream/aggregate")
+async def stream_aggregate(request: Request, operation: str, parallel: Optional[bool] = None):
+    """Aggregate the value field of an NDJSON or JSON array body in a single pass"""
+    logger.info(f"Processing streamed aggregation in {REGION}")
+    aggregate = RunningAggregate(operation)
+
+    try:
+        if partition_pool.accepts(request, parallel):
+            aggregate = await partition_pool.reduce(request, aggregate)
+        else:
+            async for rows in read_rows(request):
+                aggregate.add_rows(rows)
+
+        return {
+            "operation": operation,
+            "result": aggregate.result(),
+            "processed_items": aggregate.count,
+            "region": REGION,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Streamed aggregation error: {str(e)}")
+        return {"error": str(e)}, 500
+
+@app.post("/process/stream/analyze")
+async def stream_analyze(request: Request, parallel: Optional[bool] = None):
+    """Profile an NDJSON or JSON array body in a single pass"""
+    logger.info(f"Processing streamed analysis in {REGION}")
+    profile = RowProfile()
+
+    try:
+        if partition_pool.accepts(request, parallel):
+            profile = await partition_pool.reduce(request, profile)
+        else:
+            async for rows in read_rows(request):
+                profile.add_rows(rows)
+
+        return {
+            "analysis": profile.result(),
+            "region": REGION,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Streamed analysis error: {str(e)}")
+        return {"error": str(e)}, 500
+
+@app.post("/process/stream/filter")
+async def stream_filter(request: Request, key: str = "value", condition: str = "greater_than", value: str = "0"):
+    """Filter an NDJSON or JSON array body, streaming the matching rows back as NDJSON"""
+    logger.info(f"Processing streamed filtering in {REGION}")
+    filter_value = parse_query_value(value)
+    compare = COMPARISONS[condition][0] if condition in COMPARISONS else None
+    # Matches are spooled until the body has been read: HTTP/1.1 clients send the whole request
+    # before reading the response, so writing while still reading could stall both sides
+    spool = tempfile.SpooledTemporaryFile(max_size=STREAM_SPOOL_BYTES)
+    original_count = 0
+    filtered_count = 0
+
+    try:
+        async for rows in read_rows(request):
+            original_count += len(rows)
+            if compare is None:
+                continue
+            for item in rows:
+                if compare(item.get(key), filter_value):
+                    spool.write(json.dumps(item).encode() + b"\n")
+                    filtered_count += 1
+    except HTTPException:
+        spool.close()
+        raise
+    except Exception as e:
+        spool.close()
+        logger.error(f"Streamed filtering error: {str(e)}")
+        return {"error": str(e)}, 500
+
+    spool.seek(0)
+
+    def matches():
+        try:
+            while True:
+                chunk = spool.read(STREAM_RESPONSE_CHUNK)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            spool.close()
+
+    return StreamingResponse(
+        matches(),
+        media_type="application/x-ndjson",
+        headers={
+            "X-Original-Count": str(original_count),
+            "X-Filtered-Count": str(filtered_count),
+            "X-Filter-Condition": condition
+        }
+    )
+
 @app.get("/stats")
 async def get_stats():
     """Get processor statistics"""
@@ -223,10 +1165,15 @@ async def get_stats():
         "capabilities": [
             "aggregate",
             "transform",
+            "transform_batch",
             "analyze",
             "filter",
             "batch"
         ],
+        "transform_types": list(TRANSFORMS),
+        "pipeline_plan_cache": plan_cache.metrics(),
+        "parallel": partition_pool.metrics(),
+        "transform_pool": transform_pool.metrics(),
         "timestamp": datetime.utcnow().isoformat()
     }
 
@@ -0,0 +1,90 @@
+"""
+Partitioned Parallel Benchmark - Serial vs Process Pool
+Reduces NDJSON bodies of increasing size on one core and across the
+partition pool, to find the body size where partitioning starts to pay
+off (use it for PARALLEL_MIN_BYTES).
+
+Usage (from microservices/processor-service):
+    python bench_parallel.py
+    python bench_parallel.py --sizes 1,4,16,48 --workers 4 --task aggregate
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from multiprocessing.shared_memory import SharedMemory
+
+from app import PartitionPool, RowProfile, RunningAggregate, reduce_ndjson
+
+def make_body(megabytes: float, rng: random.Random) -> bytes:
+    lines = []
+    size = 0
+    i = 0
+    while size < megabytes * 1024 * 1024:
+        line = json.dumps({
+            "id": i,
+            "value": rng.randint(-1000, 1000),
+            "name": rng.choice(["alpha", "bravo", "charlie"]),
+            "score": rng.choice([rng.random(), None])
+        })
+        lines.append(line)
+        size += len(line) + 1
+        i += 1
+    return "\n".join(lines).encode()
+
+def new_state(task: str):
+    return RunningAggregate("sum") if task == "aggregate" else RowProfile()
+
+async def time_parallel(pool: PartitionPool, body: bytes, task: str, repeat: int) -> float:
+    shm = SharedMemory(create=True, size=len(body))
+    try:
+        shm.buf[:len(body)] = body
+        started = time.perf_counter()
+        for _ in range(repeat):
+            await pool.reduce_shared(shm, len(body), new_state(task))
+        return (time.perf_counter() - started) / repeat
+    finally:
+        shm.close()
+        shm.unlink()
+
+def time_serial(body: bytes, task: str, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        reduce_ndjson(body, new_state(task))
+    return (time.perf_counter() - started) / repeat
+
+async def bench(sizes, workers: int, task: str, repeat: int, rng: random.Random):
+    pool = PartitionPool(workers)
+    await pool.start()
+    try:
+        print(f"{workers} workers, task {task}")
+        crossover = None
+        for megabytes in sizes:
+            body = make_body(megabytes, rng)
+            serial = time_serial(body, task, repeat)
+            parallel = await time_parallel(pool, body, task, repeat)
+            if crossover is None and parallel < serial:
+                crossover = megabytes
+            print(
+                f"{megabytes:>7.2f} MB | serial {serial * 1000:9.1f} ms | "
+                f"parallel {parallel * 1000:9.1f} ms | speedup {serial / parallel:5.2f}x"
+            )
+        print(f"crossover: {f'~{crossover} MB' if crossover is not None else 'not reached'}")
+    finally:
+        await pool.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark partitioned parallel reduction")
+    parser.add_argument("--sizes", default="0.25,1,4,16,48", help="Comma-separated body sizes in MB")
+    parser.add_argument("--workers", type=int, default=4, help="Pool processes")
+    parser.add_argument("--task", choices=["aggregate", "analyze"], default="analyze")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    sizes = [float(s) for s in args.sizes.split(",")]
+    asyncio.run(bench(sizes, args.workers, args.task, args.repeat, random.Random(args.seed)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Transform Benchmark - Inline vs Thread Pool
+Runs batch transforms of a fixed total size split into inputs of increasing
+length, inline and split across the transform thread pool, to show where
+threading pays off (use it for TRANSFORM_PARALLEL_MIN_ITEM_BYTES). Hashes of
+small inputs and the string transforms hold the GIL, so threads only add
+overhead there; "auto" is the path TransformPool picks for the batch.
+
+Usage (from microservices/processor-service):
+    python bench_transform.py
+    python bench_transform.py --item-sizes 64,2048,65536 --total-mb 16 --threads 8 --transforms sha256
+"""
+import argparse
+import asyncio
+import random
+import string
+import time
+
+from app import TRANSFORMS, TransformPool, transform_chunk
+
+def make_inputs(total_bytes: int, item_bytes: int, rng: random.Random) -> list:
+    # One random block sliced at random offsets keeps generation fast at large sizes
+    block = "".join(rng.choices(string.ascii_letters + string.digits, k=item_bytes * 2))
+    return [block[offset:offset + item_bytes] for offset in (rng.randrange(item_bytes) for _ in range(max(1, total_bytes // item_bytes)))]
+
+def time_inline(transform_type: str, inputs: list, repeat: int) -> float:
+    transform = TRANSFORMS[transform_type]
+    started = time.perf_counter()
+    for _ in range(repeat):
+        transform_chunk(transform, inputs)
+    return (time.perf_counter() - started) / repeat
+
+async def time_threaded(pool: TransformPool, transform_type: str, inputs: list, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await pool.run(transform_type, inputs)
+    return (time.perf_counter() - started) / repeat
+
+async def bench(item_sizes, total_mb: float, threads: int, transforms, repeat: int, rng: random.Random):
+    pool = TransformPool(threads)
+    await pool.start()
+    # A second pool that always splits, to time the threaded path whatever the gate would pick
+    forced = TransformPool(threads)
+    await forced.start()
+    forced.parallel = lambda transform_type, inputs: True
+    try:
+        total_bytes = int(total_mb * 1024 * 1024)
+        print(f"{threads} threads, {total_mb:g} MB per batch")
+        for transform_type in transforms:
+            for item_bytes in item_sizes:
+                inputs = make_inputs(total_bytes, item_bytes, rng)
+                inline = time_inline(transform_type, inputs, repeat)
+                threaded = await time_threaded(forced, transform_type, inputs, repeat)
+                auto = "threads" if pool.parallel(transform_type, inputs) else "inline"
+                print(
+                    f"{transform_type:>9} | {item_bytes:>7,} B x {len(inputs):>8,} | inline {inline * 1000:8.1f} ms | "
+                    f"threaded {threaded * 1000:8.1f} ms | speedup {inline / threaded:5.2f}x | auto {auto}"
+                )
+    finally:
+        await pool.close()
+        await forced.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark threaded batch transforms")
+    parser.add_argument("--item-sizes", default="64,512,2048,16384,131072", help="Comma-separated input lengths in bytes")
+    parser.add_argument("--total-mb", type=float, default=8, help="Input bytes per batch, in MB")
+    parser.add_argument("--threads", type=int, default=4, help="Transform pool threads")
+    parser.add_argument("--transforms", default="sha256,uppercase", help="Comma-separated transform types")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    item_sizes = [int(s) for s in args.item_sizes.split(",")]
+    transforms = [t.strip() for t in args.transforms.split(",") if t.strip()]
+    asyncio.run(bench(item_sizes, args.total_mb, args.threads, transforms, args.repeat, random.Random(args.seed)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Column: NumPy results must match the plain Python ones exactly, falling back where they would not
+
+Run from microservices/processor-service:
+    python -m pytest -q test_column.py
+"""
+import math
+import random
+
+import pytest
+
+from app import COMPARISONS, EXACT_FLOAT_INT, INT64_MAX, Column
+
+def python_matching(values: list, condition: str, value) -> list:
+    python_op = COMPARISONS[condition][0]
+    return [i for i, item in enumerate(values) if python_op(item, value)]
+
+def same(a, b) -> bool:
+    """Equal with the same type, counting NaN as equal to NaN"""
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return type(a) is type(b) and a == b
+
+@pytest.mark.parametrize("values, vectorized", [
+    ([1, 2, 3], True),
+    ([1.5, 2, True], True),
+    ([2 ** 64, 1], False),                        # does not fit int64
+    ([float(EXACT_FLOAT_INT), EXACT_FLOAT_INT + 1], False),  # int not exact as a float
+    ([1, None, 3], False),
+    (["1", 2], False),
+    ([], False),
+])
+def test_array_is_built_only_when_exact(values, vectorized):
+    assert (Column(values).array is not None) == vectorized
+
+@pytest.mark.parametrize("values", [
+    [1, 2, 3],
+    [2 ** 62, 2 ** 62, 2 ** 62],                  # int64 sum would overflow
+    [-INT64_MAX - 1, -1],
+    [2 ** 70, -2 ** 70, 5],
+    [0.1] * 10,
+    [1e16, 1.0, -1e16, 1.0],                      # order-dependent float sum
+    [True, True, 2],
+    [1, 2.5, EXACT_FLOAT_INT - 1],
+    [EXACT_FLOAT_INT + 1, 0.5],
+])
+def test_sum_matches_python(values):
+    assert same(Column(values).sum(), sum(values))
+
+def test_float_sum_matches_python_on_random_values():
+    rng = random.Random(7)
+    values = [rng.uniform(-1e6, 1e6) * 10 ** rng.randint(-8, 8) for _ in range(5000)]
+    assert Column(values).sum() == sum(values)
+
+@pytest.mark.parametrize("values", [
+    [3, 1, 3, 2],
+    [1, True, 1.0],                               # ties keep the first element and its type
+    [True, 1],
+    [1.0, float("nan"), 3.0],
+    [float("nan"), 1.0],
+    [2 ** 64, 1],
+    [-0.0, 0.0],
+])
+def test_max_and_min_match_python(values):
+    column = Column(values)
+    assert same(column.max(), max(values))
+    assert same(column.min(), min(values))
+
+@pytest.mark.parametrize("values, value", [
+    ([1, 5, 10], 5),
+    ([1, 5, 10], 5.5),
+    ([EXACT_FLOAT_INT + 1, 3], float(EXACT_FLOAT_INT)),   # int64 column compared to a float
+    ([float(EXACT_FLOAT_INT), 1.0], EXACT_FLOAT_INT + 1),  # float column compared to a large int
+    ([1, 2], 2 ** 70),                                     # value outside int64
+    ([1.0, float("nan"), 3.0], 2.0),
+    ([True, False, 2], True),
+    ([1, "a", None], 1),
+    ([1, 2, 3], "2"),
+])
+@pytest.mark.parametrize("condition", list(COMPARISONS))
+def test_matching_agrees_with_python(values, value, condition):
+    if condition in ("greater_than", "less_than") and any(type(v) not in (int, float, bool) for v in [*values, value]):
+        with pytest.raises(TypeError):
+            python_matching(values, condition, value)
+        return
+    assert Column(values).matching(condition, value) == python_matching(values, condition, value)
+
+def test_unknown_condition_matches_nothing():
+    assert Column([1, 2, 3]).matching("between", 2) == []
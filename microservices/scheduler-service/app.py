@@ -2,14 +2,43 @@
 Scheduler Service - Private Task Scheduling Service
 Manages scheduled tasks and cron jobs
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 import os
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, List
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+import asyncio
+import base64
+import bisect
+import heapq
+import itertools
+import json
+import math
+import pickle
+import re
+import socket
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from typing import Optional, Dict, List, Sequence, Set, Tuple
 import uuid
+import httpx
+from apscheduler.events import EVENT_JOB_MISSED
+from apscheduler.job import Job
+from apscheduler.jobstores.base import BaseJobStore, ConflictingIdError, JobLookupError
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.base import STATE_PAUSED, STATE_RUNNING
+from apscheduler.triggers.combining import OrTrigger
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.util import datetime_to_utc_timestamp, utc_timestamp_to_datetime
+from sqlalchemy import (
+    Column, Float, Integer, LargeBinary, MetaData, String, Table, Text, bindparam, case, create_engine, func,
+    inspect, select
+)
+from sqlalchemy.exc import IntegrityError
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,9 +50,596 @@ REGION = os.getenv("AZURE_REGION", "unknown")
 SQL_CONNECTION_STRING = os.getenv("SQL_CONNECTION_STRING", "")
 STORAGE_CONNECTION_STRING = os.getenv("STORAGE_CONNECTION_STRING", "")
 
+# Execution history: the newest HISTORY_CAPACITY runs stay in memory; older ones are appended to
+# HISTORY_SPILL_PATH (NDJSON, empty disables) in batches, rotating to "<path>.1" past HISTORY_SPILL_MAX_BYTES
+HISTORY_CAPACITY = int(os.getenv("HISTORY_CAPACITY", "10000"))
+HISTORY_SPILL_PATH = os.getenv("HISTORY_SPILL_PATH", "execution_history.ndjson")
+HISTORY_SPILL_MAX_BYTES = int(os.getenv("HISTORY_SPILL_MAX_BYTES", str(64 * 1024 * 1024)))
+HISTORY_SPILL_BATCH = int(os.getenv("HISTORY_SPILL_BATCH", "256"))
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+
+# Schedule store: APScheduler jobs and schedule metadata live in SCHEDULER_DB_URL (any SQLAlchemy URL;
+# empty keeps them in memory). Replicas sharing one database elect a leader through a lease in it, and
+# only the leader fires triggers; followers take over within LEADER_LEASE_DURATION + LEADER_RENEW_INTERVAL
+# of the leader dying. Lease expiry uses wall clocks, so replicas need NTP-synchronized time.
+SCHEDULER_DB_URL = os.getenv("SCHEDULER_DB_URL", "sqlite:///scheduler.db")
+LEADER_ELECTION = os.getenv("LEADER_ELECTION", "true").lower() == "true"
+LEADER_LEASE_NAME = os.getenv("LEADER_LEASE_NAME", "scheduler")
+LEADER_LEASE_DURATION = float(os.getenv("LEADER_LEASE_DURATION", "15"))
+LEADER_RENEW_INTERVAL = float(os.getenv("LEADER_RENEW_INTERVAL", "5"))
+SCHEDULER_ID = os.getenv("SCHEDULER_ID", f"{REGION}-{socket.gethostname()}-{os.getpid()}")
+# Time zone for schedules that do not name one (empty uses the host's local zone)
+SCHEDULER_TIMEZONE = os.getenv("SCHEDULER_TIMEZONE", "")
+
+# Misfire policy defaults (overridable per schedule): a run is skipped if its trigger fired more than
+# SCHEDULER_MISFIRE_GRACE seconds late (e.g. during a leader takeover), and with SCHEDULER_COALESCE
+# a backlog of missed runs collapses into one
+SCHEDULER_MISFIRE_GRACE = int(os.getenv("SCHEDULER_MISFIRE_GRACE", "60"))
+SCHEDULER_COALESCE = os.getenv("SCHEDULER_COALESCE", "true").lower() == "true"
+
+# Task dispatch: with WORKER_SERVICE_URL set, fired tasks are submitted to the worker's /job/submit from a
+# dedicated event loop, at most DISPATCH_CONCURRENCY requests in flight and DISPATCH_MAX_PENDING waiting;
+# without it they are simulated inline as before
+WORKER_SERVICE_URL = os.getenv("WORKER_SERVICE_URL", "")
+DISPATCH_CONCURRENCY = int(os.getenv("DISPATCH_CONCURRENCY", "100"))
+DISPATCH_MAX_PENDING = int(os.getenv("DISPATCH_MAX_PENDING", "10000"))
+DISPATCH_TIMEOUT = float(os.getenv("DISPATCH_TIMEOUT", "10"))
+DISPATCH_RETRIES = int(os.getenv("DISPATCH_RETRIES", "2"))
+DISPATCH_RETRY_BACKOFF = float(os.getenv("DISPATCH_RETRY_BACKOFF", "0.5"))
+
+metadata = MetaData()
+
+schedules_table = Table(
+    "scheduled_tasks", metadata,
+    Column("task_id", String(64), primary_key=True),
+    Column("data", Text, nullable=False)
+)
+
+leases_table = Table(
+    "scheduler_leases", metadata,
+    Column("name", String(128), primary_key=True),
+    Column("holder", String(256), nullable=False),
+    Column("expires_at", Float, nullable=False),
+    # Bumped on every change of holder, so each leadership term has its own token
+    Column("term", Integer, nullable=False)
+)
+
+class MemoryScheduleStore:
+    """Schedule metadata in a dict, for a single replica without SCHEDULER_DB_URL"""
+
+    def __init__(self):
+        self.tasks: Dict[str, dict] = {}
+
+    def save(self, task: dict):
+        self.tasks[task["task_id"]] = dict(task)
+
+    def get(self, task_id: str) -> Optional[dict]:
+        task = self.tasks.get(task_id)
+        return dict(task) if task is not None else None
+
+    def list(self) -> List[dict]:
+        return [dict(task) for task in self.tasks.values()]
+
+    def count(self) -> int:
+        return len(self.tasks)
+
+    def delete(self, task_id: str) -> Optional[dict]:
+        return self.tasks.pop(task_id, None)
+
+class SQLScheduleStore:
+    """Schedule metadata as JSON rows in a table shared by every replica"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        metadata.create_all(engine, tables=[schedules_table])
+
+    def save(self, task: dict):
+        data = json.dumps(task)
+        with self.engine.begin() as conn:
+            updated = conn.execute(
+                schedules_table.update().where(schedules_table.c.task_id == task["task_id"]).values(data=data)
+            ).rowcount
+            if not updated:
+                conn.execute(schedules_table.insert().values(task_id=task["task_id"], data=data))
+
+    def get(self, task_id: str) -> Optional[dict]:
+        with self.engine.connect() as conn:
+            data = conn.execute(
+                select(schedules_table.c.data).where(schedules_table.c.task_id == task_id)
+            ).scalar()
+        return json.loads(data) if data is not None else None
+
+    def list(self) -> List[dict]:
+        with self.engine.connect() as conn:
+            return [json.loads(data) for data in conn.execute(select(schedules_table.c.data)).scalars()]
+
+    def count(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(schedules_table)).scalar()
+
+    def delete(self, task_id: str) -> Optional[dict]:
+        with self.engine.begin() as conn:
+            data = conn.execute(
+                select(schedules_table.c.data).where(schedules_table.c.task_id == task_id)
+            ).scalar()
+            conn.execute(schedules_table.delete().where(schedules_table.c.task_id == task_id))
+        return json.loads(data) if data is not None else None
+
+class LeaderElector:
+    """Lease-based leader election over a shared table; the holder renews every LEADER_RENEW_INTERVAL
+    and anyone may take the lease once it has expired"""
+
+    def __init__(self, engine, name: str, holder: str, duration: float):
+        self.engine = engine
+        self.name = name
+        self.holder = holder
+        self.duration = duration
+        # Local deadline from a monotonic clock, so a stalled leader stops firing on its own
+        self.deadline = 0.0
+        self.term: Optional[int] = None
+        self.elections = 0
+        metadata.create_all(engine, tables=[leases_table])
+        try:
+            with engine.begin() as conn:
+                conn.execute(leases_table.insert().values(name=name, holder="", expires_at=0.0, term=0))
+        except IntegrityError:
+            pass
+
+    def is_leader(self) -> bool:
+        return time.monotonic() < self.deadline
+
+    def try_acquire(self) -> bool:
+        """Renew the lease if held, take it over if expired; True while this replica leads"""
+        started = time.monotonic()
+        now = time.time()
+        lease = leases_table.c
+        with self.engine.begin() as conn:
+            # One conditional UPDATE, so two replicas racing for an expired lease cannot both win
+            acquired = conn.execute(
+                leases_table.update()
+                .where(lease.name == self.name)
+                .where((lease.holder == self.holder) | (lease.expires_at < now))
+                .values(
+                    holder=self.holder,
+                    expires_at=now + self.duration,
+                    term=case((lease.holder == self.holder, lease.term), else_=lease.term + 1)
+                )
+            ).rowcount
+            term = conn.execute(select(lease.term).where(lease.name == self.name)).scalar() if acquired else None
+
+        if not acquired:
+            if self.term is not None:
+                logger.warning(f"Lost scheduler leadership in {REGION}")
+            self.deadline = 0.0
+            self.term = None
+            return False
+        if term != self.term:
+            self.elections += 1
+            logger.info(f"Became scheduler leader in {REGION} (term {term})")
+        self.deadline = started + self.duration
+        self.term = term
+        return True
+
+    def release(self):
+        """Expire the lease on shutdown so a follower takes over on its next poll"""
+        self.deadline = 0.0
+        self.term = None
+        with self.engine.begin() as conn:
+            conn.execute(
+                leases_table.update()
+                .where(leases_table.c.name == self.name)
+                .where(leases_table.c.holder == self.holder)
+                .values(expires_at=0.0)
+            )
+
+    def metrics(self) -> dict:
+        with self.engine.connect() as conn:
+            row = conn.execute(select(leases_table).where(leases_table.c.name == self.name)).mappings().first()
+        return {
+            "id": self.holder,
+            "leader": self.is_leader(),
+            "term": self.term,
+            "elections": self.elections,
+            "current_leader": row["holder"] if row and row["expires_at"] > time.time() else None,
+            "lease_duration": self.duration
+        }
+
+jobs_table = Table(
+    "scheduler_jobs", metadata,
+    Column("id", String(191), primary_key=True),
+    Column("next_run_time", Float, index=True),
+    # Pickled job; NULL marks a removal the active replica has not applied yet
+    Column("job_state", LargeBinary),
+    Column("change_seq", Integer, nullable=False, index=True)
+)
+
+clock_table = Table(
+    "scheduler_clock", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("seq", Integer, nullable=False)
+)
+
+class HeapJobStore(BaseJobStore):
+    """APScheduler job store indexed by a min-heap of next run times.
+
+    The active replica (the leader, or the only one) keeps every job in memory, so a wakeup costs
+    O(log n) per due job and firing does not rewrite a pickled row per run: advanced run times are
+    written back in batches by flush(), while changes made through the API are written through by
+    persist(). With an engine, adds, changes and removals also go to a
+    shared table stamped from a change clock; inactive replicas only write the table, and the
+    active one applies their changes in sync().
+    """
+
+    def __init__(self, engine=None, pickle_protocol: int = pickle.HIGHEST_PROTOCOL):
+        super().__init__()
+        self.engine = engine
+        self.pickle_protocol = pickle_protocol
+        self.lock = threading.RLock()
+        # job id -> (job, next run timestamp or None while paused, version); heap entries whose
+        # version is no longer current are stale and dropped lazily
+        self.jobs: Dict[str, Tuple[Job, Optional[float], int]] = {}
+        self.heap: List[Tuple[float, int, str]] = []
+        self.versions = itertools.count()
+        # Jobs changed in memory only, and the change_seq each job's row had when last read or written
+        self.dirty: Set[str] = set()
+        self.row_seq: Dict[str, int] = {}
+        self.cursor = 0
+        self.active = engine is None
+        self.stats = Counter()
+        if engine is not None:
+            metadata.create_all(engine, tables=[jobs_table, clock_table])
+            try:
+                with engine.begin() as conn:
+                    conn.execute(clock_table.insert().values(id=1, seq=0))
+            except IntegrityError:
+                pass
+            self._migrate()
+
+    def _migrate(self):
+        """Move jobs over from the table SQLAlchemyJobStore kept"""
+        if not inspect(self.engine).has_table("apscheduler_jobs"):
+            return
+        legacy = Table("apscheduler_jobs", MetaData(), autoload_with=self.engine)
+        try:
+            with self.engine.begin() as conn:
+                rows = conn.execute(select(legacy.c.id, legacy.c.next_run_time, legacy.c.job_state)).all()
+                known = set(conn.execute(select(jobs_table.c.id)).scalars())
+                seq = self._tick(conn)
+                for row in rows:
+                    if row.id not in known:
+                        conn.execute(jobs_table.insert().values(
+                            id=row.id, next_run_time=row.next_run_time, job_state=row.job_state, change_seq=seq
+                        ))
+                conn.execute(legacy.delete())
+        except IntegrityError:
+            # Another replica migrated them first
+            return
+        if rows:
+            logger.info(f"Migrated {len(rows)} jobs from apscheduler_jobs in {REGION}")
+
+    @staticmethod
+    def _tick(conn) -> int:
+        conn.execute(clock_table.update().where(clock_table.c.id == 1).values(seq=clock_table.c.seq + 1))
+        return conn.execute(select(clock_table.c.seq).where(clock_table.c.id == 1)).scalar()
+
+    def _serialize(self, job: Job) -> bytes:
+        return pickle.dumps(job.__getstate__(), self.pickle_protocol)
+
+    def _restore(self, job_id: str, state: bytes) -> Optional[Job]:
+        try:
+            job = Job.__new__(Job)
+            job.__setstate__(pickle.loads(state))
+        except Exception:
+            self._logger.exception(f"Unable to restore job {job_id}, skipping it")
+            return None
+        job._scheduler = self._scheduler
+        job._jobstore_alias = self._alias
+        return job
+
+    def _write(self, conn, job: Job, seq: int):
+        values = {
+            "next_run_time": datetime_to_utc_timestamp(job.next_run_time),
+            "job_state": self._serialize(job),
+            "change_seq": seq
+        }
+        if not conn.execute(jobs_table.update().where(jobs_table.c.id == job.id).values(**values)).rowcount:
+            conn.execute(jobs_table.insert().values(id=job.id, **values))
+
+    def _index(self, job: Job):
+        timestamp = datetime_to_utc_timestamp(job.next_run_time)
+        version = next(self.versions)
+        self.jobs[job.id] = (job, timestamp, version)
+        if timestamp is not None:
+            heapq.heappush(self.heap, (timestamp, version, job.id))
+
+    def _unindex(self, job_id: str):
+        self.jobs.pop(job_id, None)
+        self.dirty.discard(job_id)
+        self.row_seq.pop(job_id, None)
+
+    def _is_current(self, entry: Tuple[float, int, str]) -> bool:
+        current = self.jobs.get(entry[2])
+        return current is not None and current[2] == entry[1]
+
+    def _drop_stale(self):
+        while self.heap and not self._is_current(self.heap[0]):
+            heapq.heappop(self.heap)
+        if len(self.heap) > 2 * len(self.jobs) + 1024:
+            self.heap = [(ts, version, job_id) for job_id, (_, ts, version) in self.jobs.items() if ts is not None]
+            heapq.heapify(self.heap)
+
+    def _clear(self):
+        self.jobs.clear()
+        self.heap.clear()
+        self.dirty.clear()
+        self.row_seq.clear()
+
+    def activate(self):
+        """Load every job into memory; this replica now fires the triggers"""
+        with self.engine.connect() as conn:
+            cursor = conn.execute(select(clock_table.c.seq).where(clock_table.c.id == 1)).scalar()
+            rows = conn.execute(
+                select(jobs_table.c.id, jobs_table.c.job_state, jobs_table.c.change_seq)
+                .where(jobs_table.c.job_state.is_not(None))
+            ).all()
+        with self.lock:
+            self._clear()
+            for row in rows:
+                job = self._restore(row.id, row.job_state)
+                if job is not None:
+                    self._index(job)
+                    self.row_seq[row.id] = row.change_seq
+            self.cursor = cursor
+            self.active = True
+        logger.info(f"Loaded {len(self.jobs)} scheduled jobs in {REGION}")
+
+    def deactivate(self):
+        """Write back pending run times and drop the in-memory index"""
+        self.flush()
+        with self.lock:
+            self._clear()
+            self.active = False
+
+    def sync(self):
+        """Apply jobs other replicas added, changed or removed since the last sync, then flush"""
+        if self.engine is None:
+            return
+        if not self.active:
+            self.activate()
+            return
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(jobs_table.c.id, jobs_table.c.job_state, jobs_table.c.change_seq)
+                .where(jobs_table.c.change_seq > self.cursor)
+                .order_by(jobs_table.c.change_seq)
+            ).all()
+        with self.lock:
+            for row in rows:
+                self.cursor = max(self.cursor, row.change_seq)
+                if self.row_seq.get(row.id) == row.change_seq:
+                    continue  # our own write
+                if row.job_state is None:
+                    self._unindex(row.id)
+                    continue
+                job = self._restore(row.id, row.job_state)
+                if job is not None:
+                    self._index(job)
+                    self.row_seq[row.id] = row.change_seq
+                    self.dirty.discard(row.id)
+                    self.stats["synced"] += 1
+            cursor = self.cursor
+        with self.engine.begin() as conn:
+            # Removal markers are only needed until the active replica has seen them
+            conn.execute(
+                jobs_table.delete().where(jobs_table.c.job_state.is_(None)).where(jobs_table.c.change_seq <= cursor)
+            )
+        self.flush()
+
+    def flush(self):
+        """Write next run times advanced in memory back to the table, unless another replica changed the row"""
+        if self.engine is None:
+            return
+        with self.lock:
+            batch = [
+                {
+                    "b_id": job_id,
+                    "b_seq": self.row_seq.get(job_id),
+                    "b_next_run_time": self.jobs[job_id][1],
+                    "b_job_state": self._serialize(self.jobs[job_id][0])
+                }
+                for job_id in self.dirty if job_id in self.jobs
+            ]
+            self.dirty.clear()
+        if not batch:
+            return
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(
+                    jobs_table.update()
+                    .where(jobs_table.c.id == bindparam("b_id"))
+                    .where(jobs_table.c.change_seq == bindparam("b_seq"))
+                    .values(next_run_time=bindparam("b_next_run_time"), job_state=bindparam("b_job_state")),
+                    batch
+                )
+            self.stats["flushed"] += len(batch)
+        except Exception:
+            with self.lock:
+                self.dirty.update(row["b_id"] for row in batch)
+            raise
+
+    def persist(self, job_id: str):
+        """Write a job changed through the API (pause, resume) straight to the table and stamp it, so
+        the change survives a failover and reaches other replicas without waiting for flush()"""
+        if self.engine is None:
+            return
+        with self.lock:
+            entry = self.jobs.get(job_id) if self.active else None
+            if entry is None:
+                # Inactive replicas already wrote the change through in update_job
+                return
+            with self.engine.begin() as conn:
+                seq = self._tick(conn)
+                self._write(conn, entry[0], seq)
+            self.row_seq[job_id] = seq
+            self.dirty.discard(job_id)
+
+    def lookup_job(self, job_id):
+        with self.lock:
+            if self.active:
+                entry = self.jobs.get(job_id)
+                return entry[0] if entry is not None else None
+        if self.engine is None:
+            return None
+        with self.engine.connect() as conn:
+            state = conn.execute(select(jobs_table.c.job_state).where(jobs_table.c.id == job_id)).scalar()
+        return self._restore(job_id, state) if state is not None else None
+
+    def get_due_jobs(self, now):
+        if not self.active:
+            return []
+        timestamp = datetime_to_utc_timestamp(now)
+        with self.lock:
+            self._drop_stale()
+            # Walk only the part of the heap at or before now
+            due = []
+            stack = [0] if self.heap else []
+            while stack:
+                i = stack.pop()
+                if self.heap[i][0] > timestamp:
+                    continue
+                if self._is_current(self.heap[i]):
+                    due.append(self.heap[i])
+                stack.extend(child for child in (2 * i + 1, 2 * i + 2) if child < len(self.heap))
+            due.sort()
+            self.stats["fired"] += len(due)
+            return [self.jobs[job_id][0] for _, _, job_id in due]
+
+    def get_next_run_time(self):
+        if not self.active:
+            return None
+        with self.lock:
+            self._drop_stale()
+            return utc_timestamp_to_datetime(self.heap[0][0]) if self.heap else None
+
+    def get_all_jobs(self):
+        if self.active:
+            with self.lock:
+                entries = list(self.jobs.values())
+            entries.sort(key=lambda entry: (entry[1] is None, entry[1] or 0))
+            return [job for job, _, _ in entries]
+        if self.engine is None:
+            return []
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(jobs_table.c.id, jobs_table.c.job_state).where(jobs_table.c.job_state.is_not(None))
+            ).all()
+        jobs = [job for job in (self._restore(row.id, row.job_state) for row in rows) if job is not None]
+        jobs.sort(key=lambda job: (job.next_run_time is None, datetime_to_utc_timestamp(job.next_run_time) or 0))
+        return jobs
+
+    def add_job(self, job):
+        with self.lock:
+            if self.active and job.id in self.jobs:
+                raise ConflictingIdError(job.id)
+            if self.engine is not None:
+                with self.engine.begin() as conn:
+                    if conn.execute(
+                        select(jobs_table.c.id).where(jobs_table.c.id == job.id).where(jobs_table.c.job_state.is_not(None))
+                    ).first():
+                        raise ConflictingIdError(job.id)
+                    seq = self._tick(conn)
+                    self._write(conn, job, seq)
+                if self.active:
+                    self.row_seq[job.id] = seq
+            if self.active:
+                self._index(job)
+
+    def update_job(self, job):
+        with self.lock:
+            if self.active:
+                if job.id not in self.jobs:
+                    raise JobLookupError(job.id)
+                self._index(job)
+                if self.engine is not None:
+                    self.dirty.add(job.id)
+                return
+        with self.engine.begin() as conn:
+            if not conn.execute(
+                select(jobs_table.c.id).where(jobs_table.c.id == job.id).where(jobs_table.c.job_state.is_not(None))
+            ).first():
+                raise JobLookupError(job.id)
+            self._write(conn, job, self._tick(conn))
+
+    def remove_job(self, job_id):
+        with self.lock:
+            if self.active:
+                if job_id not in self.jobs:
+                    raise JobLookupError(job_id)
+                self._unindex(job_id)
+            if self.engine is not None:
+                with self.engine.begin() as conn:
+                    seq = self._tick(conn)
+                    removed = conn.execute(
+                        jobs_table.update()
+                        .where(jobs_table.c.id == job_id)
+                        .where(jobs_table.c.job_state.is_not(None))
+                        .values(job_state=None, next_run_time=None, change_seq=seq)
+                    ).rowcount
+                if not removed and not self.active:
+                    raise JobLookupError(job_id)
+
+    def remove_all_jobs(self):
+        with self.lock:
+            if self.active:
+                self._clear()
+            if self.engine is not None:
+                with self.engine.begin() as conn:
+                    seq = self._tick(conn)
+                    conn.execute(
+                        jobs_table.update()
+                        .where(jobs_table.c.job_state.is_not(None))
+                        .values(job_state=None, next_run_time=None, change_seq=seq)
+                    )
+
+    def shutdown(self):
+        if self.active:
+            self.flush()
+
+    def metrics(self) -> dict:
+        with self.lock:
+            return {
+                "active": self.active,
+                "jobs": len(self.jobs),
+                "heap_entries": len(self.heap),
+                "pending_flush": len(self.dirty),
+                "change_cursor": self.cursor,
+                **self.stats
+            }
+
+def create_store_engine(url: str):
+    # SQLite needs a generous busy timeout when several replicas share the file
+    connect_args = {"timeout": 30, "check_same_thread": False} if url.startswith("sqlite") else {}
+    return create_engine(url, pool_pre_ping=True, connect_args=connect_args)
+
 # Scheduler instance
-scheduler = BackgroundScheduler()
-scheduled_tasks = {}
+if SCHEDULER_DB_URL:
+    store_engine = create_store_engine(SCHEDULER_DB_URL)
+    job_store = HeapJobStore(store_engine)
+    scheduled_tasks = SQLScheduleStore(store_engine)
+    elector = LeaderElector(store_engine, LEADER_LEASE_NAME, SCHEDULER_ID, LEADER_LEASE_DURATION) if LEADER_ELECTION else None
+else:
+    job_store = HeapJobStore()
+    scheduled_tasks = MemoryScheduleStore()
+    elector = None
+
+scheduler = BackgroundScheduler(
+    jobstores={"default": job_store},
+    job_defaults={"misfire_grace_time": SCHEDULER_MISFIRE_GRACE, "coalesce": SCHEDULER_COALESCE}
+)
+
+def is_leader() -> bool:
+    return elector is None or elector.is_leader()
 
 class ScheduleTask(BaseModel):
     name: str
@@ -32,17 +648,364 @@ class ScheduleTask(BaseModel):
     task_type: str
     payload: Optional[dict] = None
     enabled: Optional[bool] = True
+    misfire_grace_time: Optional[int] = None
+    coalesce: Optional[bool] = None
+    timezone: Optional[str] = None
+    jitter: Optional[int] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
 
 class TaskExecution(BaseModel):
     task_id: str
     status: str
     result: Optional[dict] = None
 
+def parse_time(value: str) -> datetime:
+    """ISO-8601 timestamp as naive UTC, the form executed_at is recorded in"""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+class ExecutionHistory:
+    """Thread-safe ring buffer of recent executions, indexed by task and status, with lifetime
+    counters; entries pushed out of the buffer are spilled to an NDJSON log"""
+
+    def __init__(self, capacity: int, spill_path: str, spill_max_bytes: int, spill_batch: int):
+        self.capacity = max(1, capacity)
+        self.spill_path = spill_path
+        self.spill_max_bytes = spill_max_bytes
+        self.spill_batch = max(1, spill_batch)
+        self.lock = threading.Lock()
+        # Serializes spill writes so batches land on disk in eviction order
+        self.spill_lock = threading.Lock()
+        self.records: "OrderedDict[int, Tuple[datetime, dict]]" = OrderedDict()
+        self.by_task: Dict[str, deque] = {}
+        self.by_status: Dict[str, deque] = {}
+        self.counts: Counter = Counter()
+        self.task_counts: Dict[str, Counter] = {}
+        self.pending: List[dict] = []
+        self.seq = 0
+        self.spilled = 0
+        self.last_recorded = datetime.min
+
+    def add(self, execution: dict):
+        """Record a run; called from scheduler and dispatcher threads"""
+        with self.lock:
+            # Dispatched runs are recorded when the worker answers, after runs that fired later, so
+            # entries are ordered and time-filtered by when they were recorded rather than executed_at
+            self.last_recorded = max(datetime.utcnow(), self.last_recorded)
+            execution["recorded_at"] = self.last_recorded.isoformat()
+            self.seq += 1
+            execution["seq"] = self.seq
+            self.records[self.seq] = (self.last_recorded, execution)
+            self.by_task.setdefault(execution["task_id"], deque()).append(self.seq)
+            self.by_status.setdefault(execution["status"], deque()).append(self.seq)
+            self.counts[execution["status"]] += 1
+            self.task_counts.setdefault(execution["task_id"], Counter())[execution["status"]] += 1
+            if len(self.records) > self.capacity:
+                _, (_, evicted) = self.records.popitem(last=False)
+                self._unindex(self.by_task, evicted["task_id"])
+                self._unindex(self.by_status, evicted["status"])
+                if self.spill_path:
+                    self.pending.append(evicted)
+            spill = len(self.pending) >= self.spill_batch
+        if spill:
+            self.flush()
+
+    @staticmethod
+    def _unindex(index: Dict[str, deque], key: str):
+        # The evicted entry is the oldest overall, so it is also the oldest in its index
+        seqs = index[key]
+        seqs.popleft()
+        if not seqs:
+            del index[key]
+
+    def flush(self):
+        """Append evicted entries to the spill log"""
+        with self.spill_lock:
+            with self.lock:
+                batch, self.pending = self.pending, []
+            if not batch:
+                return
+            try:
+                if os.path.exists(self.spill_path) and os.path.getsize(self.spill_path) >= self.spill_max_bytes:
+                    os.replace(self.spill_path, f"{self.spill_path}.1")
+                with open(self.spill_path, "a") as log:
+                    log.writelines(json.dumps(entry, separators=(",", ":")) + "\n" for entry in batch)
+                self.spilled += len(batch)
+            except OSError as e:
+                logger.error(f"Failed to spill {len(batch)} executions to {self.spill_path}: {str(e)}")
+
+    def _candidates(self, task_ids: Optional[Set[str]], statuses: Optional[Set[str]]) -> Sequence[int]:
+        """Sequence numbers of retained entries matching the filters, oldest first"""
+        lists = []
+        for index, keys in ((self.by_task, task_ids), (self.by_status, statuses)):
+            if keys is not None:
+                lists.append([index[key] for key in keys if key in index])
+        if not lists:
+            # Retained sequence numbers are contiguous
+            return range(self.seq - len(self.records) + 1, self.seq + 1)
+        # Walk the smaller index and check the other filter per entry
+        lists.sort(key=lambda seqs: sum(map(len, seqs)))
+        return [seq for seq in heapq.merge(*lists[0]) if self._matches(self.records[seq][1], task_ids, statuses)]
+
+    @staticmethod
+    def _matches(entry: dict, task_ids: Optional[Set[str]], statuses: Optional[Set[str]]) -> bool:
+        return (task_ids is None or entry["task_id"] in task_ids) and (statuses is None or entry["status"] in statuses)
+
+    def query(self, task_ids: Optional[Set[str]] = None, statuses: Optional[Set[str]] = None,
+              since: Optional[datetime] = None, until: Optional[datetime] = None,
+              before: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[dict], bool, bool]:
+        """The newest `limit` retained entries matching the filters with seq below `before` and recorded_at
+        within since/until, oldest first, whether more retained entries match, and whether older matches
+        may have been spilled"""
+        with self.lock:
+            seqs = self._candidates(task_ids, statuses)
+            recorded = lambda seq: self.records[seq][0]
+            hi = len(seqs) if before is None else bisect.bisect_left(seqs, before)
+            if until is not None:
+                hi = bisect.bisect_right(seqs, until, hi=hi, key=recorded)
+            start = 0 if since is None else bisect.bisect_left(seqs, since, hi=hi, key=recorded)
+            lo = max(start, hi - limit)
+            page = [self.records[seq][1] for seq in seqs[lo:hi]]
+        return page, lo > start, start == 0 and self.spilled + len(self.pending) > 0
+
+    def query_spilled(self, task_ids: Optional[Set[str]], statuses: Optional[Set[str]],
+                      since: Optional[datetime], until: Optional[datetime],
+                      before: Optional[int], limit: int) -> List[dict]:
+        """Same as query, over entries no longer in memory; scans the spill log"""
+        matches = deque(maxlen=limit)
+
+        def consider(entry: dict):
+            if before is not None and entry["seq"] >= before:
+                return
+            if not self._matches(entry, task_ids, statuses):
+                return
+            # Logs spilled before recorded_at existed only carry executed_at
+            recorded = parse_time(entry.get("recorded_at", entry["executed_at"]))
+            if (since is None or recorded >= since) and (until is None or recorded <= until):
+                matches.append(entry)
+
+        with self.spill_lock:
+            for path in (f"{self.spill_path}.1", self.spill_path):
+                if not self.spill_path or not os.path.exists(path):
+                    continue
+                with open(path) as log:
+                    for line in log:
+                        consider(json.loads(line))
+            with self.lock:
+                pending = list(self.pending)
+        for entry in pending:
+            consider(entry)
+        return list(matches)
+
+    def recent(self, count: int) -> List[dict]:
+        with self.lock:
+            return [entry for _, entry in list(self.records.values())[-count:]]
+
+    def total(self, task_ids: Optional[Set[str]] = None, statuses: Optional[Set[str]] = None) -> int:
+        """Lifetime number of executions matching the filters, from the counters"""
+        with self.lock:
+            if task_ids is None:
+                counters = [self.counts]
+            else:
+                counters = [self.task_counts[task_id] for task_id in task_ids if task_id in self.task_counts]
+            return sum(
+                sum(counter.values()) if statuses is None else sum(counter[status] for status in statuses)
+                for counter in counters
+            )
+
+    def metrics(self) -> dict:
+        with self.lock:
+            return {
+                "capacity": self.capacity,
+                "retained": len(self.records),
+                "spilled": self.spilled,
+                "pending_spill": len(self.pending),
+                "spill_path": self.spill_path or None
+            }
+
 # Task execution history
-execution_history = []
+execution_history = ExecutionHistory(HISTORY_CAPACITY, HISTORY_SPILL_PATH, HISTORY_SPILL_MAX_BYTES, HISTORY_SPILL_BATCH)
+
+class DispatchBacklogFull(Exception):
+    pass
+
+class TaskDispatcher:
+    """Submits fired tasks to the worker service over a shared async client on its own event loop
+    thread; scheduler threads only enqueue, so a burst of due triggers goes out concurrently"""
+
+    def __init__(self, base_url: str, concurrency: int, max_pending: int,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.transport = transport
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.client: Optional[httpx.AsyncClient] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.in_flight = 0
+        self.stats = Counter()
+
+    def start(self):
+        self.loop = asyncio.new_event_loop()
+        opened = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(opened,), name="task-dispatcher", daemon=True)
+        self.thread.start()
+        opened.wait()
+        logger.info(f"Task dispatcher started in {REGION}: {self.base_url}, concurrency {self.concurrency}")
+
+    def _run(self, opened: threading.Event):
+        asyncio.set_event_loop(self.loop)
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            timeout=httpx.Timeout(DISPATCH_TIMEOUT),
+            transport=self.transport
+        )
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        opened.set()
+        self.loop.run_forever()
+
+    def submit(self, execution: dict):
+        """Queue a fired task for dispatch; called from scheduler threads and returns immediately"""
+        with self.lock:
+            if self.pending >= self.max_pending:
+                self.stats["rejected"] += 1
+                raise DispatchBacklogFull(f"Dispatch backlog full ({self.max_pending} pending)")
+            self.pending += 1
+        asyncio.run_coroutine_threadsafe(self._dispatch(execution), self.loop)
+
+    async def _dispatch(self, execution: dict):
+        job = {
+            "job_type": execution["task_type"],
+            "payload": execution["payload"],
+            # Retries of one firing collapse into a single job on the worker
+            "dedup_key": f"scheduler:{execution['task_id']}:{execution['fire_id']}"
+        }
+        try:
+            async with self.semaphore:
+                with self.lock:
+                    self.in_flight += 1
+                try:
+                    result = await self._post(job)
+                finally:
+                    with self.lock:
+                        self.in_flight -= 1
+            execution["status"] = "dispatched"
+            execution["result"] = result
+            self.stats["dispatched"] += 1
+        except Exception as e:
+            logger.error(f"Dispatch of task {execution['task_id']} failed: {str(e)}")
+            execution["status"] = "failed"
+            execution["error"] = str(e)
+            self.stats["failed"] += 1
+        finally:
+            with self.lock:
+                self.pending -= 1
+        execution_history.add(execution)
+
+    @staticmethod
+    def _retry_delay(retry_after: Optional[str], backoff: float) -> float:
+        """Seconds to wait from a Retry-After header (delay-seconds or HTTP-date), else the backoff"""
+        if retry_after is None:
+            return backoff
+        try:
+            seconds = float(retry_after)
+        except ValueError:
+            pass
+        else:
+            return max(0.0, seconds) if math.isfinite(seconds) else backoff
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return backoff
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    async def _post(self, job: dict) -> dict:
+        """POST /job/submit, retrying connection errors and 429/5xx with backoff"""
+        retries = max(0, DISPATCH_RETRIES)
+        for attempt in range(retries + 1):
+            try:
+                response = await self.client.post("/job/submit", json=job)
+                if response.status_code != 429 and response.status_code < 500:
+                    response.raise_for_status()
+                    body = response.json()
+                    return {"job_id": body.get("job_id"), "worker_region": body.get("region")}
+                error = f"worker returned {response.status_code}"
+                delay = self._retry_delay(response.headers.get("Retry-After"), DISPATCH_RETRY_BACKOFF * 2 ** attempt)
+            except httpx.TransportError as e:
+                error = f"{type(e).__name__}: {str(e)}"
+                delay = DISPATCH_RETRY_BACKOFF * 2 ** attempt
+            if attempt < retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+        raise RuntimeError(error)
+
+    async def _drain(self, timeout: float):
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        await self.client.aclose()
+
+    def close(self, timeout: float = DISPATCH_TIMEOUT):
+        """Wait up to timeout for queued dispatches, then stop the loop"""
+        try:
+            asyncio.run_coroutine_threadsafe(self._drain(timeout), self.loop).result(timeout + 5)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
+
+    def metrics(self) -> dict:
+        with self.lock:
+            return {
+                "worker_url": self.base_url,
+                "concurrency": self.concurrency,
+                "pending": self.pending,
+                "in_flight": self.in_flight,
+                "max_pending": self.max_pending,
+                **self.stats
+            }
+
+dispatcher = TaskDispatcher(WORKER_SERVICE_URL, DISPATCH_CONCURRENCY, DISPATCH_MAX_PENDING) if WORKER_SERVICE_URL else None
 
 def execute_scheduled_task(task_id: str, task_name: str, task_type: str, payload: dict):
     """Execute a scheduled task"""
+    if not is_leader():
+        # The lease lapsed before the scheduler was paused; the new leader fires this trigger
+        logger.warning(f"Skipping scheduled task {task_id} in {REGION}: not the leader")
+        return
+
+    if dispatcher is not None:
+        try:
+            dispatcher.submit({
+                "task_id": task_id,
+                "task_name": task_name,
+                "task_type": task_type,
+                "payload": payload,
+                "fire_id": str(uuid.uuid4()),
+                "executed_at": datetime.utcnow().isoformat(),
+                "region": REGION
+            })
+        except DispatchBacklogFull as e:
+            logger.error(f"Task {task_id} not dispatched: {str(e)}")
+            execution_history.add({
+                "task_id": task_id,
+                "task_name": task_name,
+                "status": "failed",
+                "error": str(e),
+                "executed_at": datetime.utcnow().isoformat(),
+                "region": REGION
+            })
+        return
+
     try:
         logger.info(f"Executing scheduled task {task_id}: {task_name} in {REGION}")
 
@@ -68,7 +1031,7 @@ def execute_scheduled_task(task_id: str, task_name: str, task_type: str, payload
         else:
             execution["result"] = {"executed": True}
 
-        execution_history.append(execution)
+        execution_history.add(execution)
         logger.info(f"Task {task_id} completed successfully")
 
     except Exception as e:
@@ -81,18 +1044,83 @@ def execute_scheduled_task(task_id: str, task_name: str, task_type: str, payload
             "executed_at": datetime.utcnow().isoformat(),
             "region": REGION
         }
-        execution_history.append(execution)
+        execution_history.add(execution)
+
+def record_missed_run(event):
+    """Misfired runs skipped by the grace policy show up in the history"""
+    execution_history.add({
+        "task_id": event.job_id,
+        "status": "missed",
+        "scheduled_at": event.scheduled_run_time.astimezone(timezone.utc).replace(tzinfo=None).isoformat(),
+        "executed_at": datetime.utcnow().isoformat(),
+        "region": REGION
+    })
+
+def job_options(task: ScheduleTask) -> dict:
+    """Per-schedule misfire policy overrides for add_job"""
+    options = {"misfire_grace_time": task.misfire_grace_time, "coalesce": task.coalesce}
+    return {key: value for key, value in options.items() if value is not None}
 
 @app.on_event("startup")
 async def startup_event():
     """Start the scheduler on app startup"""
-    scheduler.start()
-    logger.info(f"Scheduler started in {REGION}")
+    if dispatcher is not None:
+        dispatcher.start()
+    scheduler.add_listener(record_missed_run, EVENT_JOB_MISSED)
+    # Persisted jobs are loaded into the job index once this replica is elected (or right away without election)
+    scheduler.start(paused=job_store.engine is not None)
+    if job_store.engine is not None:
+        app.state.scheduler_task = asyncio.create_task(scheduler_loop())
+    logger.info(f"Scheduler started in {REGION} with {scheduled_tasks.count()} scheduled tasks")
+
+def set_leadership(leader: bool):
+    """Fire triggers only while holding the lease"""
+    if leader:
+        if scheduler.state == STATE_PAUSED:
+            scheduler.resume()
+        else:
+            # Pick up jobs other replicas added to the shared store since the last wakeup
+            scheduler.wakeup()
+    elif scheduler.state == STATE_RUNNING:
+        scheduler.pause()
+
+async def scheduler_loop():
+    """Renew or contend for the scheduler lease, and keep the leader's job index in step with the shared store"""
+    while True:
+        leader = True
+        if elector is not None:
+            try:
+                leader = await asyncio.to_thread(elector.try_acquire)
+            except Exception as e:
+                logger.error(f"Leader election error: {str(e)}")
+                leader = elector.is_leader()
+        try:
+            if leader:
+                await asyncio.to_thread(job_store.sync)
+            elif job_store.active:
+                set_leadership(False)
+                await asyncio.to_thread(job_store.deactivate)
+        except Exception as e:
+            logger.error(f"Job store sync error: {str(e)}")
+        set_leadership(leader and job_store.active)
+        await asyncio.sleep(LEADER_RENEW_INTERVAL)
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Shutdown the scheduler gracefully"""
+    if job_store.engine is not None:
+        app.state.scheduler_task.cancel()
+        scheduler.pause()
+        try:
+            await asyncio.to_thread(job_store.flush)
+            if elector is not None:
+                await asyncio.to_thread(elector.release)
+        except Exception as e:
+            logger.error(f"Failed to hand over the scheduler: {str(e)}")
     scheduler.shutdown()
+    if dispatcher is not None:
+        await asyncio.to_thread(dispatcher.close)
+    execution_history.flush()
     logger.info(f"Scheduler stopped in {REGION}")
 
 @app.get("/")
@@ -104,63 +1132,109 @@ async def health_check():
         "service": "scheduler-service",
         "region": REGION,
         "scheduler_running": scheduler.running,
-        "scheduled_tasks": len(scheduled_tasks),
+        "leader": is_leader(),
+        "scheduled_tasks": await asyncio.to_thread(scheduled_tasks.count),
         "timestamp": datetime.utcnow().isoformat(),
         "version": "1.0.0"
     }
 
+CRON_FIELDS = ("second", "minute", "hour", "day", "month", "day_of_week")
+DAY_NAMES = ("sun", "mon", "tue", "wed", "thu", "fri", "sat")
+INTERVAL_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+def parse_weekday(token: str) -> int:
+    if token in DAY_NAMES:
+        return DAY_NAMES.index(token)
+    if token.isdigit() and int(token) <= 7:
+        return int(token)
+    raise ValueError(f"Invalid day of week {token!r}")
+
+def cron_day_of_week(field: str) -> str:
+    """Cron day-of-week (0 or 7 is Sunday) as day names, since APScheduler counts from Monday"""
+    if field in ("*", "?"):
+        return "*"
+    days = set()
+    for part in field.lower().split(","):
+        base, _, step = part.partition("/")
+        if base == "*":
+            first, last = 0, 6
+        else:
+            start, _, end = base.partition("-")
+            first = parse_weekday(start)
+            last = parse_weekday(end) if end else (7 if step else first)
+        if first > last or (step and not step.isdigit()) or step == "0":
+            raise ValueError(f"Invalid day of week {part!r}")
+        days.update(day % 7 for day in range(first, last + 1, int(step or 1)))
+    return ",".join(DAY_NAMES[day] for day in sorted(days))
+
+def cron_trigger(expression: str, jitter: Optional[int], options: dict):
+    """Trigger for "HH:MM" (daily), a 5-field cron expression or a 6-field one with seconds first"""
+    if re.fullmatch(r"\d{1,2}:\d{2}", expression.strip()):
+        hour, minute = map(int, expression.split(":"))
+        return CronTrigger(hour=hour, minute=minute, jitter=jitter, **options)
+
+    fields = expression.split()
+    if len(fields) == 5:
+        fields = ["0", *fields]
+    if len(fields) != 6:
+        raise ValueError("cron expression needs 5 fields (minute hour day month weekday) or 6 with seconds first")
+    values = dict(zip(CRON_FIELDS, fields))
+    values["day_of_week"] = cron_day_of_week(values["day_of_week"])
+    if values["day"] == "?":
+        values["day"] = "*"
+    if values["day"] != "*" and values["day_of_week"] != "*":
+        # Cron fires when either day field matches, APScheduler only when both do
+        return OrTrigger([
+            CronTrigger(**{**values, "day_of_week": "*"}, **options),
+            CronTrigger(**{**values, "day": "*"}, **options)
+        ], jitter=jitter)
+    return CronTrigger(**values, jitter=jitter, **options)
+
+def build_trigger(task: ScheduleTask):
+    """APScheduler trigger for a schedule; raises ValueError (or KeyError for an unknown time zone)"""
+    options = {
+        "timezone": task.timezone or SCHEDULER_TIMEZONE or None,
+        "start_date": task.start_date,
+        "end_date": task.end_date
+    }
+    if task.schedule_type == "interval":
+        # e.g. "30s", "5m", "1h", "1d", "2w"
+        match = re.fullmatch(r"(\d+)([smhdw])", task.schedule_value.strip())
+        if not match or int(match[1]) == 0:
+            raise ValueError("interval must be a positive number followed by s, m, h, d or w")
+        return IntervalTrigger(**{INTERVAL_UNITS[match[2]]: int(match[1])}, jitter=task.jitter, **options)
+    if task.schedule_type == "cron":
+        return cron_trigger(task.schedule_value, task.jitter, options)
+    if task.schedule_type == "date":
+        return DateTrigger(run_date=task.schedule_value, timezone=options["timezone"])
+    raise ValueError(f"Unknown schedule_type {task.schedule_type!r}; expected interval, cron or date")
+
 @app.post("/schedule/create")
 async def create_schedule(task: ScheduleTask):
     """Create a new scheduled task"""
     task_id = str(uuid.uuid4())
 
     try:
-        # Create schedule based on type
-        if task.schedule_type == "interval":
-            # Parse interval (e.g., "30s", "5m", "1h")
-            value = task.schedule_value
-            if value.endswith("s"):
-                seconds = int(value[:-1])
-                scheduler.add_job(
-                    execute_scheduled_task,
-                    'interval',
-                    seconds=seconds,
-                    args=[task_id, task.name, task.task_type, task.payload or {}],
-                    id=task_id
-                )
-            elif value.endswith("m"):
-                minutes = int(value[:-1])
-                scheduler.add_job(
-                    execute_scheduled_task,
-                    'interval',
-                    minutes=minutes,
-                    args=[task_id, task.name, task.task_type, task.payload or {}],
-                    id=task_id
-                )
-            elif value.endswith("h"):
-                hours = int(value[:-1])
-                scheduler.add_job(
-                    execute_scheduled_task,
-                    'interval',
-                    hours=hours,
-                    args=[task_id, task.name, task.task_type, task.payload or {}],
-                    id=task_id
-                )
+        trigger = build_trigger(task)
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid schedule: {str(e)}")
 
-        elif task.schedule_type == "cron":
-            # Cron expression (simplified - only daily at specific time)
-            hour, minute = map(int, task.schedule_value.split(":"))
-            scheduler.add_job(
-                execute_scheduled_task,
-                'cron',
-                hour=hour,
-                minute=minute,
-                args=[task_id, task.name, task.task_type, task.payload or {}],
-                id=task_id
-            )
+    try:
+        options = job_options(task)
+        if task.enabled is False:
+            # Created paused
+            options["next_run_time"] = None
+        job = await asyncio.to_thread(
+            scheduler.add_job,
+            execute_scheduled_task,
+            trigger,
+            args=[task_id, task.name, task.task_type, task.payload or {}],
+            id=task_id,
+            **options
+        )
 
         # Store task metadata
-        scheduled_tasks[task_id] = {
+        task_record = {
             "task_id": task_id,
             "name": task.name,
             "schedule_type": task.schedule_type,
@@ -168,16 +1242,24 @@ async def create_schedule(task: ScheduleTask):
             "task_type": task.task_type,
             "payload": task.payload,
             "enabled": task.enabled,
+            "misfire_grace_time": task.misfire_grace_time,
+            "coalesce": task.coalesce,
+            "timezone": task.timezone,
+            "jitter": task.jitter,
+            "start_date": task.start_date,
+            "end_date": task.end_date,
             "created_at": datetime.utcnow().isoformat(),
             "region": REGION
         }
+        await asyncio.to_thread(scheduled_tasks.save, task_record)
 
         logger.info(f"Created scheduled task {task_id}: {task.name}")
 
         return {
             "message": "Scheduled task created successfully",
             "task_id": task_id,
-            "task": scheduled_tasks[task_id]
+            "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
+            "task": task_record
         }
 
     except Exception as e:
@@ -187,29 +1269,31 @@ async def create_schedule(task: ScheduleTask):
 @app.get("/schedule/list")
 async def list_schedules():
     """List all scheduled tasks"""
+    tasks = await asyncio.to_thread(scheduled_tasks.list)
     return {
-        "scheduled_tasks": list(scheduled_tasks.values()),
-        "count": len(scheduled_tasks),
+        "scheduled_tasks": tasks,
+        "count": len(tasks),
         "region": REGION
     }
 
 @app.get("/schedule/{task_id}")
 async def get_schedule(task_id: str):
     """Get specific scheduled task"""
-    if task_id not in scheduled_tasks:
+    task = await asyncio.to_thread(scheduled_tasks.get, task_id)
+    if task is None:
         return {"error": "Task not found"}, 404
 
-    return scheduled_tasks[task_id]
+    return task
 
 @app.delete("/schedule/{task_id}")
 async def delete_schedule(task_id: str):
     """Delete a scheduled task"""
-    if task_id not in scheduled_tasks:
+    if await asyncio.to_thread(scheduled_tasks.get, task_id) is None:
         return {"error": "Task not found"}, 404
 
     try:
-        scheduler.remove_job(task_id)
-        deleted_task = scheduled_tasks.pop(task_id)
+        await asyncio.to_thread(scheduler.remove_job, task_id)
+        deleted_task = await asyncio.to_thread(scheduled_tasks.delete, task_id)
         logger.info(f"Deleted scheduled task {task_id}")
 
         return {
@@ -224,12 +1308,15 @@ async def delete_schedule(task_id: str):
 @app.post("/schedule/{task_id}/pause")
 async def pause_schedule(task_id: str):
     """Pause a scheduled task"""
-    if task_id not in scheduled_tasks:
+    task = await asyncio.to_thread(scheduled_tasks.get, task_id)
+    if task is None:
         return {"error": "Task not found"}, 404
 
     try:
-        scheduler.pause_job(task_id)
-        scheduled_tasks[task_id]["enabled"] = False
+        await asyncio.to_thread(scheduler.pause_job, task_id)
+        await asyncio.to_thread(job_store.persist, task_id)
+        task["enabled"] = False
+        await asyncio.to_thread(scheduled_tasks.save, task)
         logger.info(f"Paused scheduled task {task_id}")
 
         return {
@@ -244,12 +1331,15 @@ async def pause_schedule(task_id: str):
 @app.post("/schedule/{task_id}/resume")
 async def resume_schedule(task_id: str):
     """Resume a paused scheduled task"""
-    if task_id not in scheduled_tasks:
+    task = await asyncio.to_thread(scheduled_tasks.get, task_id)
+    if task is None:
         return {"error": "Task not found"}, 404
 
     try:
-        scheduler.resume_job(task_id)
-        scheduled_tasks[task_id]["enabled"] = True
+        await asyncio.to_thread(scheduler.resume_job, task_id)
+        await asyncio.to_thread(job_store.persist, task_id)
+        task["enabled"] = True
+        await asyncio.to_thread(scheduled_tasks.save, task)
         logger.info(f"Resumed scheduled task {task_id}")
 
         return {
@@ -261,12 +1351,65 @@ async def resume_schedule(task_id: str):
         logger.error(f"Failed to resume schedule: {str(e)}")
         return {"error": str(e)}, 500
 
+def encode_cursor(seq: int) -> str:
+    """Opaque keyset cursor pointing just before an execution"""
+    return base64.urlsafe_b64encode(json.dumps(seq).encode()).decode()
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    if not cursor:
+        return None
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode())))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def parse_filter(value: Optional[str]) -> Optional[Set[str]]:
+    """Comma-separated query values as a set; None matches everything"""
+    values = {v.strip() for v in (value or "").split(",") if v.strip()}
+    return values or None
+
+def parse_time_param(name: str, value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return parse_time(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be an ISO-8601 timestamp")
+
 @app.get("/executions/history")
-async def get_execution_history():
-    """Get task execution history"""
+async def get_execution_history(
+    task_id: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    archived: bool = False
+):
+    """Get task execution history, newest page first; follow next_cursor for older runs"""
+    task_ids = parse_filter(task_id)
+    statuses = parse_filter(status)
+    since_time = parse_time_param("since", since)
+    until_time = parse_time_param("until", until)
+    before = decode_cursor(cursor)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    page, more, spilled = execution_history.query(task_ids, statuses, since_time, until_time, before, limit)
+    if archived and spilled and not more:
+        if len(page) < limit:
+            # Continue into the spill log, which only holds entries older than anything in memory
+            older = await asyncio.to_thread(
+                execution_history.query_spilled, task_ids, statuses, since_time, until_time,
+                page[0]["seq"] if page else before, limit - len(page)
+            )
+            page = older + page
+        more = len(page) == limit
+
     return {
-        "executions": execution_history[-100:],  # Last 100 executions
-        "total": len(execution_history),
+        "executions": page,
+        "count": len(page),
+        "total": execution_history.total(task_ids, statuses),
+        "next_cursor": encode_cursor(page[0]["seq"]) if more else None,
         "region": REGION
     }
 
@@ -275,9 +1418,10 @@ async def get_status():
     """Get scheduler status"""
     return {
         "scheduler_running": scheduler.running,
-        "scheduled_tasks": len(scheduled_tasks),
-        "total_executions": len(execution_history),
-        "recent_executions": execution_history[-10:],
+        "scheduled_tasks": await asyncio.to_thread(scheduled_tasks.count),
+        "leadership": await asyncio.to_thread(elector.metrics) if elector is not None else None,
+        "total_executions": execution_history.total(),
+        "recent_executions": execution_history.recent(10),
         "region": REGION,
         "timestamp": datetime.utcnow().isoformat()
     }
@@ -285,18 +1429,23 @@ async def get_status():
 @app.get("/stats")
 async def get_stats():
     """Get scheduler statistics"""
-    completed = len([e for e in execution_history if e["status"] == "completed"])
-    failed = len([e for e in execution_history if e["status"] == "failed"])
+    completed = execution_history.total(statuses={"completed"})
+    failed = execution_history.total(statuses={"failed"})
 
     return {
         "service": "scheduler-service",
         "region": REGION,
         "stats": {
-            "scheduled_tasks": len(scheduled_tasks),
-            "total_executions": len(execution_history),
+            "scheduled_tasks": await asyncio.to_thread(scheduled_tasks.count),
+            "total_executions": execution_history.total(),
             "completed_executions": completed,
-            "failed_executions": failed
+            "failed_executions": failed,
+            "dispatched_executions": execution_history.total(statuses={"dispatched"}),
+            "missed_executions": execution_history.total(statuses={"missed"})
         },
+        "history": execution_history.metrics(),
+        "job_store": job_store.metrics(),
+        "dispatch": dispatcher.metrics() if dispatcher is not None else None,
         "timestamp": datetime.utcnow().isoformat()
     }
 
@@ -0,0 +1,151 @@
+"""
+Trigger Benchmark - Job Store Scheduling Overhead
+Loads N interval and cron schedules into each job store and replays the
+scheduler's wakeup loop (get_due_jobs, update_job, get_next_run_time) over a
+simulated clock, timing only the job store calls. Compares APScheduler's
+MemoryJobStore and SQLAlchemyJobStore with HeapJobStore, in memory and
+backed by SQLite with write-behind flushes.
+
+Usage (from microservices/scheduler-service):
+    python bench_triggers.py
+    python bench_triggers.py --sizes 10000,100000 --window 600 --sql-max 100000
+
+SQLite-backed stores commit every add, so they are skipped above --sql-max.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+# Keep the service's own schedule store out of the working directory
+os.environ["SCHEDULER_DB_URL"] = ""
+os.environ["HISTORY_SPILL_PATH"] = ""
+
+from apscheduler.job import Job
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+from app import HeapJobStore, create_store_engine
+
+FLUSH_INTERVAL = 5
+
+def noop():
+    pass
+
+def make_jobs(scheduler, count: int, start: datetime, rng: random.Random) -> list:
+    """Half interval schedules (30s to 1h), half cron schedules on a random second"""
+    jobs = []
+    for i in range(count):
+        if i % 2:
+            trigger = IntervalTrigger(
+                seconds=rng.randint(30, 3600),
+                start_date=start + timedelta(seconds=rng.randint(0, 3600)),
+                timezone=timezone.utc
+            )
+        else:
+            trigger = CronTrigger(
+                second=rng.randint(0, 59), minute=rng.choice(["*", "*/5", "*/15", "0"]), timezone=timezone.utc
+            )
+        jobs.append(Job(
+            scheduler, id=f"job-{i}", func=noop, trigger=trigger, executor="default", args=(), kwargs={},
+            name=f"job-{i}", misfire_grace_time=60, coalesce=True, max_instances=1,
+            next_run_time=trigger.get_next_fire_time(None, start)
+        ))
+    return jobs
+
+def make_store(kind: str, directory: str):
+    if kind == "memory":
+        return MemoryJobStore()
+    if kind == "sqlalchemy":
+        return SQLAlchemyJobStore(url=f"sqlite:///{directory}/sqlalchemy.db")
+    if kind == "heap":
+        return HeapJobStore()
+    return HeapJobStore(create_store_engine(f"sqlite:///{directory}/heap.db"))
+
+def replay(store, start: datetime, window: float) -> dict:
+    """Run the scheduler's wakeup loop until the simulated clock passes the window"""
+    store_seconds = 0.0
+    fires = 0
+    wakeups = 0
+    end = start + timedelta(seconds=window)
+    next_flush = start + timedelta(seconds=FLUSH_INTERVAL)
+
+    while True:
+        started = time.perf_counter()
+        now = store.get_next_run_time()
+        store_seconds += time.perf_counter() - started
+        if now is None or now > end:
+            break
+        wakeups += 1
+
+        started = time.perf_counter()
+        due = store.get_due_jobs(now)
+        store_seconds += time.perf_counter() - started
+        for job in due:
+            next_run = job.trigger.get_next_fire_time(job.next_run_time, now)
+            job._modify(next_run_time=next_run)
+            started = time.perf_counter()
+            store.update_job(job)
+            store_seconds += time.perf_counter() - started
+        fires += len(due)
+
+        if isinstance(store, HeapJobStore) and now >= next_flush:
+            started = time.perf_counter()
+            store.flush()
+            store_seconds += time.perf_counter() - started
+            next_flush = now + timedelta(seconds=FLUSH_INTERVAL)
+
+    return {"store_seconds": store_seconds, "fires": fires, "wakeups": wakeups}
+
+def bench(size: int, stores: list, window: float, sql_max: int, rng: random.Random):
+    scheduler = BackgroundScheduler()
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    print(f"{size:>9,} schedules, {window:.0f}s simulated")
+    for kind in stores:
+        if kind in ("sqlalchemy", "heap-sqlite") and size > sql_max:
+            print(f"          {kind:<12} | skipped above --sql-max {sql_max:,}")
+            continue
+        jobs = make_jobs(scheduler, size, start, random.Random(rng.random()))
+        with tempfile.TemporaryDirectory() as directory:
+            store = make_store(kind, directory)
+            store.start(scheduler, "default")
+            if isinstance(store, HeapJobStore) and store.engine is not None:
+                # As on the elected leader
+                store.activate()
+
+            started = time.perf_counter()
+            for job in jobs:
+                store.add_job(job)
+            add_seconds = time.perf_counter() - started
+
+            result = replay(store, start, window)
+            store.shutdown()
+
+        print(
+            f"          {kind:<12} | add {add_seconds * 1e6 / size:8.1f} us/job | "
+            f"{result['fires']:>7,} fires in {result['wakeups']:>6,} wakeups | "
+            f"{result['store_seconds'] * 1e6 / max(result['fires'], 1):8.1f} us/fire | "
+            f"{result['store_seconds'] * 1e6 / max(result['wakeups'], 1):9.1f} us/wakeup"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job store scheduling overhead")
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated schedule counts")
+    parser.add_argument("--stores", default="memory,sqlalchemy,heap,heap-sqlite", help="Job stores to compare")
+    parser.add_argument("--window", type=float, default=300, help="Simulated seconds to replay")
+    parser.add_argument("--sql-max", type=int, default=10000, help="Largest size to run the SQLite-backed stores at")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    stores = [s.strip() for s in args.stores.split(",") if s.strip()]
+    for size in [int(s) for s in args.sizes.split(",")]:
+        bench(size, stores, args.window, args.sql_max, rng)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Execution history ordering with asynchronous dispatch
+
+Run from microservices/scheduler-service:
+    python -m pytest -q test_history.py
+"""
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+# Keep the service's own schedule store and spill log out of the working directory
+os.environ["SCHEDULER_DB_URL"] = ""
+os.environ["HISTORY_SPILL_PATH"] = ""
+
+import httpx
+import pytest
+
+import app
+
+DISPATCH_DELAY = 0.3
+
+@pytest.fixture
+def history(monkeypatch):
+    history = app.ExecutionHistory(capacity=100, spill_path="", spill_max_bytes=0, spill_batch=1)
+    monkeypatch.setattr(app, "execution_history", history)
+    return history
+
+@pytest.fixture
+def dispatcher():
+    async def slow_worker(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(DISPATCH_DELAY)
+        return httpx.Response(200, json={"job_id": "job-1", "region": "test"})
+
+    dispatcher = app.TaskDispatcher(
+        "http://worker", concurrency=4, max_pending=10, transport=httpx.MockTransport(slow_worker)
+    )
+    dispatcher.start()
+    yield dispatcher
+    dispatcher.close(timeout=5)
+
+def wait_for_dispatch(dispatcher: app.TaskDispatcher):
+    deadline = time.monotonic() + 5
+    while dispatcher.metrics()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert dispatcher.metrics()["pending"] == 0
+
+def fire(dispatcher: app.TaskDispatcher, task_id: str):
+    dispatcher.submit({
+        "task_id": task_id,
+        "task_name": task_id,
+        "task_type": "test",
+        "payload": {},
+        "fire_id": task_id,
+        "executed_at": datetime.utcnow().isoformat(),
+        "region": "test"
+    })
+
+def record_inline(history: app.ExecutionHistory, task_id: str):
+    history.add({"task_id": task_id, "status": "missed", "executed_at": datetime.utcnow().isoformat()})
+
+def test_late_dispatch_is_recorded_after_a_later_inline_run(history, dispatcher):
+    fire(dispatcher, "early")
+    time.sleep(DISPATCH_DELAY / 3)
+    record_inline(history, "late")
+    wait_for_dispatch(dispatcher)
+
+    page, more, _ = history.query()
+    assert [entry["task_id"] for entry in page] == ["late", "early"]
+    assert not more
+    early = page[1]
+    late = page[0]
+    assert early["status"] == "dispatched"
+    # Fired first, recorded last
+    assert early["executed_at"] < late["executed_at"]
+    assert late["recorded_at"] <= early["recorded_at"]
+
+    # Time windows select on recorded_at, so neither entry is lost or duplicated at the boundary
+    until_late = app.parse_time(late["recorded_at"])
+    since_early = app.parse_time(early["recorded_at"])
+    assert [e["task_id"] for e in history.query(until=until_late)[0]] == ["late"]
+    assert [e["task_id"] for e in history.query(since=since_early)[0]] == ["early"]
+    window = history.query(since=until_late - timedelta(seconds=1), until=since_early)[0]
+    assert [e["task_id"] for e in window] == ["late", "early"]
+
+def test_cursor_pages_cover_every_entry_once(history, dispatcher):
+    for i in range(3):
+        fire(dispatcher, f"dispatched-{i}")
+        record_inline(history, f"inline-{i}")
+    wait_for_dispatch(dispatcher)
+
+    seen = []
+    before = None
+    while True:
+        page, more, _ = history.query(before=before, limit=2)
+        seen.extend(entry["task_id"] for entry in reversed(page))
+        if not more:
+            break
+        before = page[0]["seq"]
+    assert sorted(seen) == sorted([f"dispatched-{i}" for i in range(3)] + [f"inline-{i}" for i in range(3)])
+    assert len(seen) == len(set(seen))
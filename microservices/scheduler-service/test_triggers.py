@@ -0,0 +1,80 @@
+"""
+Cron schedules: day-of-week numbering and day field semantics
+
+Run from microservices/scheduler-service:
+    python -m pytest -q test_triggers.py
+"""
+import os
+from datetime import datetime, timezone
+
+# Keep the service's own schedule store and spill log out of the working directory
+os.environ["SCHEDULER_DB_URL"] = ""
+os.environ["HISTORY_SPILL_PATH"] = ""
+
+import pytest
+
+import app
+
+OPTIONS = {"timezone": "UTC", "start_date": None, "end_date": None}
+
+def fire_times(expression: str, after: datetime, count: int = 3) -> list:
+    trigger = app.cron_trigger(expression, None, OPTIONS)
+    times = []
+    previous = None
+    now = after
+    for _ in range(count):
+        previous = trigger.get_next_fire_time(previous, now)
+        times.append(previous.strftime("%a %Y-%m-%d %H:%M"))
+        now = previous
+    return times
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+@pytest.mark.parametrize("field, days", [
+    ("0", "sun"),
+    ("7", "sun"),
+    ("1", "mon"),
+    ("1-5", "mon,tue,wed,thu,fri"),
+    ("5-7", "sun,fri,sat"),
+    ("*/2", "sun,tue,thu,sat"),
+    ("1/2", "sun,mon,wed,fri"),
+    ("sat,SUN", "sun,sat"),
+    ("mon-fri/2", "mon,wed,fri"),
+    ("*", "*"),
+    ("?", "*"),
+])
+def test_cron_day_of_week_counts_from_sunday(field, days):
+    assert app.cron_day_of_week(field) == days
+
+@pytest.mark.parametrize("field", ["8", "fri-mon", "*/0", "mon/x", "funday"])
+def test_invalid_day_of_week_is_rejected(field):
+    with pytest.raises(ValueError):
+        app.cron_day_of_week(field)
+
+def test_weekday_schedule_fires_on_cron_days():
+    # 2026-01-04 is a Sunday
+    assert fire_times("0 9 * * 1", utc(2026, 1, 4)) == [
+        "Mon 2026-01-05 09:00", "Mon 2026-01-12 09:00", "Mon 2026-01-19 09:00"
+    ]
+    assert fire_times("30 6 * * 0", utc(2026, 1, 5)) == [
+        "Sun 2026-01-11 06:30", "Sun 2026-01-18 06:30", "Sun 2026-01-25 06:30"
+    ]
+    assert fire_times("0 0 * * 6-7", utc(2026, 1, 5)) == [
+        "Sat 2026-01-10 00:00", "Sun 2026-01-11 00:00", "Sat 2026-01-17 00:00"
+    ]
+
+def test_day_and_weekday_fields_match_either():
+    # Fires on the 10th and on every Friday, as cron does, not only on Fridays the 10th
+    assert fire_times("0 0 10 * 5", utc(2026, 3, 7), count=4) == [
+        "Tue 2026-03-10 00:00", "Fri 2026-03-13 00:00", "Fri 2026-03-20 00:00", "Fri 2026-03-27 00:00"
+    ]
+
+def test_six_field_expression_and_daily_time():
+    assert fire_times("15 0 12 * * mon", utc(2026, 1, 4), count=1) == ["Mon 2026-01-05 12:00"]
+    assert app.cron_trigger("15 0 12 * * mon", None, OPTIONS).get_next_fire_time(None, utc(2026, 1, 4)).second == 15
+    assert fire_times("07:45", utc(2026, 1, 4, 8), count=2) == ["Mon 2026-01-05 07:45", "Tue 2026-01-06 07:45"]
+
+def test_wrong_field_count_is_rejected():
+    with pytest.raises(ValueError):
+        app.cron_trigger("* * *", None, OPTIONS)
@@ -2,13 +2,29 @@
 Worker Service - Private Background Job Processor
 Handles asynchronous background jobs and task processing
 """
-from fastapi import FastAPI, BackgroundTasks
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import os
 import logging
 from datetime import datetime
 import asyncio
-from typing import Optional, Dict
+import base64
+import bisect
+import csv
+import heapq
+import io
+import itertools
+import json
+import math
+import socket
+import sqlite3
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from typing import Optional, Dict, List, Set, Tuple
 import uuid
 
 logging.basicConfig(level=logging.INFO)
@@ -21,13 +37,55 @@ REGION = os.getenv("AZURE_REGION", "unknown")
 SQL_CONNECTION_STRING = os.getenv("SQL_CONNECTION_STRING", "")
 STORAGE_CONNECTION_STRING = os.getenv("STORAGE_CONNECTION_STRING", "")
 
-# Job queue and status tracking
-jobs_queue: Dict[str, dict] = {}
+# Job scheduling
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "4"))
+QUEUE_MAX_DEPTH = int(os.getenv("QUEUE_MAX_DEPTH", "1000"))
+QUEUE_METRICS_WINDOW = int(os.getenv("QUEUE_METRICS_WINDOW", "500"))
+QUEUE_POLL_INTERVAL = float(os.getenv("QUEUE_POLL_INTERVAL", "1"))
+
+# Execution lanes for blocking and CPU-bound job handlers (0 sizes the process pool from the CPU quota)
+THREAD_POOL_WORKERS = int(os.getenv("THREAD_POOL_WORKERS", "4"))
+PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", "0"))
+
+# Opt-in batching: queued jobs of these types run together through their batch handler
+BATCH_JOB_TYPES = {t.strip() for t in os.getenv("BATCH_JOB_TYPES", "").split(",") if t.strip()}
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "100"))
+BATCH_MAX_WAIT = float(os.getenv("BATCH_MAX_WAIT", "0.05"))
+
+# Job storage and lease-based ownership
+JOB_STORE_BACKEND = os.getenv("JOB_STORE_BACKEND", "sqlite")
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "jobs.db")
+LEASE_DURATION = float(os.getenv("LEASE_DURATION", "30"))
+LEASE_HEARTBEAT_INTERVAL = float(os.getenv("LEASE_HEARTBEAT_INTERVAL", "10"))
+LEASE_REAPER_INTERVAL = float(os.getenv("LEASE_REAPER_INTERVAL", "5"))
+WORKER_ID = os.getenv("WORKER_ID", f"{REGION}-{socket.gethostname()}-{os.getpid()}")
+
+JOB_STATUSES = ("queued", "running", "completed", "failed")
+FINISHED_STATUSES = ("completed", "failed")
+
+# Retention of finished jobs (0 disables a limit) and job listing pages
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", "86400"))
+JOB_RETENTION_MAX = int(os.getenv("JOB_RETENTION_MAX", "10000"))
+JOB_RETENTION_INTERVAL = float(os.getenv("JOB_RETENTION_INTERVAL", "60"))
+JOB_RETENTION_BATCH = int(os.getenv("JOB_RETENTION_BATCH", "1000"))
+JOB_ARCHIVE_PATH = os.getenv("JOB_ARCHIVE_PATH", "")
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+
+# Push notification of job transitions: long-poll status reads and the event stream
+JOB_WAIT_MAX = float(os.getenv("JOB_WAIT_MAX", "30"))
+JOB_EVENTS_KEEPALIVE = float(os.getenv("JOB_EVENTS_KEEPALIVE", "15"))
+# Streams end after this long and clients reconnect, so open streams never hold up a graceful shutdown for long
+JOB_EVENTS_STREAM_MAX = float(os.getenv("JOB_EVENTS_STREAM_MAX", "60"))
+JOB_EVENTS_POLL_INTERVAL = float(os.getenv("JOB_EVENTS_POLL_INTERVAL", "0.5"))
+JOB_EVENTS_BUFFER = int(os.getenv("JOB_EVENTS_BUFFER", "1000"))
+JOB_EVENTS_HISTORY = int(os.getenv("JOB_EVENTS_HISTORY", "10000"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
 
 class JobRequest(BaseModel):
     job_type: str
     payload: Optional[dict] = None
     priority: Optional[int] = 1
+    dedup_key: Optional[str] = None
 
 class JobStatus(BaseModel):
     job_id: str
@@ -43,69 +101,1267 @@ async def health_check():
         "service": "worker-service",
         "region": REGION,
         "timestamp": datetime.utcnow().isoformat(),
-        "active_jobs": len([j for j in jobs_queue.values() if j["status"] == "running"]),
+        "active_jobs": (await job_store.counts())["running"],
         "version": "1.0.0"
     }
 
-async def process_job(job_id: str, job_type: str, payload: dict):
-    """Background job processing function"""
+class MemoryJobStore:
+    """Jobs kept in a process-local dict; lost on restart and invisible to other replicas"""
+
+    name = "memory"
+    shared = False
+
+    def __init__(self):
+        self.jobs: Dict[str, dict] = {}
+        self.seqs: Dict[str, int] = {}
+        self.ids_by_seq: Dict[int, str] = {}
+        # Sorted creation sequence numbers per status: O(1) counts and keyset listing
+        self.by_status: Dict[str, List[int]] = {status: [] for status in JOB_STATUSES}
+        # Finished job ids in completion order, oldest first, for retention
+        self.finished: "OrderedDict[str, float]" = OrderedDict()
+        self.leases: Dict[str, Tuple[str, float]] = {}
+        self.enqueued_at: Dict[str, float] = {}
+        # Per job type heaps of (-priority, sequence, job_id); entries for evicted jobs are skipped
+        self.heaps: Dict[str, List[tuple]] = {}
+        # (job_type, dedup_key) -> id of the queued job carrying that key
+        self.pending_keys: Dict[Tuple[str, str], str] = {}
+        self.sequence = itertools.count(1)
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    def _unindex(self, job_id: str, status: str):
+        ordered = self.by_status[status]
+        seq = self.seqs[job_id]
+        index = bisect.bisect_left(ordered, seq)
+        if index < len(ordered) and ordered[index] == seq:
+            del ordered[index]
+
+    def _transition(self, job: dict, status: str):
+        """Move a job between status indexes"""
+        job_id = job["job_id"]
+        self._unindex(job_id, job["status"])
+        if job["status"] in FINISHED_STATUSES:
+            self.finished.pop(job_id, None)
+        if job["status"] == "queued" and job.get("dedup_key"):
+            key = (job["job_type"], job["dedup_key"])
+            if self.pending_keys.get(key) == job_id:
+                del self.pending_keys[key]
+        job["status"] = status
+        bisect.insort(self.by_status[status], self.seqs[job_id])
+        if status in FINISHED_STATUSES:
+            self.finished[job_id] = time.time()
+
+    def _push(self, job: dict):
+        self.enqueued_at[job["job_id"]] = time.time()
+        heap = self.heaps.setdefault(job["job_type"], [])
+        heapq.heappush(heap, (-job["priority"], self.seqs[job["job_id"]], job["job_id"]))
+
+    def _head(self, heap: List[tuple]) -> Optional[tuple]:
+        """Top entry of a heap, dropping entries for jobs that are gone or no longer queued"""
+        while heap:
+            job = self.jobs.get(heap[0][2])
+            if job is not None and job["status"] == "queued":
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def _lease(self, job_id: str, owner: str, lease_seconds: float) -> Tuple[dict, float]:
+        job = self.jobs[job_id]
+        self._transition(job, "running")
+        job["started_at"] = datetime.utcnow().isoformat()
+        job["worker_id"] = owner
+        job["attempts"] = job.get("attempts", 0) + 1
+        self.leases[job_id] = (owner, time.time() + lease_seconds)
+        return job, self.enqueued_at.pop(job_id, time.time())
+
+    async def find_pending(self, job_type: str, dedup_key: str) -> Optional[str]:
+        return self.pending_keys.get((job_type, dedup_key))
+
+    async def create(self, job: dict) -> Optional[str]:
+        """Store a queued job; if a queued job already has its dedup key, return that job's id instead"""
+        if job.get("dedup_key"):
+            key = (job["job_type"], job["dedup_key"])
+            if key in self.pending_keys:
+                return self.pending_keys[key]
+            self.pending_keys[key] = job["job_id"]
+        seq = next(self.sequence)
+        self.jobs[job["job_id"]] = job
+        self.seqs[job["job_id"]] = seq
+        self.ids_by_seq[seq] = job["job_id"]
+        self.by_status[job["status"]].append(seq)
+        self._push(job)
+        return None
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return self.jobs.get(job_id)
+
+    async def claim(self, owner: str, lease_seconds: float) -> Optional[Tuple[dict, float]]:
+        """Lease the highest-priority queued job of any type"""
+        best = None
+        for heap in self.heaps.values():
+            head = self._head(heap)
+            if head is not None and (best is None or head < best[0]):
+                best = (head, heap)
+        if best is None:
+            return None
+        heapq.heappop(best[1])
+        return self._lease(best[0][2], owner, lease_seconds)
+
+    async def claim_batch(self, owner: str, lease_seconds: float, job_type: str, limit: int) -> List[Tuple[dict, float]]:
+        """Lease up to limit queued jobs of one type, highest priority first"""
+        heap = self.heaps.get(job_type, [])
+        claimed = []
+        while len(claimed) < limit and self._head(heap) is not None:
+            _, _, job_id = heapq.heappop(heap)
+            claimed.append(self._lease(job_id, owner, lease_seconds))
+        return claimed
+
+    async def heartbeat(self, job_ids: List[str], owner: str, lease_seconds: float) -> List[str]:
+        """Extend leases still held by owner; returns the job ids whose lease was extended"""
+        held = []
+        for job_id in job_ids:
+            lease = self.leases.get(job_id)
+            if lease is not None and lease[0] == owner:
+                self.leases[job_id] = (owner, time.time() + lease_seconds)
+                held.append(job_id)
+        return held
+
+    async def finish(self, job_id: str, owner: str, updates: dict) -> bool:
+        return (await self.finish_many(owner, [(job_id, updates)]))[0]
+
+    async def finish_many(self, owner: str, outcomes: List[Tuple[str, dict]]) -> List[bool]:
+        """Record outcomes for jobs still leased by owner; False where the lease was lost"""
+        recorded = []
+        for job_id, updates in outcomes:
+            lease = self.leases.get(job_id)
+            if lease is None or lease[0] != owner:
+                recorded.append(False)
+                continue
+            del self.leases[job_id]
+            job = self.jobs[job_id]
+            job.update({key: value for key, value in updates.items() if key != "status"})
+            self._transition(job, updates["status"])
+            recorded.append(True)
+        return recorded
+
+    async def requeue(self, job_id: str, updates: dict) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None or job["status"] != "failed":
+            return False
+        job.update(updates)
+        self._transition(job, "queued")
+        self._push(job)
+        return True
+
+    async def requeue_expired(self) -> List[str]:
+        now = time.time()
+        expired = [job_id for job_id, (_, expires) in self.leases.items() if expires < now]
+        for job_id in expired:
+            del self.leases[job_id]
+            job = self.jobs[job_id]
+            self._transition(job, "queued")
+            job["lease_expirations"] = job.get("lease_expirations", 0) + 1
+            self._push(job)
+        return expired
+
+    async def list_by_status(self, statuses: Tuple[str, ...], after: Optional[int], limit: int) -> List[Tuple[int, dict]]:
+        """A page of (seq, job) in creation order, starting after seq"""
+        slices = []
+        for status in statuses:
+            ordered = self.by_status[status]
+            start = bisect.bisect_right(ordered, after) if after else 0
+            slices.append(itertools.islice(ordered, start, start + limit))
+        seqs = itertools.islice(heapq.merge(*slices), limit)
+        return [(seq, self.jobs[self.ids_by_seq[seq]]) for seq in seqs]
+
+    async def counts(self) -> Dict[str, int]:
+        return {status: len(ordered) for status, ordered in self.by_status.items()}
+
+    async def evict_finished(self, cutoff: float, keep: Optional[int], limit: int) -> List[dict]:
+        """Drop up to limit finished jobs older than cutoff or beyond the newest keep"""
+        evicted = []
+        while self.finished and len(evicted) < limit:
+            job_id, finished_at = next(iter(self.finished.items()))
+            if finished_at >= cutoff and (keep is None or len(self.finished) <= keep):
+                break
+            del self.finished[job_id]
+            job = self.jobs.pop(job_id)
+            self._unindex(job_id, job["status"])
+            del self.ids_by_seq[self.seqs.pop(job_id)]
+            evicted.append(job)
+        return evicted
+
+class SQLiteJobStore:
+    """Durable job journal in SQLite (WAL); replicas sharing the file coordinate through leases"""
+
+    name = "sqlite"
+    shared = True
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS jobs (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id TEXT NOT NULL UNIQUE,
+            job_type TEXT,
+            status TEXT NOT NULL,
+            priority INTEGER NOT NULL,
+            dedup_key TEXT,
+            enqueued_at REAL NOT NULL,
+            lease_owner TEXT,
+            lease_expires REAL,
+            finished_at REAL,
+            change_seq INTEGER,
+            data TEXT NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS job_counts (
+            status TEXT PRIMARY KEY,
+            n INTEGER NOT NULL
+        )""",
+        # Bumped inside every write transaction, so change_seq follows commit order across replicas
+        """CREATE TABLE IF NOT EXISTS job_clock (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            seq INTEGER NOT NULL
+        )""",
+        "INSERT OR IGNORE INTO job_clock (id, seq) VALUES (1, 0)"
+    ]
+
+    # Columns added after the first release, backfilled from the job JSON on open
+    MIGRATIONS = {
+        "finished_at": ("REAL", None),
+        "job_type": ("TEXT", "json_extract(data, '$.job_type')"),
+        "dedup_key": ("TEXT", "json_extract(data, '$.dedup_key')"),
+        "change_seq": ("INTEGER", None)
+    }
+
+    INDEXES = [
+        "CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs (status, priority DESC, seq)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_type_queue ON jobs (job_type, status, priority DESC, seq)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_dedup ON jobs (dedup_key, job_type) WHERE dedup_key IS NOT NULL",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, seq)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs (status, lease_expires)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs (finished_at)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_changes ON jobs (change_seq)"
+    ]
+
+    def __init__(self, path: str):
+        self.path = path
+        self.reader: Optional[sqlite3.Connection] = None
+        self.writer: Optional[sqlite3.Connection] = None
+        self.write_lock: Optional[asyncio.Lock] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    async def start(self):
+        self.writer = self._connect()
+        for statement in self.SCHEMA:
+            self.writer.execute(statement)
+        columns = {row["name"] for row in self.writer.execute("PRAGMA table_info(jobs)")}
+        for column, (sql_type, backfill) in self.MIGRATIONS.items():
+            if column not in columns:
+                self.writer.execute(f"ALTER TABLE jobs ADD COLUMN {column} {sql_type}")
+                if backfill:
+                    self.writer.execute(f"UPDATE jobs SET {column} = {backfill}")
+        for statement in self.INDEXES:
+            self.writer.execute(statement)
+        self.reader = self._connect()
+        self.write_lock = asyncio.Lock()
+        await self._write(self._recount)
+        logger.info(f"SQLite job store opened at {self.path}")
+
+    @staticmethod
+    def _recount(conn: sqlite3.Connection):
+        """Rebuild the per-status counters once at startup; transitions keep them current"""
+        conn.execute("DELETE FROM job_counts")
+        conn.executemany("INSERT INTO job_counts (status, n) VALUES (?, 0)", [(status,) for status in JOB_STATUSES])
+        conn.execute(
+            "UPDATE job_counts SET n = (SELECT COUNT(*) FROM jobs WHERE jobs.status = job_counts.status)"
+        )
+
+    async def close(self):
+        for conn in (self.reader, self.writer):
+            if conn is not None:
+                conn.close()
+
+    async def _write(self, fn, *args):
+        """Run fn(conn, *args) in one IMMEDIATE transaction off the event loop"""
+        async with self.write_lock:
+            return await asyncio.to_thread(self._transaction, fn, *args)
+
+    def _transaction(self, fn, *args):
+        self.writer.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(self.writer, *args)
+        except Exception:
+            self.writer.execute("ROLLBACK")
+            raise
+        self.writer.execute("COMMIT")
+        return result
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, status: str, delta: int):
+        conn.execute("UPDATE job_counts SET n = n + ? WHERE status = ?", (delta, status))
+
+    @staticmethod
+    def _tick(conn: sqlite3.Connection) -> int:
+        conn.execute("UPDATE job_clock SET seq = seq + 1 WHERE id = 1")
+        return conn.execute("SELECT seq FROM job_clock WHERE id = 1").fetchone()[0]
+
+    def _save(self, conn: sqlite3.Connection, job: dict, previous: str, **columns):
+        """Write a job back, moving its status counter when the status changed"""
+        if job["status"] != previous:
+            self._count(conn, previous, -1)
+            self._count(conn, job["status"], 1)
+            columns["finished_at"] = time.time() if job["status"] in FINISHED_STATUSES else None
+            columns["change_seq"] = self._tick(conn)
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        conn.execute(
+            f"UPDATE jobs SET status = ?, data = ?{', ' + assignments if columns else ''} WHERE job_id = ?",
+            (job["status"], json.dumps(job), *columns.values(), job["job_id"])
+        )
+
+    @staticmethod
+    def _pending(conn: sqlite3.Connection, job_type: str, dedup_key: str) -> Optional[str]:
+        row = conn.execute(
+            "SELECT job_id FROM jobs WHERE dedup_key = ? AND job_type = ? AND status = 'queued' LIMIT 1",
+            (dedup_key, job_type)
+        ).fetchone()
+        return row["job_id"] if row is not None else None
+
+    async def find_pending(self, job_type: str, dedup_key: str) -> Optional[str]:
+        return self._pending(self.reader, job_type, dedup_key)
+
+    async def create(self, job: dict) -> Optional[str]:
+        """Store a queued job; if a queued job already has its dedup key, return that job's id instead"""
+        def insert(conn: sqlite3.Connection):
+            if job.get("dedup_key"):
+                existing = self._pending(conn, job["job_type"], job["dedup_key"])
+                if existing is not None:
+                    return existing
+            conn.execute(
+                "INSERT INTO jobs (job_id, job_type, status, priority, dedup_key, enqueued_at, change_seq, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job["job_id"], job["job_type"], job["status"], job["priority"], job.get("dedup_key"),
+                 time.time(), self._tick(conn), json.dumps(job))
+            )
+            self._count(conn, job["status"], 1)
+            return None
+
+        return await self._write(insert)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        row = self.reader.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row["data"]) if row is not None else None
+
+    def _lease(self, conn: sqlite3.Connection, rows: List[sqlite3.Row], owner: str,
+               lease_seconds: float) -> List[Tuple[dict, float]]:
+        claimed = []
+        for row in rows:
+            job = json.loads(row["data"])
+            job["status"] = "running"
+            job["started_at"] = datetime.utcnow().isoformat()
+            job["worker_id"] = owner
+            job["attempts"] = job.get("attempts", 0) + 1
+            self._save(conn, job, "queued", lease_owner=owner, lease_expires=time.time() + lease_seconds)
+            claimed.append((job, row["enqueued_at"]))
+        return claimed
+
+    async def claim(self, owner: str, lease_seconds: float) -> Optional[Tuple[dict, float]]:
+        """Lease the highest-priority queued job of any type"""
+        def claim_next(conn: sqlite3.Connection):
+            rows = conn.execute(
+                "SELECT data, enqueued_at FROM jobs WHERE status = 'queued' ORDER BY priority DESC, seq LIMIT 1"
+            ).fetchall()
+            claimed = self._lease(conn, rows, owner, lease_seconds)
+            return claimed[0] if claimed else None
+
+        return await self._write(claim_next)
+
+    async def claim_batch(self, owner: str, lease_seconds: float, job_type: str, limit: int) -> List[Tuple[dict, float]]:
+        """Lease up to limit queued jobs of one type, highest priority first"""
+        def claim_type(conn: sqlite3.Connection):
+            rows = conn.execute(
+                "SELECT data, enqueued_at FROM jobs WHERE job_type = ? AND status = 'queued' "
+                "ORDER BY priority DESC, seq LIMIT ?",
+                (job_type, limit)
+            ).fetchall()
+            return self._lease(conn, rows, owner, lease_seconds)
+
+        return await self._write(claim_type)
+
+    async def heartbeat(self, job_ids: List[str], owner: str, lease_seconds: float) -> List[str]:
+        """Extend leases still held by owner; returns the job ids whose lease was extended"""
+        def extend(conn: sqlite3.Connection):
+            expires = time.time() + lease_seconds
+            return [
+                job_id for job_id in job_ids
+                if conn.execute(
+                    "UPDATE jobs SET lease_expires = ? WHERE job_id = ? AND status = 'running' AND lease_owner = ?",
+                    (expires, job_id, owner)
+                ).rowcount
+            ]
+
+        return await self._write(extend) if job_ids else []
+
+    async def finish(self, job_id: str, owner: str, updates: dict) -> bool:
+        return (await self.finish_many(owner, [(job_id, updates)]))[0]
+
+    async def finish_many(self, owner: str, outcomes: List[Tuple[str, dict]]) -> List[bool]:
+        """Record outcomes for jobs still leased by owner, in one transaction; False where the lease was lost"""
+        def finish_owned(conn: sqlite3.Connection):
+            recorded = []
+            for job_id, updates in outcomes:
+                row = conn.execute(
+                    "SELECT data FROM jobs WHERE job_id = ? AND status = 'running' AND lease_owner = ?",
+                    (job_id, owner)
+                ).fetchone()
+                if row is None:
+                    recorded.append(False)
+                    continue
+                job = json.loads(row["data"])
+                job.update(updates)
+                self._save(conn, job, "running", lease_owner=None, lease_expires=None)
+                recorded.append(True)
+            return recorded
+
+        return await self._write(finish_owned)
+
+    async def requeue(self, job_id: str, updates: dict) -> bool:
+        def requeue_failed(conn: sqlite3.Connection):
+            row = conn.execute(
+                "SELECT data FROM jobs WHERE job_id = ? AND status = 'failed'", (job_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            job = json.loads(row["data"])
+            job.update(updates, status="queued")
+            self._save(conn, job, "failed", enqueued_at=time.time())
+            return True
+
+        return await self._write(requeue_failed)
+
+    async def requeue_expired(self) -> List[str]:
+        def requeue_lapsed(conn: sqlite3.Connection):
+            rows = conn.execute(
+                "SELECT data FROM jobs WHERE status = 'running' AND lease_expires < ?", (time.time(),)
+            ).fetchall()
+            requeued = []
+            for row in rows:
+                job = json.loads(row["data"])
+                job["status"] = "queued"
+                job["lease_expirations"] = job.get("lease_expirations", 0) + 1
+                self._save(conn, job, "running", lease_owner=None, lease_expires=None, enqueued_at=time.time())
+                requeued.append(job["job_id"])
+            return requeued
+
+        return await self._write(requeue_lapsed)
+
+    async def list_by_status(self, statuses: Tuple[str, ...], after: Optional[int], limit: int) -> List[Tuple[int, dict]]:
+        """A page of (seq, job) in creation order, starting after seq"""
+        rows = self.reader.execute(
+            f"SELECT seq, data FROM jobs WHERE status IN ({','.join('?' * len(statuses))}) AND seq > ? "
+            "ORDER BY seq LIMIT ?",
+            (*statuses, after or 0, limit)
+        ).fetchall()
+        return [(row["seq"], json.loads(row["data"])) for row in rows]
+
+    async def change_cursor(self) -> int:
+        """Position of the latest committed transition"""
+        return self.reader.execute("SELECT seq FROM job_clock WHERE id = 1").fetchone()[0]
+
+    async def changed_since(self, cursor: int, limit: int) -> List[Tuple[int, dict]]:
+        """Jobs whose status changed after cursor, as (change_seq, job) in commit order"""
+        rows = self.reader.execute(
+            "SELECT change_seq, data FROM jobs WHERE change_seq > ? ORDER BY change_seq LIMIT ?", (cursor, limit)
+        ).fetchall()
+        return [(row["change_seq"], json.loads(row["data"])) for row in rows]
+
+    async def counts(self) -> Dict[str, int]:
+        # Maintained on every transition so counting never scans the table
+        return {row["status"]: row["n"] for row in self.reader.execute("SELECT status, n FROM job_counts")}
+
+    async def evict_finished(self, cutoff: float, keep: Optional[int], limit: int) -> List[dict]:
+        """Drop up to limit finished jobs older than cutoff or beyond the newest keep"""
+        def evict(conn: sqlite3.Connection):
+            rows = conn.execute(
+                "SELECT seq, status, data FROM jobs WHERE finished_at < ? ORDER BY finished_at LIMIT ?",
+                (cutoff, limit)
+            ).fetchall()
+            if keep is not None and len(rows) < limit:
+                finished = sum(
+                    row["n"] for row in conn.execute(
+                        "SELECT n FROM job_counts WHERE status IN (?, ?)", FINISHED_STATUSES
+                    )
+                )
+                excess = min(finished - len(rows) - keep, limit - len(rows))
+                if excess > 0:
+                    rows += conn.execute(
+                        "SELECT seq, status, data FROM jobs WHERE finished_at >= ? ORDER BY finished_at LIMIT ?",
+                        (cutoff, excess)
+                    ).fetchall()
+            for row in rows:
+                conn.execute("DELETE FROM jobs WHERE seq = ?", (row["seq"],))
+                self._count(conn, row["status"], -1)
+            return [json.loads(row["data"]) for row in rows]
+
+        return await self._write(evict)
+
+def create_job_store():
+    """Build the configured job store"""
+    if JOB_STORE_BACKEND == "memory":
+        return MemoryJobStore()
+    if JOB_STORE_BACKEND == "sqlite":
+        return SQLiteJobStore(JOB_DB_PATH)
+    raise ValueError(f"Unknown JOB_STORE_BACKEND: {JOB_STORE_BACKEND}")
+
+job_store = create_job_store()
+
+def container_cpu_quota() -> int:
+    """Whole CPUs this container may use: the cgroup CPU quota if one is set, else the visible CPUs"""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, int(quota) // int(period))
+    except (OSError, ValueError):
+        pass
     try:
-        logger.info(f"Starting job {job_id} of type {job_type} in {REGION}")
-        jobs_queue[job_id]["status"] = "running"
-        jobs_queue[job_id]["started_at"] = datetime.utcnow().isoformat()
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return max(1, quota // period)
+    except (OSError, ValueError):
+        pass
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
 
-        # Simulate job processing based on type
-        if job_type == "data_import":
-            await asyncio.sleep(2)  # Simulate import
-            result = {"imported_records": payload.get("record_count", 100)}
+LANES = ("async", "thread", "process")
 
-        elif job_type == "data_export":
-            await asyncio.sleep(3)  # Simulate export
-            result = {"exported_file": f"export_{job_id}.csv"}
+class JobHandler:
+    """A job type's handler and the lane it runs on"""
 
-        elif job_type == "data_sync":
-            await asyncio.sleep(1.5)  # Simulate sync
-            result = {"synced_items": payload.get("item_count", 50)}
+    def __init__(self, fn, lane: str):
+        self.fn = fn
+        self.lane = lane
 
-        elif job_type == "cleanup":
-            await asyncio.sleep(1)  # Simulate cleanup
-            result = {"deleted_items": payload.get("old_items", 25)}
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+BATCH_HANDLERS: Dict[str, JobHandler] = {}
 
-        else:
-            await asyncio.sleep(1)  # Default processing
-            result = {"processed": True}
+def job_handler(job_type: str, lane: str = "async"):
+    """Register fn(job_id, payload) -> result as the handler for job_type.
 
-        # Mark job as completed
-        jobs_queue[job_id]["status"] = "completed"
-        jobs_queue[job_id]["result"] = result
-        jobs_queue[job_id]["completed_at"] = datetime.utcnow().isoformat()
+    async handlers run on the event loop; thread handlers are blocking I/O run in a thread pool;
+    process handlers are CPU-bound, must be module-level, and run in a process pool.
+    """
+    if lane not in LANES:
+        raise ValueError(f"Unknown execution lane: {lane}")
+
+    def register(fn):
+        JOB_HANDLERS[job_type] = JobHandler(fn, lane)
+        return fn
+
+    return register
+
+def batch_handler(job_type: str, lane: str = "async"):
+    """Register fn([(job_id, payload), ...]) -> [result or exception, ...] to run batches of job_type"""
+    if lane not in LANES:
+        raise ValueError(f"Unknown execution lane: {lane}")
+
+    def register(fn):
+        BATCH_HANDLERS[job_type] = JobHandler(fn, lane)
+        return fn
+
+    return register
+
+class ExecutionLanes:
+    """Bounded thread and process pools that keep blocking handlers off the event loop"""
+
+    def __init__(self, thread_workers: int, process_workers: int):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.thread_pool: Optional[ThreadPoolExecutor] = None
+        self.process_pool: Optional[ProcessPoolExecutor] = None
+        self.in_flight = dict.fromkeys(LANES, 0)
+        self.completed = dict.fromkeys(LANES, 0)
+        self.failed = dict.fromkeys(LANES, 0)
+        self.process_pool_restarts = 0
+
+    def _new_process_pool(self) -> ProcessPoolExecutor:
+        # spawn rather than fork: the parent holds sqlite connections and executor threads
+        return ProcessPoolExecutor(max_workers=self.process_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def start(self):
+        self.thread_pool = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="job")
+        self.process_pool = self._new_process_pool()
+        logger.info(
+            f"Execution lanes ready in {REGION}: {self.thread_workers} threads, {self.process_workers} processes"
+        )
+
+    async def close(self):
+        for pool in (self.thread_pool, self.process_pool):
+            if pool is not None:
+                await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+
+    async def run(self, handler: JobHandler, *args):
+        """Run a handler on its lane; exceptions propagate to the caller"""
+        self.in_flight[handler.lane] += 1
+        executor = None
+        try:
+            if handler.lane == "async":
+                result = await handler.fn(*args)
+            else:
+                executor = self.thread_pool if handler.lane == "thread" else self.process_pool
+                result = await asyncio.get_running_loop().run_in_executor(executor, handler.fn, *args)
+        except BrokenProcessPool:
+            # A worker process died (e.g. OOM-killed); replace the pool so later jobs can run.
+            # Every job on the broken pool fails at once, so only the first one to get here replaces it.
+            self.failed[handler.lane] += 1
+            if executor is self.process_pool:
+                self.process_pool_restarts += 1
+                logger.error(f"Process pool broke while running a {handler.lane} handler; restarting it")
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.process_pool = self._new_process_pool()
+            raise
+        except Exception:
+            self.failed[handler.lane] += 1
+            raise
+        finally:
+            self.in_flight[handler.lane] -= 1
+        self.completed[handler.lane] += 1
+        return result
+
+    def metrics(self) -> dict:
+        workers = {"async": None, "thread": self.thread_workers, "process": self.process_workers}
+        lanes = {
+            lane: {
+                "workers": workers[lane],
+                "in_flight": self.in_flight[lane],
+                "completed": self.completed[lane],
+                "failed": self.failed[lane]
+            }
+            for lane in LANES
+        }
+        lanes["process"]["restarts"] = self.process_pool_restarts
+        return lanes
+
+execution_lanes = ExecutionLanes(THREAD_POOL_WORKERS, PROCESS_POOL_WORKERS or container_cpu_quota())
+
+class Subscription:
+    """One listener's queue of job transitions, filtered by job id and type"""
+
+    def __init__(self, job_ids: Optional[Set[str]] = None, job_types: Optional[Set[str]] = None):
+        self.job_ids = job_ids
+        self.job_types = job_types
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=JOB_EVENTS_BUFFER)
+        self.lagged = False
+
+    def matches(self, job: dict) -> bool:
+        return (not self.job_ids or job["job_id"] in self.job_ids) and (
+            not self.job_types or job["job_type"] in self.job_types
+        )
+
+    async def next(self, timeout: float) -> Optional[dict]:
+        """The next transition, or None after timeout"""
+        getter = asyncio.ensure_future(self.queue.get())
+        try:
+            await asyncio.wait({getter}, timeout=timeout)
+        finally:
+            if not getter.done():
+                getter.cancel()
+        return getter.result() if getter.done() and not getter.cancelled() else None
+
+class JobEventHub:
+    """Fans job state transitions out to long-poll waiters and event-stream subscribers.
+
+    Transitions made by this process are pushed as they happen. With a shared store, transitions
+    made by other replicas are picked up from the store's change feed while anyone is listening.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.subscriptions: Set[Subscription] = set()
+        # Last status published per job, so local pushes and the change feed never repeat a transition
+        self.last_status: "OrderedDict[str, str]" = OrderedDict()
+        self.feed_task: Optional[asyncio.Task] = None
+        self.published = 0
+        self.lagged_subscribers = 0
+
+    def publish(self, job: dict):
+        job_id = job["job_id"]
+        if self.last_status.get(job_id) == job["status"]:
+            return
+        self.last_status[job_id] = job["status"]
+        self.last_status.move_to_end(job_id)
+        if len(self.last_status) > JOB_EVENTS_HISTORY:
+            self.last_status.popitem(last=False)
+        self.published += 1
+
+        event = dict(job)
+        for subscription in self.subscriptions:
+            if subscription.lagged or not subscription.matches(event):
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Cut off a listener that cannot keep up rather than buffering without bound
+                subscription.lagged = True
+                self.lagged_subscribers += 1
+
+    def subscribe(self, job_ids: Optional[Set[str]] = None, job_types: Optional[Set[str]] = None) -> Subscription:
+        subscription = Subscription(job_ids, job_types)
+        self.subscriptions.add(subscription)
+        if self.store.shared and (self.feed_task is None or self.feed_task.done()):
+            self.feed_task = asyncio.create_task(self._follow_changes())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscriptions.discard(subscription)
+
+    async def close(self):
+        if self.feed_task is not None:
+            self.feed_task.cancel()
+            await asyncio.gather(self.feed_task, return_exceptions=True)
+
+    async def _follow_changes(self):
+        """Publish transitions from the shared store's change feed until the last listener leaves"""
+        cursor = await self.store.change_cursor()
+        while self.subscriptions:
+            await asyncio.sleep(JOB_EVENTS_POLL_INTERVAL)
+            try:
+                for cursor, job in await self.store.changed_since(cursor, JOB_EVENTS_BUFFER):
+                    self.publish(job)
+            except Exception as e:
+                logger.error(f"Job change feed failed: {str(e)}")
+
+    async def wait_for_finish(self, job_id: str, timeout: float) -> Optional[dict]:
+        """The job once completed or failed, or its latest state when timeout runs out"""
+        subscription = self.subscribe({job_id})
+        try:
+            deadline = time.monotonic() + timeout
+            # Read after subscribing so a transition in between cannot be missed
+            job = await self.store.get(job_id)
+            while job is not None and job["status"] not in FINISHED_STATUSES:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                job = await subscription.next(remaining) or job
+            return job
+        finally:
+            self.unsubscribe(subscription)
+
+    def metrics(self) -> dict:
+        return {
+            "subscribers": len(self.subscriptions),
+            "published": self.published,
+            "lagged_subscribers": self.lagged_subscribers,
+            "change_feed": self.feed_task is not None and not self.feed_task.done()
+        }
+
+job_events = JobEventHub(job_store)
+
+def percentile(samples, fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of a sample window"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(len(ordered) * fraction) - 1)]
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at QUEUE_MAX_DEPTH"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+class JobScheduler:
+    """Pool of async workers claiming jobs from the store by priority under renewable leases"""
+
+    def __init__(self, store, events: JobEventHub, concurrency: int, max_depth: int):
+        self.store = store
+        self.events = events
+        self.concurrency = concurrency
+        self.max_depth = max_depth
+        # Set (and replaced) on every local submit; idle workers wait on the one current when they looked
+        self._submitted: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self.leased: Dict[str, dict] = {}
+        self.wait_times = deque(maxlen=QUEUE_METRICS_WINDOW)
+        self.service_times = deque(maxlen=QUEUE_METRICS_WINDOW)
+        self.total_enqueued = 0
+        self.total_rejected = 0
+        self.total_processed = 0
+        self.leases_lost = 0
+        self.leases_reclaimed = 0
+        self.busy_workers = 0
+        self.total_batches = 0
+        self.total_batched_jobs = 0
+        self.total_deduplicated = 0
+
+    async def start(self):
+        """Spawn the worker pool plus the lease heartbeat and reaper"""
+        self._submitted = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+        self._tasks.append(asyncio.create_task(self._reaper()))
+        logger.info(f"Started {self.concurrency} job workers as {WORKER_ID} in {REGION}")
+
+    async def close(self):
+        """Stop the workers; unfinished jobs are picked up again once their leases expire"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @property
+    def running(self) -> int:
+        return len(self.leased)
+
+    async def depth(self) -> int:
+        return (await self.store.counts())["queued"]
+
+    def retry_after(self, depth: int) -> int:
+        """Seconds until the backlog ahead of a new submit should have drained"""
+        service_time = (sum(self.service_times) / len(self.service_times)) if self.service_times else 1.0
+        return max(1, math.ceil(depth * service_time / self.concurrency))
+
+    async def _admit(self) -> int:
+        depth = await self.depth()
+        if depth >= self.max_depth:
+            self.total_rejected += 1
+            raise QueueFullError(self.retry_after(depth))
+        return depth
+
+    def _wake(self):
+        submitted, self._submitted = self._submitted, asyncio.Event()
+        submitted.set()
+
+    @staticmethod
+    async def _wait_for_submit(submitted: asyncio.Event, timeout: float):
+        """Sleep until a local submit sets the event, or timeout"""
+        # asyncio.wait rather than wait_for: wait_for can swallow a cancel that races the event being set
+        waiter = asyncio.ensure_future(submitted.wait())
+        try:
+            await asyncio.wait({waiter}, timeout=timeout)
+        finally:
+            waiter.cancel()
+
+    async def submit(self, job: dict) -> Tuple[str, int]:
+        """Persist a queued job and wake a worker; returns the id of the queued job and the queue depth.
+
+        A job whose dedup_key matches a queued job of the same type collapses into that job.
+        """
+        if job.get("dedup_key"):
+            existing = await self.store.find_pending(job["job_type"], job["dedup_key"])
+            if existing is not None:
+                self.total_deduplicated += 1
+                return existing, await self.depth()
+        depth = await self._admit()
+        existing = await self.store.create(job)
+        if existing is not None:
+            self.total_deduplicated += 1
+            return existing, depth
+        self.total_enqueued += 1
+        self.events.publish(job)
+        self._wake()
+        return job["job_id"], depth + 1
+
+    async def requeue(self, job_id: str, updates: dict) -> bool:
+        """Put a failed job back in the queue"""
+        await self._admit()
+        if not await self.store.requeue(job_id, updates):
+            return False
+        self.total_enqueued += 1
+        self.events.publish(await self.store.get(job_id))
+        self._wake()
+        return True
+
+    async def _worker(self, number: int):
+        while True:
+            try:
+                submitted = self._submitted
+                claimed = await self.store.claim(WORKER_ID, LEASE_DURATION)
+                if claimed is None:
+                    # Idle: wait for a local submit, or poll for work queued by other replicas
+                    await self._wait_for_submit(submitted, QUEUE_POLL_INTERVAL)
+                    continue
+                self.events.publish(claimed[0])
+                self.busy_workers += 1
+                try:
+                    job_type = claimed[0]["job_type"]
+                    if job_type in BATCH_JOB_TYPES and job_type in BATCH_HANDLERS:
+                        await self._run_batch([claimed] + await self._gather(job_type))
+                    else:
+                        await self._run(*claimed)
+                finally:
+                    self.busy_workers -= 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {number} error: {str(e)}")
+                await asyncio.sleep(QUEUE_POLL_INTERVAL)
+
+    async def _run(self, job: dict, enqueued_at: float):
+        job_id = job["job_id"]
+        started = time.monotonic()
+        self.wait_times.append(max(0.0, time.time() - enqueued_at))
+        self.leased[job_id] = job
+        try:
+            updates = await process_job(job)
+        finally:
+            del self.leased[job_id]
+            self.total_processed += 1
+            self.service_times.append(time.monotonic() - started)
+
+        if not await self.store.finish(job_id, WORKER_ID, updates):
+            # The lease lapsed and the job was handed to another worker; drop this result
+            self.leases_lost += 1
+            logger.warning(f"Lost lease on job {job_id} in {REGION}; result discarded")
+            return
+        self.events.publish({**job, **updates})
+
+    async def _gather(self, job_type: str) -> List[Tuple[dict, float]]:
+        """Claim more queued jobs of a type until the batch is full or BATCH_MAX_WAIT has passed"""
+        batch = []
+        deadline = time.monotonic() + BATCH_MAX_WAIT
+        while True:
+            submitted = self._submitted
+            claimed = await self.store.claim_batch(WORKER_ID, LEASE_DURATION, job_type, BATCH_MAX_SIZE - 1 - len(batch))
+            for job, _ in claimed:
+                self.events.publish(job)
+            batch += claimed
+            remaining = deadline - time.monotonic()
+            if len(batch) >= BATCH_MAX_SIZE - 1 or remaining <= 0:
+                return batch
+            await self._wait_for_submit(submitted, remaining)
+
+    async def _run_batch(self, batch: List[Tuple[dict, float]]):
+        jobs = [job for job, _ in batch]
+        started = time.monotonic()
+        now = time.time()
+        for job, enqueued_at in batch:
+            self.wait_times.append(max(0.0, now - enqueued_at))
+            self.leased[job["job_id"]] = job
+        try:
+            outcomes = await process_batch(jobs[0]["job_type"], jobs)
+        finally:
+            for job in jobs:
+                del self.leased[job["job_id"]]
+            self.total_processed += len(jobs)
+            self.total_batches += 1
+            self.total_batched_jobs += len(jobs)
+            self.service_times.append(time.monotonic() - started)
+
+        recorded = await self.store.finish_many(
+            WORKER_ID, [(job["job_id"], outcome) for job, outcome in zip(jobs, outcomes)]
+        )
+        for job, outcome, saved in zip(jobs, outcomes, recorded):
+            if saved:
+                self.events.publish({**job, **outcome})
+        if not all(recorded):
+            self.leases_lost += recorded.count(False)
+            logger.warning(f"Lost leases on {recorded.count(False)} batched jobs in {REGION}; results discarded")
+
+    async def _heartbeat(self):
+        """Renew the leases of jobs this process is running"""
+        while True:
+            await asyncio.sleep(LEASE_HEARTBEAT_INTERVAL)
+            try:
+                job_ids = list(self.leased)
+                held = set(await self.store.heartbeat(job_ids, WORKER_ID, LEASE_DURATION))
+                for job_id in job_ids:
+                    if job_id not in held and job_id in self.leased:
+                        logger.warning(f"Lease on job {job_id} no longer held by {WORKER_ID}")
+            except Exception as e:
+                logger.error(f"Lease heartbeat failed: {str(e)}")
+
+    async def _reaper(self):
+        """Requeue jobs whose owner stopped renewing its lease"""
+        while True:
+            await asyncio.sleep(LEASE_REAPER_INTERVAL)
+            try:
+                expired = await self.store.requeue_expired()
+                if expired:
+                    self.leases_reclaimed += len(expired)
+                    logger.warning(f"Requeued {len(expired)} jobs with expired leases in {REGION}")
+                    for job_id in expired:
+                        job = await self.store.get(job_id)
+                        if job is not None:
+                            self.events.publish(job)
+                    self._wake()
+            except Exception as e:
+                logger.error(f"Lease reaper failed: {str(e)}")
+
+    async def metrics(self) -> dict:
+        """Queue depth, utilization, lease activity and wait/service time percentiles"""
+        def summary(samples) -> dict:
+            return {
+                "avg_ms": round(sum(samples) / len(samples) * 1000, 2) if samples else None,
+                "p50_ms": round(percentile(samples, 0.5) * 1000, 2) if samples else None,
+                "p95_ms": round(percentile(samples, 0.95) * 1000, 2) if samples else None
+            }
+
+        return {
+            "depth": await self.depth(),
+            "max_depth": self.max_depth,
+            "workers": self.concurrency,
+            "worker_id": WORKER_ID,
+            "running": self.running,
+            "utilization": round(self.busy_workers / self.concurrency, 4),
+            "total_enqueued": self.total_enqueued,
+            "total_rejected": self.total_rejected,
+            "total_processed": self.total_processed,
+            "leases_lost": self.leases_lost,
+            "leases_reclaimed": self.leases_reclaimed,
+            "total_deduplicated": self.total_deduplicated,
+            "batching": {
+                "job_types": sorted(BATCH_JOB_TYPES),
+                "batches": self.total_batches,
+                "batched_jobs": self.total_batched_jobs,
+                "avg_batch_size": round(self.total_batched_jobs / self.total_batches, 2) if self.total_batches else None
+            },
+            "wait_time": summary(self.wait_times),
+            "service_time": summary(self.service_times)
+        }
+
+scheduler = JobScheduler(job_store, job_events, WORKER_CONCURRENCY, QUEUE_MAX_DEPTH)
+
+def queue_full_error(e: QueueFullError) -> HTTPException:
+    """Map a full queue to 429 with a Retry-After hint"""
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+def encode_cursor(seq: int) -> str:
+    """Opaque keyset cursor pointing just past a job"""
+    return base64.urlsafe_b64encode(json.dumps(seq).encode()).decode()
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    if not cursor:
+        return None
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode())))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def parse_filter(value: Optional[str]) -> Optional[Set[str]]:
+    """Comma-separated query values as a set; None matches everything"""
+    values = {v.strip() for v in (value or "").split(",") if v.strip()}
+    return values or None
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def stream_job_events(subscription: Subscription, snapshot: List[dict]):
+    """Server-Sent Events: current state of the requested jobs, then every transition as it happens"""
+    try:
+        deadline = time.monotonic() + JOB_EVENTS_STREAM_MAX
+        for job in snapshot:
+            yield sse_event("job", job)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            job = await subscription.next(min(JOB_EVENTS_KEEPALIVE, remaining))
+            if job is not None:
+                yield sse_event("job", job)
+            elif subscription.lagged:
+                # Tell the client to resync (e.g. from /jobs/active) instead of silently skipping transitions
+                yield sse_event("lagged", {"region": REGION})
+                return
+            elif remaining > JOB_EVENTS_KEEPALIVE:
+                # Comment frame keeps idle connections open through proxies
+                yield ": keep-alive\n\n"
+    finally:
+        job_events.unsubscribe(subscription)
+
+async def list_jobs(key: str, statuses: Tuple[str, ...], limit: int, cursor: Optional[str]) -> dict:
+    """One page of jobs in the given statuses, with the total from the status counters"""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    page = await job_store.list_by_status(statuses, decode_cursor(cursor), limit)
+    counts = await job_store.counts()
+    return {
+        key: [job for _, job in page],
+        "count": sum(counts[status] for status in statuses),
+        "next_cursor": encode_cursor(page[-1][0]) if len(page) == limit else None,
+        "region": REGION
+    }
+
+def archive_jobs(jobs: List[dict]):
+    """Append evicted jobs to the NDJSON archive"""
+    with open(JOB_ARCHIVE_PATH, "a") as archive:
+        for job in jobs:
+            archive.write(json.dumps(job) + "\n")
+
+retention_stats = {"evicted": 0, "archived": 0, "last_run": None}
+
+async def enforce_retention():
+    """Evict finished jobs past JOB_RETENTION_SECONDS or beyond the newest JOB_RETENTION_MAX"""
+    cutoff = time.time() - JOB_RETENTION_SECONDS if JOB_RETENTION_SECONDS > 0 else 0
+    keep = JOB_RETENTION_MAX if JOB_RETENTION_MAX > 0 else None
+    while True:
+        evicted = await job_store.evict_finished(cutoff, keep, JOB_RETENTION_BATCH)
+        if evicted and JOB_ARCHIVE_PATH:
+            await asyncio.to_thread(archive_jobs, evicted)
+            retention_stats["archived"] += len(evicted)
+        retention_stats["evicted"] += len(evicted)
+        if len(evicted) < JOB_RETENTION_BATCH:
+            break
+    retention_stats["last_run"] = datetime.utcnow().isoformat()
+
+async def retention_loop():
+    while True:
+        await asyncio.sleep(JOB_RETENTION_INTERVAL)
+        try:
+            await enforce_retention()
+        except Exception as e:
+            logger.error(f"Job retention failed: {str(e)}")
+
+retention_task: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def startup():
+    global retention_task
+    await job_store.start()
+    await execution_lanes.start()
+    await scheduler.start()
+    retention_task = asyncio.create_task(retention_loop())
+
+@app.on_event("shutdown")
+async def shutdown():
+    if retention_task is not None:
+        retention_task.cancel()
+    await scheduler.close()
+    await job_events.close()
+    await execution_lanes.close()
+    await job_store.close()
+
+@job_handler("data_import", lane="process")
+def import_data(job_id: str, payload: dict) -> dict:
+    """Parse an inline CSV import; without one, simulate the import"""
+    if "csv" in payload:
+        rows = list(csv.DictReader(io.StringIO(payload["csv"])))
+        return {"imported_records": len(rows), "columns": list(rows[0]) if rows else []}
+    time.sleep(2)  # Simulate import
+    return {"imported_records": payload.get("record_count", 100)}
+
+@job_handler("data_export", lane="thread")
+def export_data(job_id: str, payload: dict) -> dict:
+    time.sleep(3)  # Simulate export
+    return {"exported_file": f"export_{job_id}.csv"}
+
+@job_handler("data_sync")
+async def sync_data(job_id: str, payload: dict) -> dict:
+    await asyncio.sleep(1.5)  # Simulate sync
+    return {"synced_items": payload.get("item_count", 50)}
+
+@batch_handler("data_sync")
+async def sync_data_batch(jobs: List[Tuple[str, dict]]) -> List[dict]:
+    await asyncio.sleep(1.5)  # Simulate one sync round-trip for the whole batch
+    return [{"synced_items": payload.get("item_count", 50)} for _, payload in jobs]
+
+@job_handler("cleanup")
+async def cleanup(job_id: str, payload: dict) -> dict:
+    await asyncio.sleep(1)  # Simulate cleanup
+    return {"deleted_items": payload.get("old_items", 25)}
+
+@batch_handler("cleanup")
+async def cleanup_batch(jobs: List[Tuple[str, dict]]) -> List[dict]:
+    await asyncio.sleep(1)  # Simulate one cleanup pass for the whole batch
+    return [{"deleted_items": payload.get("old_items", 25)} for _, payload in jobs]
+
+@job_handler("default")
+async def default_job(job_id: str, payload: dict) -> dict:
+    await asyncio.sleep(1)  # Default processing
+    return {"processed": True}
+
+async def process_job(job: dict) -> dict:
+    """Background job processing function; returns the fields recording its outcome"""
+    job_id = job["job_id"]
+    job_type = job["job_type"]
+    handler = JOB_HANDLERS.get(job_type, JOB_HANDLERS["default"])
+    try:
+        logger.info(f"Starting job {job_id} of type {job_type} on the {handler.lane} lane in {REGION}")
+        result = await execution_lanes.run(handler, job_id, job["payload"])
 
         logger.info(f"Completed job {job_id} in {REGION}")
 
+        # Mark job as completed
+        return {
+            "status": "completed",
+            "result": result,
+            "completed_at": datetime.utcnow().isoformat()
+        }
+
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {str(e) or type(e).__name__}")
+        return {
+            "status": "failed",
+            "error": str(e) or type(e).__name__,
+            "failed_at": datetime.utcnow().isoformat()
+        }
+
+async def process_batch(job_type: str, jobs: List[dict]) -> List[dict]:
+    """Run jobs of one type through its batch handler; returns each job's outcome fields"""
+    handler = BATCH_HANDLERS[job_type]
+    try:
+        logger.info(f"Starting batch of {len(jobs)} {job_type} jobs on the {handler.lane} lane in {REGION}")
+        results = await execution_lanes.run(handler, [(job["job_id"], job["payload"]) for job in jobs])
+        if len(results) != len(jobs):
+            raise ValueError(f"Batch handler returned {len(results)} results for {len(jobs)} jobs")
+        logger.info(f"Completed batch of {len(jobs)} {job_type} jobs in {REGION}")
     except Exception as e:
-        logger.error(f"Job {job_id} failed: {str(e)}")
-        jobs_queue[job_id]["status"] = "failed"
-        jobs_queue[job_id]["error"] = str(e)
-        jobs_queue[job_id]["failed_at"] = datetime.utcnow().isoformat()
+        logger.error(f"Batch of {len(jobs)} {job_type} jobs failed: {str(e) or type(e).__name__}")
+        results = [e] * len(jobs)
+
+    finished_at = datetime.utcnow().isoformat()
+    return [
+        {"status": "failed", "error": str(result) or type(result).__name__, "failed_at": finished_at}
+        if isinstance(result, Exception) else
+        {"status": "completed", "result": result, "completed_at": finished_at, "batch_size": len(jobs)}
+        for result in results
+    ]
 
 @app.post("/job/submit")
-async def submit_job(job: JobRequest, background_tasks: BackgroundTasks):
+async def submit_job(job: JobRequest):
     """Submit a new background job"""
     job_id = str(uuid.uuid4())
+    priority = job.priority if job.priority is not None else 1
 
-    # Add job to queue
-    jobs_queue[job_id] = {
+    record = {
         "job_id": job_id,
         "job_type": job.job_type,
         "payload": job.payload or {},
-        "priority": job.priority,
+        "priority": priority,
         "status": "queued",
         "region": REGION,
         "created_at": datetime.utcnow().isoformat()
     }
+    if job.dedup_key:
+        record["dedup_key"] = job.dedup_key
+
+    # Persist the job; a worker on any replica sharing the store may claim it
+    try:
+        queued_id, depth = await scheduler.submit(record)
+    except QueueFullError as e:
+        logger.warning(f"Rejected job {job_id} in {REGION}: queue full")
+        raise queue_full_error(e)
 
-    # Start processing in background
-    background_tasks.add_task(process_job, job_id, job.job_type, job.payload or {})
+    if queued_id != job_id:
+        return {
+            "message": "Job collapsed into an identical queued job",
+            "job_id": queued_id,
+            "status": "queued",
+            "deduplicated": True,
+            "queue_depth": depth,
+            "region": REGION
+        }
 
     logger.info(f"Job {job_id} queued in {REGION}")
 
@@ -113,63 +1369,67 @@ async def submit_job(job: JobRequest, background_tasks: BackgroundTasks):
         "message": "Job submitted successfully",
         "job_id": job_id,
         "status": "queued",
+        "queue_depth": depth,
         "region": REGION
     }
 
 @app.get("/job/{job_id}")
-async def get_job_status(job_id: str):
-    """Get job status"""
-    if job_id not in jobs_queue:
+async def get_job_status(job_id: str, wait: float = 0):
+    """Get job status; with wait, hold the request until the job finishes or wait seconds pass"""
+    if wait > 0:
+        job = await job_events.wait_for_finish(job_id, min(wait, JOB_WAIT_MAX))
+    else:
+        job = await job_store.get(job_id)
+    if job is None:
         return {"error": "Job not found"}, 404
 
-    return jobs_queue[job_id]
+    return job
+
+@app.get("/jobs/events")
+async def job_event_stream(job_id: Optional[str] = None, job_type: Optional[str] = None):
+    """Stream job state transitions as Server-Sent Events, optionally filtered by job id or type"""
+    job_ids = parse_filter(job_id)
+    subscription = job_events.subscribe(job_ids, parse_filter(job_type))
+    # Snapshot after subscribing so no transition falls between the two
+    snapshot = [job for job in [await job_store.get(j) for j in sorted(job_ids or [])] if job is not None]
+    return StreamingResponse(
+        stream_job_events(subscription, [job for job in snapshot if subscription.matches(job)]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/jobs/active")
-async def get_active_jobs():
-    """Get all active jobs"""
-    active = [j for j in jobs_queue.values() if j["status"] in ["queued", "running"]]
-    return {
-        "active_jobs": active,
-        "count": len(active),
-        "region": REGION
-    }
+async def get_active_jobs(limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None):
+    """Get a page of active jobs"""
+    return await list_jobs("active_jobs", ("queued", "running"), limit, cursor)
 
 @app.get("/jobs/completed")
-async def get_completed_jobs():
-    """Get all completed jobs"""
-    completed = [j for j in jobs_queue.values() if j["status"] == "completed"]
-    return {
-        "completed_jobs": completed,
-        "count": len(completed),
-        "region": REGION
-    }
+async def get_completed_jobs(limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None):
+    """Get a page of completed jobs"""
+    return await list_jobs("completed_jobs", ("completed",), limit, cursor)
 
 @app.get("/jobs/failed")
-async def get_failed_jobs():
-    """Get all failed jobs"""
-    failed = [j for j in jobs_queue.values() if j["status"] == "failed"]
-    return {
-        "failed_jobs": failed,
-        "count": len(failed),
-        "region": REGION
-    }
+async def get_failed_jobs(limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None):
+    """Get a page of failed jobs"""
+    return await list_jobs("failed_jobs", ("failed",), limit, cursor)
 
 @app.post("/job/retry/{job_id}")
-async def retry_job(job_id: str, background_tasks: BackgroundTasks):
+async def retry_job(job_id: str):
     """Retry a failed job"""
-    if job_id not in jobs_queue:
+    job = await job_store.get(job_id)
+    if job is None:
         return {"error": "Job not found"}, 404
 
-    job = jobs_queue[job_id]
     if job["status"] != "failed":
         return {"error": "Only failed jobs can be retried"}, 400
 
-    # Reset job status
-    job["status"] = "queued"
-    job["retried_at"] = datetime.utcnow().isoformat()
-
-    # Restart processing
-    background_tasks.add_task(process_job, job_id, job["job_type"], job["payload"])
+    # Requeue at the job's original priority
+    try:
+        requeued = await scheduler.requeue(job_id, {"retried_at": datetime.utcnow().isoformat()})
+    except QueueFullError as e:
+        raise queue_full_error(e)
+    if not requeued:
+        return {"error": "Only failed jobs can be retried"}, 400
 
     return {
         "message": "Job retry initiated",
@@ -180,16 +1440,19 @@ async def retry_job(job_id: str, background_tasks: BackgroundTasks):
 @app.get("/stats")
 async def get_stats():
     """Get worker statistics"""
+    counts = await job_store.counts()
     return {
         "service": "worker-service",
         "region": REGION,
+        "job_store": job_store.name,
         "stats": {
-            "total_jobs": len(jobs_queue),
-            "queued": len([j for j in jobs_queue.values() if j["status"] == "queued"]),
-            "running": len([j for j in jobs_queue.values() if j["status"] == "running"]),
-            "completed": len([j for j in jobs_queue.values() if j["status"] == "completed"]),
-            "failed": len([j for j in jobs_queue.values() if j["status"] == "failed"])
+            "total_jobs": sum(counts.values()),
+            **counts
         },
+        "queue": await scheduler.metrics(),
+        "retention": retention_stats,
+        "lanes": execution_lanes.metrics(),
+        "events": job_events.metrics(),
         "timestamp": datetime.utcnow().isoformat()
     }
 
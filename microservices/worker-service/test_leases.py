@@ -0,0 +1,92 @@
+"""
+Job leases: expired leases are reclaimed and the old owner's result is refused
+
+Run from microservices/worker-service:
+    python -m pytest -q test_leases.py
+"""
+import asyncio
+import os
+import tempfile
+import uuid
+
+os.environ["JOB_STORE_BACKEND"] = "memory"
+
+import pytest
+
+import app
+
+LEASE = 0.05
+
+def new_job(job_type: str = "test") -> dict:
+    return {"job_id": str(uuid.uuid4()), "job_type": job_type, "status": "queued", "priority": 0, "payload": {}}
+
+async def open_stores(backend: str, directory: str) -> list:
+    """Two handles on one store, as two replicas would see it"""
+    if backend == "memory":
+        store = app.MemoryJobStore()
+        stores = [store, store]
+    else:
+        path = os.path.join(directory, "jobs.db")
+        stores = [app.SQLiteJobStore(path), app.SQLiteJobStore(path)]
+    for store in stores:
+        await store.start()
+    return stores
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request):
+    return request.param
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+def test_expired_lease_is_reclaimed_and_stale_result_refused(backend):
+    async def scenario(directory: str):
+        first, second = await open_stores(backend, directory)
+        job = new_job()
+        await first.create(job)
+
+        claimed, _ = await first.claim("worker-a", LEASE)
+        assert claimed["job_id"] == job["job_id"]
+        assert await second.claim("worker-b", LEASE) is None
+
+        await asyncio.sleep(LEASE * 2)
+        assert await second.requeue_expired() == [job["job_id"]]
+
+        reclaimed, _ = await second.claim("worker-b", 30)
+        assert reclaimed["job_id"] == job["job_id"]
+        assert reclaimed["attempts"] == 2
+        assert reclaimed["lease_expirations"] == 1
+
+        # The first owner lost the lease: it can neither extend it nor record its result
+        assert await first.heartbeat([job["job_id"]], "worker-a", 30) == []
+        assert await first.finish(job["job_id"], "worker-a", {"status": "completed", "result": "stale"}) is False
+        assert await second.finish(job["job_id"], "worker-b", {"status": "completed", "result": "fresh"}) is True
+
+        stored = await first.get(job["job_id"])
+        assert stored["status"] == "completed"
+        assert stored["result"] == "fresh"
+        assert (await first.counts())["completed"] == 1
+        for store in {id(s): s for s in (first, second)}.values():
+            await store.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        run(scenario(directory))
+
+def test_heartbeat_keeps_a_lease_from_being_reclaimed(backend):
+    async def scenario(directory: str):
+        first, second = await open_stores(backend, directory)
+        job = new_job()
+        await first.create(job)
+        await first.claim("worker-a", LEASE)
+
+        for _ in range(4):
+            await asyncio.sleep(LEASE / 2)
+            assert await first.heartbeat([job["job_id"]], "worker-a", LEASE) == [job["job_id"]]
+            assert await second.requeue_expired() == []
+
+        assert await first.finish(job["job_id"], "worker-a", {"status": "completed"}) is True
+        for store in {id(s): s for s in (first, second)}.values():
+            await store.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        run(scenario(directory))